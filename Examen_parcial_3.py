@@ -1,115 +1,184 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import time
-
-# --- Configuración general ---
-WORLD = 90.0         # Escena 3D
-STEPS = 100
-PAUSE = 0.02
-OFFSET_Z = 1.0
-
-fig, ax = plt.subplots(subplot_kw={'projection': '3d'})
-
-# --- Funciones auxiliares ---
-def sind(t): return np.sin(np.deg2rad(t))
-def cosd(t): return np.cos(np.deg2rad(t))
-
-def A_DH(theta_deg, d, a, alpha_deg):
-    ct, st = cosd(theta_deg), sind(theta_deg)
-    ca, sa = cosd(alpha_deg), sind(alpha_deg)
-    return np.array([
-        [ct, -st*ca,  st*sa, a*ct],
-        [st,  ct*ca, -ct*sa, a*st],
-        [0,     sa,     ca,    d],
-        [0,      0,      0,    1]
-    ])
-
-def drawVector(p_fin, p_init=(0,0,0), color='black', lw=2.0):
-    ax.plot3D([p_init[0], p_fin[0]],
-              [p_init[1], p_fin[1]],
-              [p_init[2], p_fin[2]], color=color, linewidth=lw)
-
-def drawMobileFrame(T, s=2.0):
-    o = T[:3,3]
-    R = T[:3,:3]
-    drawVector(o + s*R[:,0], o, color='red')
-    drawVector(o + s*R[:,1], o, color='blue')
-    drawVector(o + s*R[:,2], o, color='green')
-
-def set_scene():
-    ax.cla()
-    ax.set_xlim3d(-WORLD, WORLD)
-    ax.set_ylim3d(-WORLD, WORLD)
-    ax.set_zlim3d(0, WORLD)
-    ax.view_init(elev=30, azim=45)
-    ax.set_xlabel("X (cm)")
-    ax.set_ylabel("Y (cm)")
-    ax.set_zlabel("Z (cm)")
-
-
-    # Ejes base
-    ax.plot3D([0,15],[0,0],[0,0],'r')
-    ax.plot3D([0,0],[0,15],[0,0],'b')
-    ax.plot3D([0,0],[0,0],[15],'g')
-
-# --- Cinemática directa SCARA 4DOF ---
-def forward_kinematics_SCARA(theta1, theta2, d3, theta4, L1, L2):
-    A1 = A_DH(theta1, 0, L1, 0)
-    A2 = A_DH(theta2, 0, L2, 0)
-    A3 = A_DH(0, -d3, 0, 0)     
-    A4 = A_DH(theta4, 0, 0, 0)  
-
-    T0 = np.eye(4)
-    T1 = A1
-    T2 = A1 @ A2
-    T3 = T2 @ A3
-    T4 = T3 @ A4
-    return [T0, T1, T2, T3, T4]
-
-def draw_effector_cross(T, size=2.0):
-    o = T[:3,3]
-    R = T[:3,:3]
-    p1x = o + R @ np.array([ size,  0, 0])
-    p2x = o + R @ np.array([-size,  0, 0])
-    p1y = o + R @ np.array([ 0,  size, 0])
-    p2y = o + R @ np.array([ 0, -size, 0])
-    drawVector(p1x, p2x, color='purple', lw=3)
-    drawVector(p1y, p2y, color='purple', lw=3)
-
-def draw_arm(frames):
-    origins = [f[:3,3] for f in frames]
-    drawVector(origins[1], origins[0], color='darkred', lw=6)
-    drawVector(origins[2], origins[1], color='orange', lw=5)
-    drawVector(origins[3], origins[2], color='gray', lw=4)
-    drawVector(origins[4], origins[3], color='blue', lw=3)
-    draw_effector_cross(frames[-1])
-    for f in frames:
-        drawMobileFrame(f)
-
-def animate_to_target(t1_t, t2_t, d3_t, t4_t, L1, L2):
-    t1_vals = np.linspace(0, t1_t, STEPS)
-    t2_vals = np.linspace(0, t2_t, STEPS)
-    d3_vals = np.linspace(0, d3_t, STEPS)
-    t4_vals = np.linspace(0, t4_t, STEPS)
-
-    for i in range(STEPS):
-        set_scene()
-        frames = forward_kinematics_SCARA(
-            t1_vals[i], t2_vals[i], d3_vals[i], t4_vals[i],
-            L1, L2
-        )
-        draw_arm(frames)
-        plt.pause(PAUSE)
-
-if __name__ == "__main__":
-
-    L1 = 47.5
-    L2 = 37.5
-
-    t1_target = float(input("θ1 "))
-    t2_target = float(input("θ2 "))
-    d3_target = float(input("d3 "))
-    t4_target = float(input("θ4 "))
-
-    animate_to_target(t1_target, t2_target, d3_target, t4_target, L1, L2)
-    plt.show()
+import numpy as np
+
+# --- Configuración general ---
+WORLD = 90.0         # Escena 3D
+STEPS = 100
+PAUSE = 0.02
+OFFSET_Z = 1.0
+
+fig = ax = None  # se crean al primer dibujo (init_figure), no al importar
+
+def init_figure():
+    global fig, ax
+    if ax is None:
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(subplot_kw={'projection': '3d'})
+    return fig, ax
+
+# --- Funciones auxiliares ---
+def sind(t): return np.sin(np.deg2rad(t))
+def cosd(t): return np.cos(np.deg2rad(t))
+
+def A_DH(theta_deg, d, a, alpha_deg):
+    ct, st = cosd(theta_deg), sind(theta_deg)
+    ca, sa = cosd(alpha_deg), sind(alpha_deg)
+    return np.array([
+        [ct, -st*ca,  st*sa, a*ct],
+        [st,  ct*ca, -ct*sa, a*st],
+        [0,     sa,     ca,    d],
+        [0,      0,      0,    1]
+    ])
+
+def drawVector(p_fin, p_init=(0,0,0), color='black', lw=2.0):
+    init_figure()
+    ax.plot3D([p_init[0], p_fin[0]],
+              [p_init[1], p_fin[1]],
+              [p_init[2], p_fin[2]], color=color, linewidth=lw)
+
+def drawMobileFrame(T, s=2.0):
+    o = T[:3,3]
+    R = T[:3,:3]
+    drawVector(o + s*R[:,0], o, color='red')
+    drawVector(o + s*R[:,1], o, color='blue')
+    drawVector(o + s*R[:,2], o, color='green')
+
+def set_scene():
+    init_figure()
+    ax.cla()
+    ax.set_xlim3d(-WORLD, WORLD)
+    ax.set_ylim3d(-WORLD, WORLD)
+    ax.set_zlim3d(0, WORLD)
+    ax.view_init(elev=30, azim=45)
+    ax.set_xlabel("X (cm)")
+    ax.set_ylabel("Y (cm)")
+    ax.set_zlabel("Z (cm)")
+
+
+    # Ejes base
+    ax.plot3D([0,15],[0,0],[0,0],'r')
+    ax.plot3D([0,0],[0,15],[0,0],'b')
+    ax.plot3D([0,0],[0,0],[15],'g')
+
+# --- Cinemática directa SCARA 4DOF ---
+def forward_kinematics_SCARA(theta1, theta2, d3, theta4, L1, L2):
+    A1 = A_DH(theta1, 0, L1, 0)
+    A2 = A_DH(theta2, 0, L2, 0)
+    A3 = A_DH(0, -d3, 0, 0)     
+    A4 = A_DH(theta4, 0, 0, 0)  
+
+    T0 = np.eye(4)
+    T1 = A1
+    T2 = A1 @ A2
+    T3 = T2 @ A3
+    T4 = T3 @ A4
+    return [T0, T1, T2, T3, T4]
+
+# --- Cinemática vectorizada SCARA (arreglos de N configuraciones) ---
+def _wrap_deg(d):
+    return d - 360.0 * np.ceil((d - 180.0) / 360.0)   # grados a (-180, 180]
+
+def fk_SCARA_batch(theta1, theta2, d3, theta4, L1, L2):
+    """ Posición y giro del efector: devuelve (..., 4) = (x, y, z, phi) con phi en grados. """
+    t1 = np.asarray(theta1, dtype=float)
+    t12 = t1 + np.asarray(theta2, dtype=float)
+    x = L1*cosd(t1) + L2*cosd(t12)
+    y = L1*sind(t1) + L2*sind(t12)
+    z = -np.asarray(d3, dtype=float) + 0.0*x
+    phi = _wrap_deg(t12 + np.asarray(theta4, dtype=float))
+    return np.stack([x, y, z, phi], axis=-1)
+
+def ik_SCARA_batch(x, y, z, phi, L1, L2, elbow="arriba"):
+    """
+    Inversa cerrada del SCARA sobre arreglos de objetivos (x, y, z, phi).
+    Devuelve (reachable, theta1, theta2, d3, theta4); inalcanzables en NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    r2 = x*x + y*y
+    r = np.sqrt(r2)
+    reachable = (r <= L1 + L2 + 1e-9) & (r >= abs(L1 - L2) - 1e-9)
+
+    c2 = np.clip((r2 - L1*L1 - L2*L2) / (2.0 * L1 * L2), -1.0, 1.0)
+    s2 = np.sqrt(1.0 - c2*c2)
+    if not elbow.lower().startswith("arr"):
+        s2 = -s2
+    t2 = np.degrees(np.arctan2(s2, c2))
+    t1 = np.degrees(np.arctan2(y, x) - np.arctan2(L2*s2, L1 + L2*c2))
+    t4 = np.asarray(phi, dtype=float) - t1 - t2
+    d3 = -np.asarray(z, dtype=float) + 0.0*x
+
+    out = [np.where(reachable, v, np.nan)
+           for v in (_wrap_deg(t1), _wrap_deg(t2), d3, _wrap_deg(t4))]
+    return (reachable, *out)
+
+def draw_effector_cross(T, size=2.0):
+    o = T[:3,3]
+    R = T[:3,:3]
+    p1x = o + R @ np.array([ size,  0, 0])
+    p2x = o + R @ np.array([-size,  0, 0])
+    p1y = o + R @ np.array([ 0,  size, 0])
+    p2y = o + R @ np.array([ 0, -size, 0])
+    drawVector(p1x, p2x, color='purple', lw=3)
+    drawVector(p1y, p2y, color='purple', lw=3)
+
+def draw_arm(frames):
+    origins = [f[:3,3] for f in frames]
+    drawVector(origins[1], origins[0], color='darkred', lw=6)
+    drawVector(origins[2], origins[1], color='orange', lw=5)
+    drawVector(origins[3], origins[2], color='gray', lw=4)
+    drawVector(origins[4], origins[3], color='blue', lw=3)
+    draw_effector_cross(frames[-1])
+    for f in frames:
+        drawMobileFrame(f)
+
+def animate_to_target(t1_t, t2_t, d3_t, t4_t, L1, L2, obstacles=None, link_radius=0.0,
+                      limits=None):
+    """
+    limits: (vmax, amax) por articulación (θ1, θ2, d3, θ4); si se indica, el
+    movimiento se re-temporiza (trapecio de tiempo mínimo) con un frame cada PAUSE.
+    """
+    import matplotlib.pyplot as plt
+    from traj_cache import cached
+
+    def compute():
+        q = np.column_stack([np.linspace(0, v, STEPS) for v in (t1_t, t2_t, d3_t, t4_t)])
+        if limits is not None:
+            from retiming import trapezoidal
+            tim = trapezoidal((0, 0, 0, 0), (t1_t, t2_t, d3_t, t4_t), *limits, rate_hz=1.0 / PAUSE)
+            q = tim.q
+        frames = np.array([forward_kinematics_SCARA(a, b, c, d, L1, L2) for a, b, c, d in q])
+
+        # Validar toda la trayectoria contra obstáculos antes de animar
+        if obstacles:
+            from collision import check_trajectory
+            col = check_trajectory(frames[:, :, :3, 3], obstacles, radii=link_radius)
+            if col.collides:
+                raise RuntimeError(col.message)
+        return {'q': q, 'frames': frames}
+
+    # Mismos parámetros y mismo código => se reproduce desde la caché de disco
+    plan = cached({'model': 'scara', 'L1': L1, 'L2': L2},
+                  {'target': (t1_t, t2_t, d3_t, t4_t), 'steps': STEPS, 'pause': PAUSE,
+                   'limits': limits, 'obstacles': obstacles, 'link_radius': link_radius},
+                  compute, modules=(__name__, 'retiming', 'collision'))
+
+    for frames in plan['frames']:
+        set_scene()
+        draw_arm(list(frames))
+        plt.pause(PAUSE)
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    import matplotlib.pyplot as plt
+
+    L1 = 47.5
+    L2 = 37.5
+
+    t1_target = float(input("θ1 "))
+    t2_target = float(input("θ2 "))
+    d3_target = float(input("d3 "))
+    t4_target = float(input("θ4 "))
+
+    animate_to_target(t1_target, t2_target, d3_target, t4_target, L1, L2)
+    plt.show()
@@ -1,200 +1,455 @@
-#   (Escribe 'q' para salir en cualquier entrada)
-
-import math
-import sys
-from dataclasses import dataclass
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-
-# ------------------ IK (plano YZ) ------------------
-
-@dataclass
-class IKResult:
-    reachable: bool
-    theta1_deg: float | None
-    theta2_deg: float | None
-    message: str
-
-def _to_deg(a: float) -> float:
-    d = math.degrees(a)
-    while d <= -180: d += 360
-    while d > 180: d -= 360
-    return d
-
-def _ik_2r_yz(L1: float, L2: float, y: float, z: float, elbow: str) -> IKResult:
-    """
-    Inversa para 2R planar en el plano YZ (X=0).
-    elbow: 'arriba' => sin(theta2) positivo, 'abajo' => sin(theta2) negativo.
-    """
-    if L1 <= 0 or L2 <= 0:
-        return IKResult(False, None, None, "L1 y L2 deben ser positivos.")
-
-    r2 = y*y + z*z
-    r = math.sqrt(r2)
-    tol = 1e-9
-    if r > L1 + L2 + tol or r < abs(L1 - L2) - tol:
-        return IKResult(False, None, None, "Objetivo fuera del alcance.")
-
-    c2 = (r2 - L1*L1 - L2*L2) / (2.0 * L1 * L2)
-    c2 = max(-1.0, min(1.0, c2))
-    s2_abs = math.sqrt(max(0.0, 1.0 - c2*c2))
-    s2 = +s2_abs if elbow.startswith("arr") else -s2_abs
-    theta2 = math.atan2(s2, c2)
-
-    k1 = L1 + L2 * c2
-    k2 = L2 * s2
-    # En YZ, el "atan2" de orientación usa (z, y)
-    theta1 = math.atan2(z, y) - math.atan2(k2, k1)
-
-    return IKResult(True, _to_deg(theta1), _to_deg(theta2), "OK")
-
-# ------------------ FK (plano YZ) ------------------
-
-def fk_2r_yz(L1: float, L2: float, th1_deg: float, th2_deg: float):
-    """ Cinemática directa en plano YZ (X=0). """
-    th1 = math.radians(th1_deg)
-    th2 = math.radians(th2_deg)
-    x0, y0, z0 = 0.0, 0.0, 0.0
-    y1 = L1 * math.cos(th1)
-    z1 = L1 * math.sin(th1)
-    x1 = 0.0
-    y2 = y1 + L2 * math.cos(th1 + th2)
-    z2 = z1 + L2 * math.sin(th1 + th2)
-    x2 = 0.0
-    return (x0, y0, z0), (x1, y1, z1), (x2, y2, z2)
-
-# ------------------ Utilidades ------------------
-
-def linspace(a: float, b: float, n: int):
-    if n <= 1:
-        return [b]
-    step = (b - a) / (n - 1)
-    return [a + i*step for i in range(n)]
-
-def leer_valor(msg: str):
-    val = input(msg)
-    if val.strip().lower() == 'q':
-        return 'q'
-    try:
-        return float(val)
-    except Exception:
-        raise ValueError("Entrada no válida. Escribe un número o 'q' para salir.")
-
-def leer_modo(msg: str, default="arriba"):
-    """
-    Acepta: 'arriba', 'abajo', 'a', 'b', 'up', 'down'. Default 'arriba'.
-    Si entra basura (como rutas/paths), usa default silenciosamente.
-    """
-    val = input(msg)
-    if val.strip().lower() == 'q':
-        return 'q'
-    v = val.strip().lower()
-    if v == '':
-        return default
-    if v in ('arriba', 'a', 'up') or 'arr' in v:
-        return 'arriba'
-    if v in ('abajo', 'b', 'down') or 'ab' in v:
-        return 'abajo'
-    # No molestar con mensajes: usa default
-    return default
-
-# ------------------ Animación (robusta) ------------------
-
-def animate_once_yz(L1: float, L2: float, y_target: float, z_target: float,
-                    elbow_mode: str = "arriba",
-                    frames: int = 150, interval_ms: int = 20):
-    """
-    Anima desde brazo extendido sobre +Y hasta (y_target, z_target) en YZ.
-    """
-    if L1 <= 0 or L2 <= 0:
-        raise ValueError("L1 y L2 deben ser positivos.")
-
-    # Pose inicial: efector en +Y al alcance máximo
-    y_start, z_start = (L1 + L2, 0.0)
-
-    ys = linspace(y_start, y_target, frames)
-    zs = linspace(z_start, z_target, frames)
-
-    # Precalcular IK y validar
-    thetas = []
-    for yi, zi in zip(ys, zs):
-        res = _ik_2r_yz(L1, L2, yi, zi, elbow=elbow_mode)
-        if not res.reachable:
-            raise RuntimeError(f"Trayectoria inalcanzable en ({yi:.3f}, {zi:.3f}).")
-        thetas.append((res.theta1_deg, res.theta2_deg))
-
-    # Inicialización con datos reales para evitar problemas de render
-    th1_0, th2_0 = thetas[0]
-    (x0,y0,z0), (x1,y1,z1), (x2,y2,z2) = fk_2r_yz(L1, L2, th1_0, th2_0)
-
-    fig = plt.figure(figsize=(7, 6))
-    ax = fig.add_subplot(111, projection='3d')
-
-    link1, = ax.plot([x0, x1], [y0, y1], [z0, z1], marker='o', linewidth=3)
-    link2, = ax.plot([x1, x2], [y1, y2], [z1, z2], marker='o', linewidth=3)
-    eff_scatter = ax.scatter([x2], [y2], [z2], s=60, c='r')  # punto rojo actual
-    target_scatter = ax.scatter([0.0], [y_target], [z_target], marker='x', s=80)
-
-    # Límites y vista — X estrecho (plano YZ)
-    reach = L1 + L2
-    m = max(reach, abs(y_target), abs(z_target)) + 5.0
-    ax.set_xlim(-m*0.15, m*0.15)   # X casi fijo
-    ax.set_ylim(-m, m)
-    ax.set_zlim(-m, m)
-    ax.set_box_aspect((0.15, 1, 1))
-    ax.set_title(f"2R Planar (PARADO en YZ) - Codo {elbow_mode} - 3D")
-    ax.set_xlabel("X (≈0)"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
-    ax.grid(True)
-    ax.view_init(elev=25, azim=-35)
-
-    def update(frame):
-        th1, th2 = thetas[frame]
-        (x0,y0,z0), (x1,y1,z1), (x2,y2,z2) = fk_2r_yz(L1, L2, th1, th2)
-        link1.set_data_3d([x0, x1], [y0, y1], [z0, z1])
-        link2.set_data_3d([x1, x2], [y1, y2], [z1, z2])
-        eff_scatter._offsets3d = ([x2], [y2], [z2])
-        return link1, link2, eff_scatter, target_scatter
-
-    anim = FuncAnimation(fig, update, frames=len(thetas),
-                         interval=interval_ms, blit=False, repeat=False)
-    fig._anim = anim  # Mantener referencia
-    plt.show()
-
-# ------------------ Loop interactivo ------------------
-
-def main():
-    print("=== Animación 2R Planar PARADO (YZ) - Codo ARRIBA/ABAJO ===")
-    print("Escribe 'q' en cualquier entrada para salir.\n")
-    while True:
-        try:
-            modo = leer_modo("Modo (arriba/abajo) [arriba]: ", default="arriba")
-            if modo == 'q':
-                break
-
-            L1 = leer_valor("Ingresa L1 (longitud del primer eslabón): ")
-            if L1 == 'q': break
-            L2 = leer_valor("Ingresa L2 (longitud del segundo eslabón): ")
-            if L2 == 'q': break
-            y  = leer_valor("Ingresa Y del objetivo: ")
-            if y == 'q': break
-            z  = leer_valor("Ingresa Z del objetivo: ")
-            if z == 'q': break
-
-            L1, L2, y, z = float(L1), float(L2), float(y), float(z)
-
-            try:
-                animate_once_yz(L1, L2, y, z, elbow_mode=modo, frames=150, interval_ms=20)
-            except Exception as e:
-                # No detener el programa: solo mostrar error y continuar el loop
-                sys.stderr.write(f"[ERROR] {e}\n\n")
-
-        except ValueError as ve:
-            sys.stderr.write(f"[ERROR] {ve}\n\n")
-            continue
-        except KeyboardInterrupt:
-            print("\nSaliendo...")
-            break
-
-if __name__ == "__main__":
-    main()
+#   (Escribe 'q' para salir en cualquier entrada)
+
+import math
+import sys
+from dataclasses import dataclass
+import numpy as np
+
+# ------------------ IK (plano YZ) ------------------
+
+@dataclass
+class IKResult:
+    reachable: bool
+    theta1_deg: float | None
+    theta2_deg: float | None
+    message: str
+
+def _to_deg(a: float) -> float:
+    d = math.degrees(a)
+    while d <= -180: d += 360
+    while d > 180: d -= 360
+    return d
+
+def _ik_2r_yz(L1: float, L2: float, y: float, z: float, elbow: str) -> IKResult:
+    """
+    Inversa para 2R planar en el plano YZ (X=0).
+    elbow: 'arriba' => sin(theta2) positivo, 'abajo' => sin(theta2) negativo.
+    """
+    if L1 <= 0 or L2 <= 0:
+        return IKResult(False, None, None, "L1 y L2 deben ser positivos.")
+
+    r2 = y*y + z*z
+    r = math.sqrt(r2)
+    tol = 1e-9
+    if r > L1 + L2 + tol or r < abs(L1 - L2) - tol:
+        return IKResult(False, None, None, "Objetivo fuera del alcance.")
+
+    c2 = (r2 - L1*L1 - L2*L2) / (2.0 * L1 * L2)
+    c2 = max(-1.0, min(1.0, c2))
+    s2_abs = math.sqrt(max(0.0, 1.0 - c2*c2))
+    s2 = +s2_abs if elbow.startswith("arr") else -s2_abs
+    theta2 = math.atan2(s2, c2)
+
+    k1 = L1 + L2 * c2
+    k2 = L2 * s2
+    # En YZ, el "atan2" de orientación usa (z, y)
+    theta1 = math.atan2(z, y) - math.atan2(k2, k1)
+
+    return IKResult(True, _to_deg(theta1), _to_deg(theta2), "OK")
+
+# ------------------ FK (plano YZ) ------------------
+
+def fk_2r_yz(L1: float, L2: float, th1_deg: float, th2_deg: float):
+    """ Cinemática directa en plano YZ (X=0). """
+    th1 = math.radians(th1_deg)
+    th2 = math.radians(th2_deg)
+    x0, y0, z0 = 0.0, 0.0, 0.0
+    y1 = L1 * math.cos(th1)
+    z1 = L1 * math.sin(th1)
+    x1 = 0.0
+    y2 = y1 + L2 * math.cos(th1 + th2)
+    z2 = z1 + L2 * math.sin(th1 + th2)
+    x2 = 0.0
+    return (x0, y0, z0), (x1, y1, z1), (x2, y2, z2)
+
+# ------------------ IK / FK vectorizados (plano YZ, NumPy) ------------------
+
+def _wrap_deg(d):
+    """ Versión vectorizada de _to_deg: grados a (-180, 180]. """
+    return d - 360.0 * np.ceil((d - 180.0) / 360.0)
+
+def ik_2r_yz_batch(L1: float, L2: float, y, z, elbow: str = "arriba"):
+    """
+    Misma inversa que _ik_2r_yz sobre arreglos de objetivos (y, z).
+    Devuelve (reachable, theta1_deg, theta2_deg); los inalcanzables quedan en NaN.
+    """
+    if L1 <= 0 or L2 <= 0:
+        raise ValueError("L1 y L2 deben ser positivos.")
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    r2 = y*y + z*z
+    r = np.sqrt(r2)
+    tol = 1e-9
+    reachable = (r <= L1 + L2 + tol) & (r >= abs(L1 - L2) - tol)
+
+    c2 = np.clip((r2 - L1*L1 - L2*L2) / (2.0 * L1 * L2), -1.0, 1.0)
+    s2 = np.sqrt(1.0 - c2*c2)
+    if not elbow.startswith("arr"):
+        s2 = -s2
+    theta2 = np.arctan2(s2, c2)
+    theta1 = np.arctan2(z, y) - np.arctan2(L2 * s2, L1 + L2 * c2)
+
+    th1_deg = np.where(reachable, _wrap_deg(np.degrees(theta1)), np.nan)
+    th2_deg = np.where(reachable, _wrap_deg(np.degrees(theta2)), np.nan)
+    return reachable, th1_deg, th2_deg
+
+def fk_2r_yz_batch(L1: float, L2: float, th1_deg, th2_deg):
+    """ fk_2r_yz sobre arreglos: devuelve base, codo y efector como arreglos (..., 3). """
+    th1 = np.radians(np.asarray(th1_deg, dtype=float))
+    th12 = th1 + np.radians(np.asarray(th2_deg, dtype=float))
+    zeros = np.zeros_like(th12)
+    p1 = np.stack([zeros, L1*np.cos(th1), L1*np.sin(th1)], axis=-1)
+    p2 = p1 + np.stack([zeros, L2*np.cos(th12), L2*np.sin(th12)], axis=-1)
+    return np.zeros_like(p2), p1, p2
+
+def joint_interp(q0, q1, frames: int):
+    """
+    Interpolación lineal en espacio articular por el camino angular más corto
+    (q1 se desenvuelve respecto a q0). Devuelve arreglo (frames, n) en grados.
+    """
+    q0 = np.asarray(q0, dtype=float)
+    dq = _wrap_deg(np.asarray(q1, dtype=float) - q0)
+    s = np.linspace(0.0, 1.0, frames) if frames > 1 else np.ones(1)
+    return q0 + s[:, None] * dq
+
+def join_start(q0, Q, frames: int):
+    """
+    Encadena la IK por frame Q (envuelta) con la pose actual q0: desenvuelve Q
+    respecto a q0 y, si Q[0] está en otra rama de la IK que q0, antepone una
+    transición articular joint_interp(q0, Q[0]) en lugar de saltar.
+    """
+    q0 = np.asarray(q0, dtype=float)
+    Q = q0 + np.cumsum(_wrap_deg(np.diff(np.vstack([q0, Q]), axis=0)), axis=0)
+    if np.abs(Q[0] - q0).max() <= 1e-3:
+        return Q
+    return np.vstack([joint_interp(q0, Q[0], frames)[:-1], Q])
+
+# ------------------ Utilidades ------------------
+
+def linspace(a: float, b: float, n: int):
+    if n <= 1:
+        return [b]
+    step = (b - a) / (n - 1)
+    return [a + i*step for i in range(n)]
+
+def leer_valor(msg: str):
+    val = input(msg)
+    if val.strip().lower() == 'q':
+        return 'q'
+    try:
+        return float(val)
+    except Exception:
+        raise ValueError("Entrada no válida. Escribe un número o 'q' para salir.")
+
+def leer_modo(msg: str, default="arriba"):
+    """
+    Acepta: 'arriba', 'abajo', 'a', 'b', 'up', 'down'. Default 'arriba'.
+    Si entra basura (como rutas/paths), usa default silenciosamente.
+    """
+    val = input(msg)
+    if val.strip().lower() == 'q':
+        return 'q'
+    v = val.strip().lower()
+    if v == '':
+        return default
+    if v in ('arriba', 'a', 'up') or 'arr' in v:
+        return 'arriba'
+    if v in ('abajo', 'b', 'down') or 'ab' in v:
+        return 'abajo'
+    # No molestar con mensajes: usa default
+    return default
+
+# ------------------ Animación (robusta) ------------------
+
+def plan_once_yz(L1: float, L2: float, y_target: float, z_target: float,
+                 elbow_mode: str = "arriba",
+                 frames: int = 150, interval_ms: int = 20,
+                 save_path: str | None = None,
+                 obstacles=None, link_radius: float = 0.0,
+                 mode: str = "cartesian", limits=None,
+                 start=(0.0, 0.0),
+                 cache: bool = True):
+    """
+    Trayectoria [(θ1, θ2), ...] de animate_once_yz, sin dibujar.
+    start: ángulos iniciales (por defecto brazo extendido sobre +Y).
+    cache: reutiliza la trayectoria guardada en disco (traj_cache) si ya se calculó
+           con los mismos parámetros y el mismo código.
+    """
+    if cache:
+        from traj_cache import cached
+        from traj_mmap import arm_points
+
+        def compute():
+            q = np.asarray(plan_once_yz(L1, L2, y_target, z_target, elbow_mode, frames, interval_ms, None,
+                                        obstacles, link_radius, mode, limits, start, cache=False), dtype=float)
+            return {'thetas': q, 'points': arm_points("2r_yz", L1, L2, q)}
+
+        motion = {'target': (y_target, z_target), 'elbow': elbow_mode, 'frames': frames,
+                  'interval_ms': interval_ms, 'obstacles': obstacles, 'link_radius': link_radius,
+                  'mode': mode, 'limits': limits, 'start': start}
+        arr = cached({'model': "2r_yz", 'L1': L1, 'L2': L2}, motion, compute,
+                     modules=(__name__, 'retiming', 'collision', 'planner', 'cspace_2r',
+                              'traj_mmap', 'batch_ik'))
+        thetas = [tuple(q) for q in arr['thetas'].tolist()]
+        if save_path is not None:
+            from traj_mmap import save_arm_trajectory
+            save_arm_trajectory(save_path, "2r_yz", L1, L2, thetas, elbow_mode=elbow_mode)
+        return thetas
+
+    if L1 <= 0 or L2 <= 0:
+        raise ValueError("L1 y L2 deben ser positivos.")
+
+    if mode not in ("cartesian", "joint"):
+        raise ValueError("mode debe ser 'cartesian' o 'joint'.")
+
+    # Pose inicial: efector donde lo deja 'start' (+Y al alcance máximo por defecto)
+    _, _, (_, y_start, z_start) = fk_2r_yz(L1, L2, *start)
+
+    if mode == "joint":
+        # Una sola IK (la meta); los ángulos intermedios salen de interpolar
+        res = _ik_2r_yz(L1, L2, y_target, z_target, elbow=elbow_mode)
+        if not res.reachable:
+            raise RuntimeError(f"Objetivo inalcanzable en ({y_target:.3f}, {z_target:.3f}).")
+        thetas = [tuple(q) for q in joint_interp(start, (res.theta1_deg, res.theta2_deg),
+                                                  frames).tolist()]
+    else:
+        ys = linspace(y_start, y_target, frames)
+        zs = linspace(z_start, z_target, frames)
+
+        # Precalcular IK y validar
+        thetas = []
+        for yi, zi in zip(ys, zs):
+            res = _ik_2r_yz(L1, L2, yi, zi, elbow=elbow_mode)
+            if not res.reachable:
+                # La recta sale del espacio de trabajo: ruta en espacio articular
+                from planner import plan_frames
+                thetas = plan_frames("2r_yz", L1, L2, start, (y_target, z_target), frames,
+                                     obstacles, link_radius)
+                break
+            thetas.append((res.theta1_deg, res.theta2_deg))
+        else:
+            thetas = join_start(start, thetas, frames)
+        thetas = [tuple(q) for q in np.asarray(thetas).tolist()]
+
+    if limits is not None:
+        from retiming import retime
+        # La IK envuelve a (-180, 180]: desenvolver para que el retiming no vea saltos de 360°
+        q = np.degrees(np.unwrap(np.radians(np.asarray(thetas, dtype=float)), axis=0))
+        tim = retime(q, *limits, rate_hz=1000.0 / interval_ms)
+        thetas = [tuple(q) for q in tim.q.tolist()]
+
+    if obstacles:
+        from collision import check_trajectory
+        q = np.asarray(thetas, dtype=float)
+        pts = np.stack(fk_2r_yz_batch(L1, L2, *q.T), axis=1)
+        col = check_trajectory(pts, obstacles, radii=link_radius)
+        if col.collides:
+            raise RuntimeError(col.message)
+
+    if save_path is not None:
+        from traj_mmap import save_arm_trajectory
+        save_arm_trajectory(save_path, "2r_yz", L1, L2, thetas, elbow_mode=elbow_mode)
+    return thetas
+
+class ArmView:
+    """ Figura 3D con los artistas del brazo; se crea una vez y se reapunta. """
+
+    def __init__(self, L1: float, L2: float, y_target: float, z_target: float,
+                 elbow_mode: str = "arriba", start=(0.0, 0.0)):
+        import matplotlib.pyplot as plt            # carga perezosa: solo al dibujar
+        self.fig = plt.figure(figsize=(7, 6))
+        self.ax = self.fig.add_subplot(111, projection='3d')
+        ax = self.ax
+
+        # Inicialización con datos reales para evitar problemas de render
+        (x0,y0,z0), (x1,y1,z1), (x2,y2,z2) = fk_2r_yz(L1, L2, *start)
+
+        self.link1, = ax.plot([x0, x1], [y0, y1], [z0, z1], marker='o', linewidth=3)
+        self.link2, = ax.plot([x1, x2], [y1, y2], [z1, z2], marker='o', linewidth=3)
+        self.eff_scatter = ax.scatter([x2], [y2], [z2], s=60, c='r')  # punto rojo actual
+        self.target_scatter = ax.scatter([0.0], [y_target], [z_target], marker='x', s=80)
+
+        ax.set_box_aspect((0.15, 1, 1))
+        ax.set_xlabel("X (≈0)"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
+        ax.grid(True)
+        ax.view_init(elev=25, azim=-35)
+        self.retarget(L1, L2, y_target, z_target, elbow_mode)
+
+    def retarget(self, L1: float, L2: float, y_target: float, z_target: float,
+                 elbow_mode: str = "arriba"):
+        """ Mueve la marca del objetivo y ajusta límites/título, sin recrear nada. """
+        self.L1, self.L2 = L1, L2
+        self.target_scatter._offsets3d = ([0.0], [y_target], [z_target])
+        # Límites y vista — X estrecho (plano YZ)
+        reach = L1 + L2
+        m = max(reach, abs(y_target), abs(z_target)) + 5.0
+        self.ax.set_xlim(-m*0.15, m*0.15)   # X casi fijo
+        self.ax.set_ylim(-m, m)
+        self.ax.set_zlim(-m, m)
+        self.ax.set_title(f"2R Planar (PARADO en YZ) - Codo {elbow_mode} - 3D")
+
+    def set_pose(self, th1: float, th2: float):
+        (x0,y0,z0), (x1,y1,z1), (x2,y2,z2) = fk_2r_yz(self.L1, self.L2, th1, th2)
+        self.link1.set_data_3d([x0, x1], [y0, y1], [z0, z1])
+        self.link2.set_data_3d([x1, x2], [y1, y2], [z1, z2])
+        self.eff_scatter._offsets3d = ([x2], [y2], [z2])
+        return self.link1, self.link2, self.eff_scatter, self.target_scatter
+
+def animate_once_yz(L1: float, L2: float, y_target: float, z_target: float,
+                    elbow_mode: str = "arriba",
+                    frames: int = 150, interval_ms: int = 20,
+                    save_path: str | None = None,
+                    obstacles=None, link_radius: float = 0.0,
+                    mode: str = "cartesian", limits=None):
+    """
+    Anima desde brazo extendido sobre +Y hasta (y_target, z_target) en YZ.
+    mode: 'cartesian' => recta en YZ, IK en cada frame.
+          'joint'     => una sola IK en la meta e interpolación de ángulos (FK por frame).
+    limits: (vmax, amax) por articulación [grados/s, grados/s²]; si se indica, la ruta
+            se re-temporiza (tiempo mínimo) y se muestrea cada interval_ms.
+    save_path: si se indica, guarda la trayectoria (.rtraj) para reproducirla
+               después con traj_mmap.replay sin volver a resolver la IK.
+    obstacles: lista de obstáculos (collision.py); si algún frame choca, lanza RuntimeError.
+    """
+    thetas = plan_once_yz(L1, L2, y_target, z_target, elbow_mode, frames, interval_ms,
+                          save_path, obstacles, link_radius, mode, limits)
+
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    view = ArmView(L1, L2, y_target, z_target, elbow_mode, start=thetas[0])
+
+    def update(frame):
+        return view.set_pose(*thetas[frame])
+
+    anim = FuncAnimation(view.fig, update, frames=len(thetas),
+                         interval=interval_ms, blit=False, repeat=False)
+    view.fig._anim = anim  # Mantener referencia
+    plt.show()
+
+# ------------------ Sesión (una sola figura) ------------------
+
+class ArmSession:
+    """
+    Mantiene una figura viva entre objetivos: la primera llamada crea figura, ejes
+    y artistas; las siguientes solo reapuntan y animan desde la pose actual, sin
+    bloquear en plt.show(). Si el usuario cierra la ventana, se vuelve a crear.
+    """
+
+    def __init__(self):
+        self.view = None
+        self.q = (0.0, 0.0)          # pose actual (brazo extendido sobre +Y)
+
+    def _ensure_view(self, L1, L2, y_target, z_target, elbow_mode):
+        import matplotlib.pyplot as plt
+        if self.view is None or not plt.fignum_exists(self.view.fig.number):
+            plt.ion()
+            self.view = ArmView(L1, L2, y_target, z_target, elbow_mode, start=self.q)
+            plt.show(block=False)
+        else:
+            self.view.retarget(L1, L2, y_target, z_target, elbow_mode)
+        return self.view
+
+    def move_to(self, L1: float, L2: float, y_target: float, z_target: float,
+                elbow_mode: str = "arriba", frames: int = 150, interval_ms: int = 20, **kwargs):
+        """ Mismos argumentos que animate_once_yz; parte de la pose en la que quedó el brazo. """
+        import matplotlib.pyplot as plt
+        thetas = plan_once_yz(L1, L2, y_target, z_target, elbow_mode, frames, interval_ms,
+                              start=self.q, **kwargs)
+        view = self._ensure_view(L1, L2, y_target, z_target, elbow_mode)
+        for th in thetas:
+            view.set_pose(*th)
+            plt.pause(interval_ms / 1000.0)
+        self.q = thetas[-1]
+        return thetas
+
+    def move_through(self, L1: float, L2: float, targets, elbow_mode: str = "arriba",
+                     frames: int = 150, interval_ms: int = 20, backend: str = "thread",
+                     lookahead: int = 2, **kwargs):
+        """
+        Recorre targets [(y, z), ...] en orden. Mientras se anima un movimiento, el
+        siguiente ya se resuelve en segundo plano (pipeline.MotionPipeline), sin pausa
+        de cómputo entre movimientos. Un objetivo que falla se informa y se salta.
+        """
+        import matplotlib.pyplot as plt
+        from pipeline import MotionPipeline, feed
+        pipe = MotionPipeline(plan_once_yz, self.q, maxsize=lookahead, backend=backend)
+        feed(pipe, [(L1, L2, *t) for t in targets], elbow_mode=elbow_mode, frames=frames,
+             interval_ms=interval_ms, **kwargs)
+        done = []
+        try:
+            for args, _, out in pipe:
+                if isinstance(out, Exception):
+                    sys.stderr.write(f"[ERROR] {args[2:]}: {out}\n")
+                    continue
+                view = self._ensure_view(*args, elbow_mode)
+                for th in out:
+                    view.set_pose(*th)
+                    plt.pause(interval_ms / 1000.0)
+                self.q = out[-1]
+                done.append(out)
+        finally:
+            pipe.cancel()
+        return done
+
+
+# ------------------ Loop interactivo ------------------
+
+def main(session: bool = False):
+    """ session=True: una sola ventana para todos los objetivos (ArmSession). """
+    print("=== Animación 2R Planar PARADO (YZ) - Codo ARRIBA/ABAJO ===")
+    print("Escribe 'q' en cualquier entrada para salir.\n")
+    sess = ArmSession() if session else None
+    while True:
+        try:
+            modo = leer_modo("Modo (arriba/abajo) [arriba]: ", default="arriba")
+            if modo == 'q':
+                break
+
+            L1 = leer_valor("Ingresa L1 (longitud del primer eslabón): ")
+            if L1 == 'q': break
+            L2 = leer_valor("Ingresa L2 (longitud del segundo eslabón): ")
+            if L2 == 'q': break
+            y  = leer_valor("Ingresa Y del objetivo: ")
+            if y == 'q': break
+            z  = leer_valor("Ingresa Z del objetivo: ")
+            if z == 'q': break
+
+            L1, L2, y, z = float(L1), float(L2), float(y), float(z)
+
+            try:
+                if sess is not None:
+                    sess.move_to(L1, L2, y, z, elbow_mode=modo, frames=150, interval_ms=20)
+                else:
+                    animate_once_yz(L1, L2, y, z, elbow_mode=modo, frames=150, interval_ms=20)
+            except Exception as e:
+                # No detener el programa: solo mostrar error y continuar el loop
+                sys.stderr.write(f"[ERROR] {e}\n\n")
+
+        except ValueError as ve:
+            sys.stderr.write(f"[ERROR] {ve}\n\n")
+            continue
+        except KeyboardInterrupt:
+            print("\nSaliendo...")
+            break
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    if sys.argv[1:] == ["--session"]:
+        main(session=True)      # una sola ventana reutilizada entre objetivos
+    elif sys.argv[1:2] == ["--queue"] and len(sys.argv) > 5:
+        # --queue L1 L2 modo y,z y,z ...: objetivos encadenados, el siguiente se
+        # resuelve mientras se anima el actual
+        L1, L2, modo = float(sys.argv[2]), float(sys.argv[3]), sys.argv[4]
+        ArmSession().move_through(L1, L2, [tuple(map(float, p.split(","))) for p in sys.argv[5:]],
+                                  elbow_mode=modo)
+    elif sys.argv[1:] == ["--pick"]:
+        from interactive import TargetPicker   # objetivo con clic/arrastre y sliders
+        TargetPicker("2r_yz").run()
+    elif len(sys.argv) > 1:
+        # Con argumentos: modo por lotes sin GUI (ver batch_ik.py --help)
+        from batch_ik import main as batch_main
+        sys.exit(batch_main(["--model", "2r_yz", *sys.argv[1:]]))
+    else:
+        main()
@@ -1,211 +1,474 @@
-#   (Escribe 'q' para salir en cualquier entrada)
-
-import math
-import sys
-from dataclasses import dataclass
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-
-# ------------------ Utilidades ------------------
-
-@dataclass
-class IKResult:
-    reachable: bool
-    th1_deg: float | None
-    th2_deg: float | None
-    th3_deg: float | None
-    message: str
-
-def to_deg(a: float) -> float:
-    d = math.degrees(a)
-    while d <= -180: d += 360
-    while d > 180: d -= 360
-    return d
-
-def linspace(a: float, b: float, n: int):
-    if n <= 1: return [b]
-    step = (b - a) / (n - 1)
-    return [a + i*step for i in range(n)]
-
-def leer_valor(msg: str):
-    val = input(msg)
-    if val.strip().lower() == 'q':
-        return 'q'
-    try:
-        return float(val)
-    except Exception:
-        raise ValueError("Entrada no válida. Escribe un número o 'q' para salir.")
-
-def leer_modo(msg: str, default="arriba"):
-    v = input(msg).strip().lower()
-    if v == 'q': return 'q'
-    if v == '': return default
-    if v in ('arriba','a','up') or 'arr' in v: return 'arriba'
-    if v in ('abajo','b','down') or 'ab' in v: return 'abajo'
-    return default
-
-# ------------------ IK (RRR esférico) ------------------
-
-def ik_rrr_spherical(L1: float, L2: float, x: float, y: float, z: float, elbow_mode: str) -> IKResult:
-    """
-    IK cerrada:
-      th1 = atan2(y, x)
-      En el plano (r,z) con r = sqrt(x^2+y^2):
-        cos(th3) = (r^2 + z^2 - L1^2 - L2^2) / (2 L1 L2)
-        th3 = atan2( ±sqrt(1-cos^2), cos )   (signo por codo arriba/abajo)
-        th2 = atan2(z, r) - atan2(L2 sin(th3), L1 + L2 cos(th3))
-    """
-    if L1 <= 0 or L2 <= 0:
-        return IKResult(False, None, None, None, "L1 y L2 deben ser positivos.")
-
-    r = math.hypot(x, y)          # distancia en XY
-    rho = math.hypot(r, z)        # distancia en el plano (r,z)
-
-    # Alcanzabilidad del 2R
-    if rho > L1 + L2 + 1e-9 or rho < abs(L1 - L2) - 1e-9:
-        return IKResult(False, None, None, None, "Objetivo fuera del alcance del brazo.")
-
-    th1 = math.atan2(y, x)
-
-    # Ley de cosenos para el codo (th3)
-    c3 = (r*r + z*z - L1*L1 - L2*L2) / (2.0 * L1 * L2)
-    c3 = max(-1.0, min(1.0, c3))
-    s3_abs = math.sqrt(max(0.0, 1.0 - c3*c3))
-    s3 = +s3_abs if elbow_mode == 'arriba' else -s3_abs
-    th3 = math.atan2(s3, c3)
-
-    # Hombro (th2)
-    k1 = L1 + L2 * c3
-    k2 = L2 * s3
-    th2 = math.atan2(z, r) - math.atan2(k2, k1)
-
-    return IKResult(True, to_deg(th1), to_deg(th2), to_deg(th3), "OK")
-
-# ------------------ FK ------------------
-
-def fk_rrr_spherical(L1: float, L2: float, th1_deg: float, th2_deg: float, th3_deg: float):
-    """
-    FK:
-      En el plano (r,z):
-        r1 = L1 cos(th2), z1 = L1 sin(th2)
-        r2 = r1 + L2 cos(th2+th3), z2 = z1 + L2 sin(th2+th3)
-      Proyección a 3D con th1:
-        x = r * cos(th1), y = r * sin(th1)
-    """
-    th1 = math.radians(th1_deg)
-    th2 = math.radians(th2_deg)
-    th3 = math.radians(th3_deg)
-
-    r1 = L1 * math.cos(th2)
-    z1 = L1 * math.sin(th2)
-    r2 = r1 + L2 * math.cos(th2 + th3)
-    z2 = z1 + L2 * math.sin(th2 + th3)
-
-    x1 = r1 * math.cos(th1)
-    y1 = r1 * math.sin(th1)
-    x2 = r2 * math.cos(th1)
-    y2 = r2 * math.sin(th1)
-
-    base = (0.0, 0.0, 0.0)
-    joint = (x1, y1, z1)
-    tip   = (x2, y2, z2)
-    return base, joint, tip
-
-# ------------------ Animación ------------------
-
-def animate_once_rrr(L1: float, L2: float, x_t: float, y_t: float, z_t: float,
-                     elbow_mode: str = "arriba",
-                     frames: int = 180, interval_ms: int = 20):
-    """
-    Trayectoria cartesiana lineal desde (L1+L2, 0, 0) hasta (x_t, y_t, z_t).
-    Valida alcanzabilidad e IK en cada frame.
-    """
-    # Pose inicial: brazo extendido en +X, z=0
-    x0, y0, z0 = (L1 + L2, 0.0, 0.0)
-
-    xs = linspace(x0, x_t, frames)
-    ys = linspace(y0, y_t, frames)
-    zs = linspace(z0, z_t, frames)
-
-    sols = []
-    for xi, yi, zi in zip(xs, ys, zs):
-        res = ik_rrr_spherical(L1, L2, xi, yi, zi, elbow_mode)
-        if not res.reachable:
-            raise RuntimeError(f"Trayectoria inalcanzable en ({xi:.3f},{yi:.3f},{zi:.3f}).")
-        sols.append((res.th1_deg, res.th2_deg, res.th3_deg))
-
-    # Inicialización con datos reales
-    th1_0, th2_0, th3_0 = sols[0]
-    base, joint, tip = fk_rrr_spherical(L1, L2, th1_0, th2_0, th3_0)
-
-    fig = plt.figure(figsize=(7, 6))
-    ax = fig.add_subplot(111, projection='3d')
-
-    link1, = ax.plot([base[0], joint[0]], [base[1], joint[1]], [base[2], joint[2]],
-                     marker='o', linewidth=3)
-    link2, = ax.plot([joint[0], tip[0]], [joint[1], tip[1]], [joint[2], tip[2]],
-                     marker='o', linewidth=3)
-    eff_scatter = ax.scatter([tip[0]], [tip[1]], [tip[2]], s=60, c='r')  # efector
-    target_scatter = ax.scatter([x_t], [y_t], [z_t], marker='x', s=80)
-
-    # Límites de la escena
-    reach = L1 + L2
-    m = max(reach, abs(x_t), abs(y_t), abs(z_t)) + 5.0
-    ax.set_xlim(-m, m); ax.set_ylim(-m, m); ax.set_zlim(-m, m)
-    ax.set_box_aspect((1, 1, 1))
-    ax.set_title(f"RRR esférico (parado) - 3D - Codo {elbow_mode}")
-    ax.set_xlabel("X"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
-    ax.grid(True)
-    ax.view_init(elev=25, azim=-45)
-
-    def update(frame):
-        th1, th2, th3 = sols[frame]
-        base, joint, tip = fk_rrr_spherical(L1, L2, th1, th2, th3)
-        link1.set_data_3d([base[0], joint[0]], [base[1], joint[1]], [base[2], joint[2]])
-        link2.set_data_3d([joint[0], tip[0]], [joint[1], tip[1]], [joint[2], tip[2]])
-        eff_scatter._offsets3d = ([tip[0]], [tip[1]], [tip[2]])
-        return link1, link2, eff_scatter, target_scatter
-
-    anim = FuncAnimation(fig, update, frames=len(sols), interval=interval_ms,
-                         blit=False, repeat=False)
-    fig._anim = anim   # mantener referencia
-    plt.show()
-
-# ------------------ Loop interactivo ------------------
-
-def main():
-    print("=== RRR esférico (parado) - Animación 3D ===")
-    print("Escribe 'q' en cualquier entrada para salir.\n")
-    while True:
-        try:
-            modo = leer_modo("Modo (arriba/abajo) [arriba]: ", default="arriba")
-            if modo == 'q': break
-
-            L1 = leer_valor("Ingresa L1: ")
-            if L1 == 'q': break
-            L2 = leer_valor("Ingresa L2: ")
-            if L2 == 'q': break
-            x  = leer_valor("Ingresa X del objetivo: ")
-            if x == 'q': break
-            y  = leer_valor("Ingresa Y del objetivo: ")
-            if y == 'q': break
-            z  = leer_valor("Ingresa Z del objetivo: ")
-            if z == 'q': break
-
-            L1, L2, x, y, z = float(L1), float(L2), float(x), float(y), float(z)
-
-            try:
-                animate_once_rrr(L1, L2, x, y, z, elbow_mode=modo, frames=180, interval_ms=20)
-            except Exception as e:
-                sys.stderr.write(f"[ERROR] {e}\n\n")  # no detiene el loop
-
-        except ValueError as ve:
-            sys.stderr.write(f"[ERROR] {ve}\n\n")
-            continue
-        except KeyboardInterrupt:
-            print("\nSaliendo...")
-            break
-
-if __name__ == "__main__":
-    main()
+#   (Escribe 'q' para salir en cualquier entrada)
+
+import math
+import sys
+from dataclasses import dataclass
+import numpy as np
+
+# ------------------ Utilidades ------------------
+
+@dataclass
+class IKResult:
+    reachable: bool
+    th1_deg: float | None
+    th2_deg: float | None
+    th3_deg: float | None
+    message: str
+
+def to_deg(a: float) -> float:
+    d = math.degrees(a)
+    while d <= -180: d += 360
+    while d > 180: d -= 360
+    return d
+
+def linspace(a: float, b: float, n: int):
+    if n <= 1: return [b]
+    step = (b - a) / (n - 1)
+    return [a + i*step for i in range(n)]
+
+def leer_valor(msg: str):
+    val = input(msg)
+    if val.strip().lower() == 'q':
+        return 'q'
+    try:
+        return float(val)
+    except Exception:
+        raise ValueError("Entrada no válida. Escribe un número o 'q' para salir.")
+
+def leer_modo(msg: str, default="arriba"):
+    v = input(msg).strip().lower()
+    if v == 'q': return 'q'
+    if v == '': return default
+    if v in ('arriba','a','up') or 'arr' in v: return 'arriba'
+    if v in ('abajo','b','down') or 'ab' in v: return 'abajo'
+    return default
+
+# ------------------ IK (RRR esférico) ------------------
+
+def ik_rrr_spherical(L1: float, L2: float, x: float, y: float, z: float, elbow_mode: str) -> IKResult:
+    """
+    IK cerrada:
+      th1 = atan2(y, x)
+      En el plano (r,z) con r = sqrt(x^2+y^2):
+        cos(th3) = (r^2 + z^2 - L1^2 - L2^2) / (2 L1 L2)
+        th3 = atan2( ±sqrt(1-cos^2), cos )   (signo por codo arriba/abajo)
+        th2 = atan2(z, r) - atan2(L2 sin(th3), L1 + L2 cos(th3))
+    """
+    if L1 <= 0 or L2 <= 0:
+        return IKResult(False, None, None, None, "L1 y L2 deben ser positivos.")
+
+    r = math.hypot(x, y)          # distancia en XY
+    rho = math.hypot(r, z)        # distancia en el plano (r,z)
+
+    # Alcanzabilidad del 2R
+    if rho > L1 + L2 + 1e-9 or rho < abs(L1 - L2) - 1e-9:
+        return IKResult(False, None, None, None, "Objetivo fuera del alcance del brazo.")
+
+    th1 = math.atan2(y, x)
+
+    # Ley de cosenos para el codo (th3)
+    c3 = (r*r + z*z - L1*L1 - L2*L2) / (2.0 * L1 * L2)
+    c3 = max(-1.0, min(1.0, c3))
+    s3_abs = math.sqrt(max(0.0, 1.0 - c3*c3))
+    s3 = +s3_abs if elbow_mode == 'arriba' else -s3_abs
+    th3 = math.atan2(s3, c3)
+
+    # Hombro (th2)
+    k1 = L1 + L2 * c3
+    k2 = L2 * s3
+    th2 = math.atan2(z, r) - math.atan2(k2, k1)
+
+    return IKResult(True, to_deg(th1), to_deg(th2), to_deg(th3), "OK")
+
+# ------------------ FK ------------------
+
+def fk_rrr_spherical(L1: float, L2: float, th1_deg: float, th2_deg: float, th3_deg: float):
+    """
+    FK:
+      En el plano (r,z):
+        r1 = L1 cos(th2), z1 = L1 sin(th2)
+        r2 = r1 + L2 cos(th2+th3), z2 = z1 + L2 sin(th2+th3)
+      Proyección a 3D con th1:
+        x = r * cos(th1), y = r * sin(th1)
+    """
+    th1 = math.radians(th1_deg)
+    th2 = math.radians(th2_deg)
+    th3 = math.radians(th3_deg)
+
+    r1 = L1 * math.cos(th2)
+    z1 = L1 * math.sin(th2)
+    r2 = r1 + L2 * math.cos(th2 + th3)
+    z2 = z1 + L2 * math.sin(th2 + th3)
+
+    x1 = r1 * math.cos(th1)
+    y1 = r1 * math.sin(th1)
+    x2 = r2 * math.cos(th1)
+    y2 = r2 * math.sin(th1)
+
+    base = (0.0, 0.0, 0.0)
+    joint = (x1, y1, z1)
+    tip   = (x2, y2, z2)
+    return base, joint, tip
+
+# ------------------ IK / FK vectorizados (NumPy) ------------------
+
+def _wrap_deg(d):
+    """ Versión vectorizada de to_deg: grados a (-180, 180]. """
+    return d - 360.0 * np.ceil((d - 180.0) / 360.0)
+
+def ik_rrr_spherical_batch(L1: float, L2: float, x, y, z, elbow_mode: str = "arriba"):
+    """
+    Misma IK cerrada que ik_rrr_spherical sobre arreglos de objetivos (x, y, z).
+    Devuelve (reachable, th1_deg, th2_deg, th3_deg); los inalcanzables quedan en NaN.
+    """
+    if L1 <= 0 or L2 <= 0:
+        raise ValueError("L1 y L2 deben ser positivos.")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    r = np.hypot(x, y)
+    rho = np.hypot(r, z)
+    reachable = (rho <= L1 + L2 + 1e-9) & (rho >= abs(L1 - L2) - 1e-9)
+
+    th1 = np.arctan2(y, x)
+    c3 = np.clip((r*r + z*z - L1*L1 - L2*L2) / (2.0 * L1 * L2), -1.0, 1.0)
+    s3 = np.sqrt(1.0 - c3*c3)
+    if elbow_mode != 'arriba':
+        s3 = -s3
+    th3 = np.arctan2(s3, c3)
+    th2 = np.arctan2(z, r) - np.arctan2(L2 * s3, L1 + L2 * c3)
+
+    out = [np.where(reachable, _wrap_deg(np.degrees(a)), np.nan) for a in (th1, th2, th3)]
+    return (reachable, *out)
+
+def fk_rrr_spherical_batch(L1: float, L2: float, th1_deg, th2_deg, th3_deg):
+    """ fk_rrr_spherical sobre arreglos: devuelve base, codo y efector como arreglos (..., 3). """
+    th1 = np.radians(np.asarray(th1_deg, dtype=float))
+    th2 = np.radians(np.asarray(th2_deg, dtype=float))
+    th23 = th2 + np.radians(np.asarray(th3_deg, dtype=float))
+
+    r1 = L1 * np.cos(th2)
+    z1 = L1 * np.sin(th2)
+    r2 = r1 + L2 * np.cos(th23)
+    z2 = z1 + L2 * np.sin(th23)
+
+    c1, s1 = np.cos(th1), np.sin(th1)
+    joint = np.stack([r1*c1, r1*s1, z1], axis=-1)
+    tip = np.stack([r2*c1, r2*s1, z2], axis=-1)
+    return np.zeros_like(tip), joint, tip
+
+def joint_interp(q0, q1, frames: int):
+    """
+    Interpolación lineal en espacio articular por el camino angular más corto
+    (q1 se desenvuelve respecto a q0). Devuelve arreglo (frames, n) en grados.
+    """
+    q0 = np.asarray(q0, dtype=float)
+    dq = _wrap_deg(np.asarray(q1, dtype=float) - q0)
+    s = np.linspace(0.0, 1.0, frames) if frames > 1 else np.ones(1)
+    return q0 + s[:, None] * dq
+
+def join_start(q0, Q, frames: int):
+    """
+    Encadena la IK por frame Q (envuelta) con la pose actual q0: desenvuelve Q
+    respecto a q0 y, si Q[0] está en otra rama de la IK que q0, antepone una
+    transición articular joint_interp(q0, Q[0]) en lugar de saltar.
+    """
+    q0 = np.asarray(q0, dtype=float)
+    Q = q0 + np.cumsum(_wrap_deg(np.diff(np.vstack([q0, Q]), axis=0)), axis=0)
+    if np.abs(Q[0] - q0).max() <= 1e-3:
+        return Q
+    return np.vstack([joint_interp(q0, Q[0], frames)[:-1], Q])
+
+# ------------------ Animación ------------------
+
+def plan_once_rrr(L1: float, L2: float, x_t: float, y_t: float, z_t: float,
+                  elbow_mode: str = "arriba",
+                  frames: int = 180, interval_ms: int = 20,
+                  save_path: str | None = None,
+                  obstacles=None, link_radius: float = 0.0,
+                  mode: str = "cartesian", limits=None,
+                  start=(0.0, 0.0, 0.0),
+                  cache: bool = True):
+    """
+    Trayectoria [(θ1, θ2, θ3), ...] de animate_once_rrr, sin dibujar.
+    start: ángulos iniciales (por defecto brazo extendido en +X, z=0).
+    cache: reutiliza la trayectoria guardada en disco (traj_cache) si ya se calculó
+           con los mismos parámetros y el mismo código.
+    """
+    if cache:
+        from traj_cache import cached
+        from traj_mmap import arm_points
+
+        def compute():
+            q = np.asarray(plan_once_rrr(L1, L2, x_t, y_t, z_t, elbow_mode, frames, interval_ms, None,
+                                         obstacles, link_radius, mode, limits, start, cache=False), dtype=float)
+            return {'thetas': q, 'points': arm_points("rrr", L1, L2, q)}
+
+        motion = {'target': (x_t, y_t, z_t), 'elbow': elbow_mode, 'frames': frames,
+                  'interval_ms': interval_ms, 'obstacles': obstacles, 'link_radius': link_radius,
+                  'mode': mode, 'limits': limits, 'start': start}
+        arr = cached({'model': "rrr", 'L1': L1, 'L2': L2}, motion, compute,
+                     modules=(__name__, 'retiming', 'collision', 'planner', 'cspace_2r',
+                              'traj_mmap', 'batch_ik'))
+        sols = [tuple(q) for q in arr['thetas'].tolist()]
+        if save_path is not None:
+            from traj_mmap import save_arm_trajectory
+            save_arm_trajectory(save_path, "rrr", L1, L2, sols, elbow_mode=elbow_mode)
+        return sols
+
+    if mode not in ("cartesian", "joint"):
+        raise ValueError("mode debe ser 'cartesian' o 'joint'.")
+
+    # Pose inicial: efector donde lo deja 'start'
+    _, _, (x0, y0, z0) = fk_rrr_spherical(L1, L2, *start)
+
+    if mode == "joint":
+        # Una sola IK (la meta); los ángulos intermedios salen de interpolar
+        res = ik_rrr_spherical(L1, L2, x_t, y_t, z_t, elbow_mode)
+        if not res.reachable:
+            raise RuntimeError(f"Objetivo inalcanzable en ({x_t:.3f},{y_t:.3f},{z_t:.3f}).")
+        sols = [tuple(q) for q in joint_interp(start,
+                                               (res.th1_deg, res.th2_deg, res.th3_deg),
+                                               frames).tolist()]
+    else:
+        xs = linspace(x0, x_t, frames)
+        ys = linspace(y0, y_t, frames)
+        zs = linspace(z0, z_t, frames)
+
+        sols = []
+        for xi, yi, zi in zip(xs, ys, zs):
+            res = ik_rrr_spherical(L1, L2, xi, yi, zi, elbow_mode)
+            if not res.reachable:
+                # La recta sale del espacio de trabajo: ruta en espacio articular
+                from planner import plan_frames
+                sols = plan_frames("rrr", L1, L2, start, (x_t, y_t, z_t), frames,
+                                   obstacles, link_radius)
+                break
+            sols.append((res.th1_deg, res.th2_deg, res.th3_deg))
+        else:
+            sols = join_start(start, sols, frames)
+        sols = [tuple(q) for q in np.asarray(sols).tolist()]
+
+    if limits is not None:
+        from retiming import retime
+        # La IK envuelve a (-180, 180]: desenvolver para que el retiming no vea saltos de 360°
+        q = np.degrees(np.unwrap(np.radians(np.asarray(sols, dtype=float)), axis=0))
+        tim = retime(q, *limits, rate_hz=1000.0 / interval_ms)
+        sols = [tuple(q) for q in tim.q.tolist()]
+
+    if obstacles:
+        from collision import check_trajectory
+        q = np.asarray(sols, dtype=float)
+        pts = np.stack(fk_rrr_spherical_batch(L1, L2, *q.T), axis=1)
+        col = check_trajectory(pts, obstacles, radii=link_radius)
+        if col.collides:
+            raise RuntimeError(col.message)
+
+    if save_path is not None:
+        from traj_mmap import save_arm_trajectory
+        save_arm_trajectory(save_path, "rrr", L1, L2, sols, elbow_mode=elbow_mode)
+    return sols
+
+class ArmView:
+    """ Figura 3D con los artistas del brazo; se crea una vez y se reapunta. """
+
+    def __init__(self, L1: float, L2: float, x_t: float, y_t: float, z_t: float,
+                 elbow_mode: str = "arriba", start=(0.0, 0.0, 0.0)):
+        import matplotlib.pyplot as plt            # carga perezosa: solo al dibujar
+        self.fig = plt.figure(figsize=(7, 6))
+        self.ax = self.fig.add_subplot(111, projection='3d')
+        ax = self.ax
+
+        # Inicialización con datos reales
+        base, joint, tip = fk_rrr_spherical(L1, L2, *start)
+
+        self.link1, = ax.plot([base[0], joint[0]], [base[1], joint[1]], [base[2], joint[2]],
+                              marker='o', linewidth=3)
+        self.link2, = ax.plot([joint[0], tip[0]], [joint[1], tip[1]], [joint[2], tip[2]],
+                              marker='o', linewidth=3)
+        self.eff_scatter = ax.scatter([tip[0]], [tip[1]], [tip[2]], s=60, c='r')  # efector
+        self.target_scatter = ax.scatter([x_t], [y_t], [z_t], marker='x', s=80)
+
+        ax.set_box_aspect((1, 1, 1))
+        ax.set_xlabel("X"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
+        ax.grid(True)
+        ax.view_init(elev=25, azim=-45)
+        self.retarget(L1, L2, x_t, y_t, z_t, elbow_mode)
+
+    def retarget(self, L1: float, L2: float, x_t: float, y_t: float, z_t: float,
+                 elbow_mode: str = "arriba"):
+        """ Mueve la marca del objetivo y ajusta límites/título, sin recrear nada. """
+        self.L1, self.L2 = L1, L2
+        self.target_scatter._offsets3d = ([x_t], [y_t], [z_t])
+        # Límites de la escena
+        reach = L1 + L2
+        m = max(reach, abs(x_t), abs(y_t), abs(z_t)) + 5.0
+        self.ax.set_xlim(-m, m); self.ax.set_ylim(-m, m); self.ax.set_zlim(-m, m)
+        self.ax.set_title(f"RRR esférico (parado) - 3D - Codo {elbow_mode}")
+
+    def set_pose(self, th1: float, th2: float, th3: float):
+        base, joint, tip = fk_rrr_spherical(self.L1, self.L2, th1, th2, th3)
+        self.link1.set_data_3d([base[0], joint[0]], [base[1], joint[1]], [base[2], joint[2]])
+        self.link2.set_data_3d([joint[0], tip[0]], [joint[1], tip[1]], [joint[2], tip[2]])
+        self.eff_scatter._offsets3d = ([tip[0]], [tip[1]], [tip[2]])
+        return self.link1, self.link2, self.eff_scatter, self.target_scatter
+
+def animate_once_rrr(L1: float, L2: float, x_t: float, y_t: float, z_t: float,
+                     elbow_mode: str = "arriba",
+                     frames: int = 180, interval_ms: int = 20,
+                     save_path: str | None = None,
+                     obstacles=None, link_radius: float = 0.0,
+                     mode: str = "cartesian", limits=None):
+    """
+    Trayectoria cartesiana lineal desde (L1+L2, 0, 0) hasta (x_t, y_t, z_t).
+    Valida alcanzabilidad e IK en cada frame.
+    mode: 'cartesian' => lo anterior.
+          'joint'     => una sola IK en la meta e interpolación de ángulos (FK por frame).
+    limits: (vmax, amax) por articulación [grados/s, grados/s²]; si se indica, la ruta
+            se re-temporiza (tiempo mínimo) y se muestrea cada interval_ms.
+    save_path: si se indica, guarda la trayectoria (.rtraj) para reproducirla
+               después con traj_mmap.replay sin volver a resolver la IK.
+    obstacles: lista de obstáculos (collision.py); si algún frame choca, lanza RuntimeError.
+    """
+    sols = plan_once_rrr(L1, L2, x_t, y_t, z_t, elbow_mode, frames, interval_ms,
+                         save_path, obstacles, link_radius, mode, limits)
+
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    view = ArmView(L1, L2, x_t, y_t, z_t, elbow_mode, start=sols[0])
+
+    def update(frame):
+        return view.set_pose(*sols[frame])
+
+    anim = FuncAnimation(view.fig, update, frames=len(sols), interval=interval_ms,
+                         blit=False, repeat=False)
+    view.fig._anim = anim   # mantener referencia
+    plt.show()
+
+# ------------------ Sesión (una sola figura) ------------------
+
+class ArmSession:
+    """
+    Mantiene una figura viva entre objetivos: la primera llamada crea figura, ejes
+    y artistas; las siguientes solo reapuntan y animan desde la pose actual, sin
+    bloquear en plt.show(). Si el usuario cierra la ventana, se vuelve a crear.
+    """
+
+    def __init__(self):
+        self.view = None
+        self.q = (0.0, 0.0, 0.0)     # pose actual (brazo extendido en +X)
+
+    def _ensure_view(self, L1, L2, x_t, y_t, z_t, elbow_mode):
+        import matplotlib.pyplot as plt
+        if self.view is None or not plt.fignum_exists(self.view.fig.number):
+            plt.ion()
+            self.view = ArmView(L1, L2, x_t, y_t, z_t, elbow_mode, start=self.q)
+            plt.show(block=False)
+        else:
+            self.view.retarget(L1, L2, x_t, y_t, z_t, elbow_mode)
+        return self.view
+
+    def move_to(self, L1: float, L2: float, x_t: float, y_t: float, z_t: float,
+                elbow_mode: str = "arriba", frames: int = 180, interval_ms: int = 20, **kwargs):
+        """ Mismos argumentos que animate_once_rrr; parte de la pose en la que quedó el brazo. """
+        import matplotlib.pyplot as plt
+        sols = plan_once_rrr(L1, L2, x_t, y_t, z_t, elbow_mode, frames, interval_ms,
+                             start=self.q, **kwargs)
+        view = self._ensure_view(L1, L2, x_t, y_t, z_t, elbow_mode)
+        for th in sols:
+            view.set_pose(*th)
+            plt.pause(interval_ms / 1000.0)
+        self.q = sols[-1]
+        return sols
+
+    def move_through(self, L1: float, L2: float, targets, elbow_mode: str = "arriba",
+                     frames: int = 180, interval_ms: int = 20, backend: str = "thread",
+                     lookahead: int = 2, **kwargs):
+        """
+        Recorre targets [(x, y, z), ...] en orden. Mientras se anima un movimiento, el
+        siguiente ya se resuelve en segundo plano (pipeline.MotionPipeline), sin pausa
+        de cómputo entre movimientos. Un objetivo que falla se informa y se salta.
+        """
+        import matplotlib.pyplot as plt
+        from pipeline import MotionPipeline, feed
+        pipe = MotionPipeline(plan_once_rrr, self.q, maxsize=lookahead, backend=backend)
+        feed(pipe, [(L1, L2, *t) for t in targets], elbow_mode=elbow_mode, frames=frames,
+             interval_ms=interval_ms, **kwargs)
+        done = []
+        try:
+            for args, _, out in pipe:
+                if isinstance(out, Exception):
+                    sys.stderr.write(f"[ERROR] {args[2:]}: {out}\n")
+                    continue
+                view = self._ensure_view(*args, elbow_mode)
+                for th in out:
+                    view.set_pose(*th)
+                    plt.pause(interval_ms / 1000.0)
+                self.q = out[-1]
+                done.append(out)
+        finally:
+            pipe.cancel()
+        return done
+
+
+# ------------------ Loop interactivo ------------------
+
+def main(session: bool = False):
+    """ session=True: una sola ventana para todos los objetivos (ArmSession). """
+    print("=== RRR esférico (parado) - Animación 3D ===")
+    print("Escribe 'q' en cualquier entrada para salir.\n")
+    sess = ArmSession() if session else None
+    while True:
+        try:
+            modo = leer_modo("Modo (arriba/abajo) [arriba]: ", default="arriba")
+            if modo == 'q': break
+
+            L1 = leer_valor("Ingresa L1: ")
+            if L1 == 'q': break
+            L2 = leer_valor("Ingresa L2: ")
+            if L2 == 'q': break
+            x  = leer_valor("Ingresa X del objetivo: ")
+            if x == 'q': break
+            y  = leer_valor("Ingresa Y del objetivo: ")
+            if y == 'q': break
+            z  = leer_valor("Ingresa Z del objetivo: ")
+            if z == 'q': break
+
+            L1, L2, x, y, z = float(L1), float(L2), float(x), float(y), float(z)
+
+            try:
+                if sess is not None:
+                    sess.move_to(L1, L2, x, y, z, elbow_mode=modo, frames=180, interval_ms=20)
+                else:
+                    animate_once_rrr(L1, L2, x, y, z, elbow_mode=modo, frames=180, interval_ms=20)
+            except Exception as e:
+                sys.stderr.write(f"[ERROR] {e}\n\n")  # no detiene el loop
+
+        except ValueError as ve:
+            sys.stderr.write(f"[ERROR] {ve}\n\n")
+            continue
+        except KeyboardInterrupt:
+            print("\nSaliendo...")
+            break
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    if sys.argv[1:] == ["--session"]:
+        main(session=True)      # una sola ventana reutilizada entre objetivos
+    elif sys.argv[1:2] == ["--queue"] and len(sys.argv) > 5:
+        # --queue L1 L2 modo x,y,z x,y,z ...: objetivos encadenados, el siguiente se
+        # resuelve mientras se anima el actual
+        L1, L2, modo = float(sys.argv[2]), float(sys.argv[3]), sys.argv[4]
+        ArmSession().move_through(L1, L2, [tuple(map(float, p.split(","))) for p in sys.argv[5:]],
+                                  elbow_mode=modo)
+    elif sys.argv[1:] == ["--pick"]:
+        from interactive import TargetPicker   # objetivo con clic/arrastre y sliders
+        TargetPicker("rrr").run()
+    elif len(sys.argv) > 1:
+        # Con argumentos: modo por lotes sin GUI (ver batch_ik.py --help)
+        from batch_ik import main as batch_main
+        sys.exit(batch_main(["--model", "rrr", *sys.argv[1:]]))
+    else:
+        main()
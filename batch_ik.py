@@ -0,0 +1,299 @@
+#   Modo por lotes (sin GUI) para IK/FK de los robots planares, RRR y SCARA.
+#
+#   Lee objetivos desde archivo o stdin (CSV, JSON Lines o .npy), resuelve por
+#   bloques con los solvers vectorizados y escribe ángulos + bandera de alcance.
+#
+#   Ejemplos:
+#     python batch_ik.py --model 2r  --L1 5 --L2 4 -i objetivos.csv > sol.csv
+#     python batch_ik.py --model rrr --L1 5 --L2 4 --elbow abajo -i obj.npy -o sol.npy
+#     cat obj.jsonl | python batch_ik.py --model 2r_yz --L1 5 --L2 4 --format jsonl
+
+import argparse
+import io
+import json
+import shutil
+import sys
+import tempfile
+import numpy as np
+
+import Robot_planar_tarea_1 as tarea_1
+import Robot_planar_tarea_2 as tarea_2
+import Robot_planar_tarea_3 as tarea_3
+import Examen_parcial_3 as scara
+
+# ------------------ Modelos ------------------
+#   Cada modelo declara sus columnas de objetivo (Cartesianas) y de articulación,
+#   y dos funciones vectorizadas:
+#     ik(L1, L2, X, elbow) -> (reachable, J)     X: (n, len(targets)), J: (n, len(joints))
+#     fk(L1, L2, J)        -> P                  P: (n, len(targets))
+
+def _ik_2r(L1, L2, X, elbow):
+    ok, t1, t2 = tarea_1.ik_2r_batch(L1, L2, X[:, 0], X[:, 1], elbow)
+    return ok, np.stack([t1, t2], axis=-1)
+
+def _fk_2r(L1, L2, J):
+    _, _, tip = tarea_1.fk_2r_batch(L1, L2, J[:, 0], J[:, 1])
+    return tip[:, :2]
+
+def _ik_2r_yz(L1, L2, X, elbow):
+    ok, t1, t2 = tarea_2.ik_2r_yz_batch(L1, L2, X[:, 0], X[:, 1], elbow)
+    return ok, np.stack([t1, t2], axis=-1)
+
+def _fk_2r_yz(L1, L2, J):
+    _, _, tip = tarea_2.fk_2r_yz_batch(L1, L2, J[:, 0], J[:, 1])
+    return tip[:, 1:]
+
+def _ik_rrr(L1, L2, X, elbow):
+    ok, t1, t2, t3 = tarea_3.ik_rrr_spherical_batch(L1, L2, X[:, 0], X[:, 1], X[:, 2], elbow)
+    return ok, np.stack([t1, t2, t3], axis=-1)
+
+def _fk_rrr(L1, L2, J):
+    _, _, tip = tarea_3.fk_rrr_spherical_batch(L1, L2, J[:, 0], J[:, 1], J[:, 2])
+    return tip
+
+def _ik_scara(L1, L2, X, elbow):
+    ok, t1, t2, d3, t4 = scara.ik_SCARA_batch(X[:, 0], X[:, 1], X[:, 2], X[:, 3], L1, L2, elbow)
+    return ok, np.stack([t1, t2, d3, t4], axis=-1)
+
+def _fk_scara(L1, L2, J):
+    return scara.fk_SCARA_batch(J[:, 0], J[:, 1], J[:, 2], J[:, 3], L1, L2)
+
+MODELS = {
+    '2r':    dict(targets=('x', 'y'),      joints=('th1', 'th2'),        ik=_ik_2r,    fk=_fk_2r),
+    '2r_yz': dict(targets=('y', 'z'),      joints=('th1', 'th2'),        ik=_ik_2r_yz, fk=_fk_2r_yz),
+    'rrr':   dict(targets=('x', 'y', 'z'), joints=('th1', 'th2', 'th3'), ik=_ik_rrr,   fk=_fk_rrr),
+    'scara': dict(targets=('x', 'y', 'z', 'phi'), joints=('th1', 'th2', 'd3', 'th4'),
+                  ik=_ik_scara, fk=_fk_scara),
+}
+
+def solve_chunk(model: str, mode: str, L1: float, L2: float, X, elbow: str = "arriba"):
+    """
+    Resuelve un bloque (n, k) y devuelve (columnas, arreglo (n, m)).
+    En modo 'ik' la primera columna es la bandera 'reachable' (0/1).
+    """
+    spec = MODELS[model]
+    X = np.asarray(X, dtype=float)
+    if mode == 'ik':
+        ok, J = spec['ik'](L1, L2, X, elbow)
+        return ('reachable',) + spec['joints'], np.column_stack([ok.astype(float), J])
+    return spec['targets'], spec['fk'](L1, L2, X)
+
+# ------------------ Lectura por bloques ------------------
+
+def _detect_format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    if path.endswith('.npy'):
+        return 'npy'
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+def _open_text(path: str):
+    if path == '-':
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8')
+
+def _csv_rows(lines, skip_header: bool):
+    """ Convierte líneas CSV en arreglo (n, k); ignora comentarios y el encabezado. """
+    data = [ln for ln in lines if ln.strip() and not ln.lstrip().startswith('#')]
+    if skip_header and data and not _is_numeric_row(data[0]):
+        data = data[1:]
+    if not data:
+        return None
+    return np.loadtxt(io.StringIO(''.join(data)), delimiter=',', ndmin=2)
+
+def _is_numeric_row(line: str) -> bool:
+    try:
+        [float(v) for v in line.split(',')]
+        return True
+    except ValueError:
+        return False
+
+def _jsonl_rows(lines, columns):
+    """ Cada línea puede ser una lista [x, y, ...] o un objeto {"x": .., "y": ..}. """
+    rows = []
+    for ln in lines:
+        if not ln.strip():
+            continue
+        obj = json.loads(ln)
+        if isinstance(obj, dict):
+            rows.append([float(obj[c]) for c in columns])
+        else:
+            rows.append([float(v) for v in obj])
+    if not rows:
+        return None
+    return np.asarray(rows, dtype=float)
+
+def _npy_stream_chunks(f, ncols: int, chunk: int):
+    """
+    .npy desde un flujo no posicionable (stdin): np.load necesita seek, así que
+    se lee el encabezado y luego las filas por bloques con np.frombuffer.
+    """
+    fmt = np.lib.format
+    version = fmt.read_magic(f)
+    read_header = fmt.read_array_header_1_0 if version == (1, 0) else fmt.read_array_header_2_0
+    shape, fortran, dtype = read_header(f)
+    if dtype.hasobject:
+        raise ValueError(".npy con dtype object no soportado.")
+    n = shape[0] if shape else 1
+    width = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+    if fortran and len(shape) > 1:                  # filas no contiguas: leer todo
+        arr = np.frombuffer(f.read(), dtype=dtype, count=n * width).reshape(shape, order='F')
+        arr = arr.reshape(n, -1)
+        for i in range(0, n, chunk):
+            yield np.asarray(arr[i:i + chunk, :ncols], dtype=float)
+        return
+    row_bytes = dtype.itemsize * width
+    for i in range(0, n, chunk):
+        m = min(chunk, n - i)
+        buf = f.read(m * row_bytes)
+        if len(buf) < m * row_bytes:
+            raise ValueError(".npy truncado en la entrada.")
+        yield np.frombuffer(buf, dtype=dtype).reshape(m, width)[:, :ncols].astype(float)
+
+def iter_chunks(path: str, fmt: str, columns, chunk: int):
+    """ Genera bloques (n <= chunk, len(columns)) sin cargar todo el archivo. """
+    if fmt == 'npy':
+        if path == '-':
+            yield from _npy_stream_chunks(sys.stdin.buffer, len(columns), chunk)
+            return
+        arr = np.load(path, mmap_mode='r')
+        arr = arr.reshape(len(arr), -1)
+        for i in range(0, len(arr), chunk):
+            yield np.asarray(arr[i:i + chunk, :len(columns)], dtype=float)
+        return
+
+    f = _open_text(path)
+    try:
+        first = True
+        while True:
+            lines = []
+            for ln in f:
+                lines.append(ln)
+                if len(lines) >= chunk:
+                    break
+            if not lines:
+                break
+            if fmt == 'jsonl':
+                X = _jsonl_rows(lines, columns)
+            else:
+                X = _csv_rows(lines, skip_header=first)
+                first = first and X is None
+            if X is not None and X.size:
+                if X.shape[1] < len(columns):
+                    raise ValueError(f"Se esperaban {len(columns)} columnas ({', '.join(columns)}).")
+                yield X[:, :len(columns)]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+# ------------------ Escritura ------------------
+
+class _Writer:
+    """
+    Escribe bloques de resultados en CSV, JSON Lines o .npy.
+    Para .npy los bloques van a un temporal crudo y el encabezado se escribe al
+    cerrar (cuando ya se conoce el número de filas): la memoria no crece.
+    """
+
+    def __init__(self, path: str, fmt: str, columns):
+        self.fmt = fmt
+        self.columns = columns
+        self.path = path
+        self.rows = 0
+        if fmt == 'npy':
+            self._raw = tempfile.TemporaryFile()
+        else:
+            self.f = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+            if fmt == 'csv':
+                self.f.write(','.join(columns) + '\n')
+
+    def write(self, Y):
+        self.rows += len(Y)
+        if self.fmt == 'npy':
+            self._raw.write(np.ascontiguousarray(Y, dtype='<f8').tobytes())
+        elif self.fmt == 'csv':
+            fmts = ['%d' if c == 'reachable' else '%.6f' for c in self.columns]
+            np.savetxt(self.f, Y, delimiter=',', fmt=fmts)
+        else:
+            for row in Y.tolist():
+                rec = {c: (None if v != v else v) for c, v in zip(self.columns, row)}
+                if 'reachable' in rec:
+                    rec['reachable'] = bool(rec['reachable'])
+                self.f.write(json.dumps(rec) + '\n')
+
+    def close(self):
+        if self.fmt == 'npy':
+            out = sys.stdout.buffer if self.path == '-' else open(self.path, 'wb')
+            try:
+                header = {'descr': '<f8', 'fortran_order': False,
+                          'shape': (self.rows, len(self.columns))}
+                np.lib.format.write_array_header_1_0(out, header)
+                self._raw.seek(0)
+                shutil.copyfileobj(self._raw, out)
+            finally:
+                self._raw.close()
+                if out is not sys.stdout.buffer:
+                    out.close()
+        elif self.f is not sys.stdout:
+            self.f.close()
+        else:
+            self.f.flush()
+
+# ------------------ CLI ------------------
+
+def build_parser():
+    p = argparse.ArgumentParser(description="IK/FK por lotes, sin GUI.")
+    p.add_argument('--model', choices=sorted(MODELS), default='2r')
+    p.add_argument('--mode', choices=('ik', 'fk'), default='ik')
+    p.add_argument('--L1', type=float, required=True)
+    p.add_argument('--L2', type=float, required=True)
+    p.add_argument('--elbow', default='arriba', help="'arriba' o 'abajo' (solo IK)")
+    p.add_argument('-i', '--input', default='-', help="archivo de entrada ('-' = stdin)")
+    p.add_argument('-o', '--output', default='-', help="archivo de salida ('-' = stdout)")
+    p.add_argument('--format', choices=('csv', 'jsonl', 'npy'), default=None,
+                   help="formato de entrada (por defecto según extensión)")
+    p.add_argument('--out-format', choices=('csv', 'jsonl', 'npy'), default=None,
+                   help="formato de salida (por defecto según extensión)")
+    p.add_argument('--chunk', type=int, default=65536, help="objetivos por bloque")
+    return p
+
+def run_batch(args) -> int:
+    """ Procesa todos los bloques; devuelve el número de filas escritas. """
+    spec = MODELS[args.model]
+    elbow = 'arriba' if args.elbow.lower().startswith('arr') else 'abajo'
+    in_cols = spec['targets'] if args.mode == 'ik' else spec['joints']
+    out_cols = (('reachable',) + spec['joints']) if args.mode == 'ik' else spec['targets']
+    fmt_in = _detect_format(args.input, args.format)
+    fmt_out = _detect_format(args.output, args.out_format)
+
+    writer = _Writer(args.output, fmt_out, out_cols)
+    n = 0
+    try:
+        for X in iter_chunks(args.input, fmt_in, in_cols, args.chunk):
+            _, Y = solve_chunk(args.model, args.mode, args.L1, args.L2, X, elbow)
+            writer.write(Y)
+            n += len(Y)
+    finally:
+        writer.close()
+    return n
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.L1 <= 0 or args.L2 <= 0:
+        sys.stderr.write("[ERROR] L1 y L2 deben ser positivos.\n")
+        return 2
+    try:
+        run_batch(args)
+    except BrokenPipeError:
+        pass
+    except (ValueError, OSError) as e:
+        sys.stderr.write(f"[ERROR] {e}\n")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    sys.exit(main())
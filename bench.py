@@ -0,0 +1,247 @@
+#   Suite de benchmarks reproducible: IK, FK, transformaciones y render.
+#
+#   Mide cada ruta en varios tamaños de entrada, compara la versión escalar
+#   (un objetivo por llamada, como en las animaciones) con la vectorizada, y
+#   reporta throughput y percentiles de latencia en JSON.
+#
+#   Ejemplos:
+#     python bench.py                              # todo, tamaños por defecto
+#     python bench.py --sizes 1,1000,100000 --out bench.json
+#     python bench.py --only ik --repeats 20
+#     python bench.py --compare base.json --max-regression 0.2   # falla si empeora
+
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+
+SEED = 1234
+L1, L2 = 5.0, 4.0
+SCARA_L1, SCARA_L2 = 47.5, 37.5
+
+# ------------------ Medición ------------------
+
+def measure(fn, repeats: int = 10, warmup: int = 2):
+    """ Ejecuta fn() varias veces y devuelve las latencias (s) de cada llamada. """
+    for _ in range(warmup):
+        fn()
+    out = np.empty(repeats)
+    for k in range(repeats):
+        t0 = time.perf_counter_ns()
+        fn()
+        out[k] = (time.perf_counter_ns() - t0) * 1e-9
+    return out
+
+def summarize(lat, items: int) -> dict:
+    p50, p90, p99 = np.percentile(lat, [50, 90, 99])
+    return {
+        'items': items,
+        'repeats': len(lat),
+        'mean_s': float(lat.mean()),
+        'min_s': float(lat.min()),
+        'p50_s': float(p50),
+        'p90_s': float(p90),
+        'p99_s': float(p99),
+        'throughput_per_s': float(items / p50) if p50 > 0 else float('inf'),
+    }
+
+# ------------------ Casos ------------------
+#   Cada caso: nombre -> (setup(n, rng) -> {'scalar': fn, 'batch': fn}).
+#   Las variantes 'scalar' recorren los n elementos uno a uno.
+
+def _targets_2d(n, rng):
+    r = rng.uniform(abs(L1 - L2) + 0.1, L1 + L2 - 0.1, n)
+    a = rng.uniform(-np.pi, np.pi, n)
+    return r*np.cos(a), r*np.sin(a)
+
+def _case_ik_2r(n, rng):
+    import Robot_planar_tarea_1 as m
+    x, y = _targets_2d(n, rng)
+    xs, ys = x.tolist(), y.tolist()
+    return {'scalar': lambda: [m._ik_2r(L1, L2, a, b, "arriba") for a, b in zip(xs, ys)],
+            'batch':  lambda: m.ik_2r_batch(L1, L2, x, y, "arriba")}
+
+def _case_ik_2r_yz(n, rng):
+    import Robot_planar_tarea_2 as m
+    y, z = _targets_2d(n, rng)
+    ys, zs = y.tolist(), z.tolist()
+    return {'scalar': lambda: [m._ik_2r_yz(L1, L2, a, b, "arriba") for a, b in zip(ys, zs)],
+            'batch':  lambda: m.ik_2r_yz_batch(L1, L2, y, z, "arriba")}
+
+def _case_ik_rrr(n, rng):
+    import Robot_planar_tarea_3 as m
+    r, z = _targets_2d(n, rng)
+    a = rng.uniform(-np.pi, np.pi, n)
+    x, y = r*np.cos(a), r*np.sin(a)
+    P = list(zip(x.tolist(), y.tolist(), z.tolist()))
+    return {'scalar': lambda: [m.ik_rrr_spherical(L1, L2, *p, "arriba") for p in P],
+            'batch':  lambda: m.ik_rrr_spherical_batch(L1, L2, x, y, z, "arriba")}
+
+def _case_fk_2r(n, rng):
+    import Robot_planar_tarea_1 as m
+    t1, t2 = rng.uniform(-180, 180, (2, n))
+    T = list(zip(t1.tolist(), t2.tolist()))
+    return {'scalar': lambda: [m.fk_2r(L1, L2, a, b) for a, b in T],
+            'batch':  lambda: m.fk_2r_batch(L1, L2, t1, t2)}
+
+def _case_fk_scara(n, rng):
+    import Examen_parcial_3 as m
+    t1, t2, t4 = rng.uniform(-150, 150, (3, n))
+    d3 = rng.uniform(0, 30, n)
+    Q = list(zip(t1.tolist(), t2.tolist(), d3.tolist(), t4.tolist()))
+    return {'scalar': lambda: [m.forward_kinematics_SCARA(*q, SCARA_L1, SCARA_L2) for q in Q],
+            'batch':  lambda: m.fk_SCARA_batch(t1, t2, d3, t4, SCARA_L1, SCARA_L2)}
+
+def _case_forward_frames(n, rng):
+    import Examen_parcial_1 as m
+    Q = rng.uniform(-90, 90, (n, 4)).tolist()
+    return {'scalar': lambda: [m.forward_frames(a, b, c, m.l1, m.l2, m.l3, p) for a, b, c, p in Q]}
+
+def _case_apply_SE3(n, rng):
+    import Box3D_animation_X as box
+    import se3_screw
+    Ts = se3_screw.exp_SE3(rng.normal(size=(n, 6)))
+    Tl = list(Ts)
+    pts = box.box_init
+    return {'scalar': lambda: [box.apply_SE3(pts, T) for T in Tl],
+            'batch':  lambda: se3_screw.apply_SE3(pts, Ts)}
+
+def _case_apply_rotation_euler(n, rng):
+    import Box3D_animation_complete_fluid as m
+    A = rng.uniform(-180, 180, (n, 3)).tolist()
+    pts = m.box_init
+    return {'scalar': lambda: [(m.apply_rotation_euler(a, b, c) @ pts.T).T for a, b, c in A]}
+
+def _agg():
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _case_render_drawBox(n, rng):
+    _agg()
+    import Box3D_animation_X as m
+    fig, ax = m.init_figure()
+    R = [m.compose_R(ax_deg=a) for a in rng.uniform(0, 180, n)]
+
+    def run():
+        for Rk in R:
+            ax.cla()
+            m.setaxis(-5, 12, -5, 12, -5, 12)
+            m.fix_system(axis_length=10, linewidth=2)
+            m.drawBox(m.apply_SE3(m.box_init, m.build_SE3(Rk)), show_points=False)
+            fig.canvas.draw()
+    return {'scalar': run}
+
+def _case_render_draw_arm(n, rng):
+    _agg()
+    import Examen_parcial_1 as m
+    fig, ax = m.init_figure()
+    Q = rng.uniform(-90, 90, (n, 4)).tolist()
+
+    def run():
+        for a, b, c, p in Q:
+            ax.cla()
+            m.setaxis(-m.world, m.world, -m.world, m.world, -m.world, m.world)
+            m.fix_system(axis_length=8, linewidth=1.5)
+            m.draw_arm(m.forward_frames(a, b, c, m.l1, m.l2, m.l3, p))
+            fig.canvas.draw()
+    return {'scalar': run}
+
+CASES = {
+    'ik_2r':                _case_ik_2r,
+    'ik_2r_yz':             _case_ik_2r_yz,
+    'ik_rrr_spherical':     _case_ik_rrr,
+    'fk_2r':                _case_fk_2r,
+    'fk_SCARA':             _case_fk_scara,
+    'forward_frames':       _case_forward_frames,
+    'apply_SE3':            _case_apply_SE3,
+    'apply_rotation_euler': _case_apply_rotation_euler,
+    'render_drawBox':       _case_render_drawBox,
+    'render_draw_arm':      _case_render_draw_arm,
+}
+
+# Los renders son lentos por frame: se limitan a tamaños pequeños
+_MAX_N = {'render_drawBox': 20, 'render_draw_arm': 20}
+
+# ------------------ Ejecución ------------------
+
+def run_suite(sizes=(1, 100, 10_000), repeats: int = 10, only: str | None = None,
+              scalar_max: int = 10_000) -> dict:
+    """
+    Ejecuta todos los casos y devuelve el reporte (dict serializable a JSON).
+    scalar_max: tamaño máximo para las variantes escalares (son O(n) en Python).
+    """
+    import matplotlib
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'platform': platform.platform(),
+            'seed': SEED,
+            'sizes': list(sizes),
+            'repeats': repeats,
+        },
+        'results': [],
+    }
+    for name, setup in CASES.items():
+        if only and only not in name:
+            continue
+        for n in sizes:
+            if n > _MAX_N.get(name, n):
+                continue
+            variants = setup(n, np.random.default_rng(SEED))
+            for variant, fn in variants.items():
+                if variant == 'scalar' and n > scalar_max:
+                    continue
+                reps = repeats if n * repeats <= 10**7 else max(3, repeats // 3)
+                lat = measure(fn, repeats=reps)
+                report['results'].append({'case': name, 'variant': variant, 'n': n,
+                                          **summarize(lat, n)})
+    return report
+
+def compare(current: dict, baseline: dict, max_regression: float = 0.2):
+    """ Lista de (caso, variante, n, cambio) cuyo p50 empeoró más que max_regression. """
+    base = {(r['case'], r['variant'], r['n']): r for r in baseline['results']}
+    worse = []
+    for r in current['results']:
+        b = base.get((r['case'], r['variant'], r['n']))
+        if b and b['p50_s'] > 0:
+            change = r['p50_s'] / b['p50_s'] - 1.0
+            if change > max_regression:
+                worse.append((r['case'], r['variant'], r['n'], change))
+    return worse
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmarks de IK, FK, transformaciones y render.")
+    p.add_argument('--sizes', default='1,100,10000', help="tamaños separados por coma")
+    p.add_argument('--repeats', type=int, default=10)
+    p.add_argument('--only', default=None, help="filtra casos por subcadena")
+    p.add_argument('--scalar-max', type=int, default=10_000)
+    p.add_argument('--out', default='-', help="archivo JSON ('-' = stdout)")
+    p.add_argument('--compare', default=None, help="JSON base para detectar regresiones")
+    p.add_argument('--max-regression', type=float, default=0.2)
+    args = p.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    report = run_suite(sizes, args.repeats, args.only, args.scalar_max)
+    text = json.dumps(report, indent=2)
+    if args.out == '-':
+        print(text)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            worse = compare(report, json.load(f), args.max_regression)
+        for case, variant, n, change in worse:
+            sys.stderr.write(f"[REGRESIÓN] {case}/{variant} n={n}: p50 +{change:.0%}\n")
+        return 1 if worse else 0
+    return 0
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    sys.exit(main())
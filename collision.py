@@ -0,0 +1,221 @@
+#   Chequeo de colisiones vectorizado: eslabones (cápsulas) vs obstáculos.
+#
+#   Obstáculos: esferas, cajas alineadas a los ejes (AABB) y cajas orientadas
+#   (OBB, p. ej. box_init después de apply_SE3). Se organizan en una jerarquía
+#   de volúmenes envolventes (BVH) de AABBs.
+#
+#   Una trayectoria precalculada se pasa como puntos de articulación (N, P, 3):
+#   el eslabón k es el segmento P[k] -> P[k+1], con radio opcional (cápsula).
+#   Todos los (frame, eslabón) se prueban a la vez contra la BVH y luego contra
+#   cada obstáculo candidato, sin bucles de Python por frame.
+
+from dataclasses import dataclass
+import numpy as np
+
+# ------------------ Obstáculos ------------------
+
+@dataclass
+class Sphere:
+    center: np.ndarray
+    radius: float
+
+    def bounds(self):
+        c = np.asarray(self.center, dtype=float)
+        return c - self.radius, c + self.radius
+
+@dataclass
+class AABB:
+    lo: np.ndarray
+    hi: np.ndarray
+
+    def bounds(self):
+        return np.asarray(self.lo, dtype=float), np.asarray(self.hi, dtype=float)
+
+    def as_obb(self):
+        lo, hi = self.bounds()
+        return OBB((lo + hi) / 2.0, np.eye(3), (hi - lo) / 2.0)
+
+@dataclass
+class OBB:
+    center: np.ndarray
+    R: np.ndarray            # columnas = ejes de la caja en el mundo
+    half: np.ndarray         # semi-longitudes sobre cada eje
+
+    def bounds(self):
+        c = np.asarray(self.center, dtype=float)
+        ext = np.abs(np.asarray(self.R, dtype=float)) @ np.asarray(self.half, dtype=float)
+        return c - ext, c + ext
+
+    @staticmethod
+    def from_box(pts8):
+        """
+        Caja de 8 vértices con el orden de box_init (0-1: largo, 0-4: ancho, 0-3: alto),
+        ya transformada o no.
+        """
+        pts8 = np.asarray(pts8, dtype=float)
+        axes = np.stack([pts8[1] - pts8[0], pts8[4] - pts8[0], pts8[3] - pts8[0]], axis=1)
+        lengths = np.linalg.norm(axes, axis=0)
+        return OBB(pts8.mean(axis=0), axes / lengths, lengths / 2.0)
+
+@dataclass
+class CollisionResult:
+    collides: bool
+    frame: int | None
+    link: int | None
+    obstacle: int | None
+    message: str
+
+# ------------------ BVH ------------------
+
+class BVH:
+    """ Árbol binario de AABBs sobre los obstáculos (partición por la mediana). """
+
+    def __init__(self, obstacles, leaf_size: int = 1):
+        self.obstacles = list(obstacles)
+        if not self.obstacles:
+            raise ValueError("Se necesita al menos un obstáculo.")
+        b = [o.bounds() for o in self.obstacles]
+        olo = np.array([lo for lo, _ in b])
+        ohi = np.array([hi for _, hi in b])
+        lo, hi, left, right, leaf = [], [], [], [], []
+
+        def build(idx):
+            node = len(lo)
+            lo.append(olo[idx].min(axis=0)); hi.append(ohi[idx].max(axis=0))
+            left.append(-1); right.append(-1); leaf.append(-1)
+            if len(idx) <= leaf_size:
+                leaf[node] = idx[0]
+                return node
+            c = (olo[idx] + ohi[idx]) / 2.0
+            axis = int(np.argmax(c.max(axis=0) - c.min(axis=0)))
+            order = idx[np.argsort(c[:, axis], kind='stable')]
+            half = len(order) // 2
+            left[node] = build(order[:half])
+            right[node] = build(order[half:])
+            return node
+
+        build(np.arange(len(self.obstacles)))
+        self.lo, self.hi = np.array(lo), np.array(hi)
+        self.left, self.right = np.array(left), np.array(right)
+        self.leaf = np.array(leaf)
+
+    def query(self, qlo, qhi):
+        """
+        Recorrido vectorizado por niveles: devuelve pares (consulta, obstáculo)
+        cuyos AABBs se traslapan.
+        """
+        q = np.arange(len(qlo))
+        n = np.zeros(len(qlo), dtype=int)
+        out_q, out_o = [], []
+        while len(q):
+            hit = np.all((qlo[q] <= self.hi[n]) & (qhi[q] >= self.lo[n]), axis=1)
+            q, n = q[hit], n[hit]
+            is_leaf = self.leaf[n] >= 0
+            out_q.append(q[is_leaf]); out_o.append(self.leaf[n[is_leaf]])
+            q, n = q[~is_leaf], n[~is_leaf]
+            q = np.concatenate([q, q])
+            n = np.concatenate([self.left[n], self.right[n]])
+        return np.concatenate(out_q), np.concatenate(out_o)
+
+# ------------------ Distancias segmento-obstáculo ------------------
+
+def _seg_point_dist(a, b, p):
+    ab = b - a
+    t = np.einsum('ij,ij->i', p - a, ab) / np.maximum(np.einsum('ij,ij->i', ab, ab), 1e-300)
+    t = np.clip(t, 0.0, 1.0)
+    return np.linalg.norm(a + t[:, None]*ab - p, axis=1)
+
+def _seg_box_dist(a, b, c, R, half, iters: int = 40):
+    """
+    Distancia segmento-caja orientada. En el marco de la caja la distancia al
+    punto p(t) es convexa en t: búsqueda ternaria vectorizada sobre t en [0, 1].
+    """
+    Rt = np.swapaxes(R, -1, -2)
+    a_l = np.einsum('nij,nj->ni', Rt, a - c)
+    d_l = np.einsum('nij,nj->ni', Rt, b - a)
+
+    def dist(t):
+        p = a_l + t[:, None]*d_l
+        return np.linalg.norm(np.maximum(np.abs(p) - half, 0.0), axis=1)
+
+    lo = np.zeros(len(a)); hi = np.ones(len(a))
+    for _ in range(iters):
+        m1 = lo + (hi - lo) / 3.0
+        m2 = hi - (hi - lo) / 3.0
+        left = dist(m1) <= dist(m2)
+        hi = np.where(left, m2, hi)
+        lo = np.where(left, lo, m1)
+    return np.minimum(dist((lo + hi) / 2.0), np.minimum(dist(np.zeros(len(a))), dist(np.ones(len(a)))))
+
+def _narrow(a, b, r, obs_idx, obstacles):
+    """ Prueba exacta de cada par candidato; devuelve máscara de colisión. """
+    hit = np.zeros(len(a), dtype=bool)
+    kinds = np.array([type(obstacles[i]).__name__ for i in range(len(obstacles))])
+    kind = kinds[obs_idx]
+
+    sel = np.nonzero(kind == 'Sphere')[0]
+    if len(sel):
+        c = np.array([obstacles[i].center for i in obs_idx[sel]], dtype=float)
+        rad = np.array([obstacles[i].radius for i in obs_idx[sel]], dtype=float)
+        hit[sel] = _seg_point_dist(a[sel], b[sel], c) <= rad + r[sel]
+
+    sel = np.nonzero(kind != 'Sphere')[0]
+    if len(sel):
+        boxes = [obstacles[i] if isinstance(obstacles[i], OBB) else obstacles[i].as_obb()
+                 for i in obs_idx[sel]]
+        c = np.array([o.center for o in boxes], dtype=float)
+        R = np.array([o.R for o in boxes], dtype=float)
+        half = np.array([o.half for o in boxes], dtype=float)
+        hit[sel] = _seg_box_dist(a[sel], b[sel], c, R, half) <= r[sel]
+    return hit
+
+# ------------------ Trayectorias ------------------
+
+def collision_pairs(points, obstacles, radii=0.0, bvh: BVH | None = None):
+    """
+    Todos los contactos de una trayectoria.
+    points: (N, P, 3) puntos de articulación por frame; radii: escalar o (P-1,).
+    Devuelve arreglos (frame, eslabón, obstáculo) de cada contacto.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 2:
+        points = points[None]
+    N, P, _ = points.shape
+    L = P - 1
+    bvh = bvh or BVH(obstacles)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (L,))
+
+    a = points[:, :-1].reshape(-1, 3)
+    b = points[:, 1:].reshape(-1, 3)
+    r = np.tile(radii, N)
+    qlo = np.minimum(a, b) - r[:, None]
+    qhi = np.maximum(a, b) + r[:, None]
+
+    q, o = bvh.query(qlo, qhi)
+    if len(q) == 0:
+        empty = np.empty(0, dtype=int)
+        return empty, empty, empty
+    hit = _narrow(a[q], b[q], r[q], o, bvh.obstacles)
+    q, o = q[hit], o[hit]
+    order = np.lexsort((o, q))
+    q, o = q[order], o[order]
+    return q // L, q % L, o
+
+def collision_mask(points, obstacles, radii=0.0, bvh: BVH | None = None):
+    """ (N,) bool: True en los frames donde algún eslabón toca algún obstáculo. """
+    points = np.asarray(points, dtype=float)
+    frames, _, _ = collision_pairs(points, obstacles, radii, bvh)
+    mask = np.zeros(len(points) if points.ndim == 3 else 1, dtype=bool)
+    mask[frames] = True
+    return mask
+
+def check_trajectory(points, obstacles, radii=0.0, bvh: BVH | None = None) -> CollisionResult:
+    """ Valida una trayectoria completa y reporta el primer frame con colisión. """
+    if not obstacles and bvh is None:
+        return CollisionResult(False, None, None, None, "Sin obstáculos.")
+    frames, links, obs = collision_pairs(points, obstacles, radii, bvh)
+    if len(frames) == 0:
+        return CollisionResult(False, None, None, None, "OK")
+    f, k, o = int(frames[0]), int(links[0]), int(obs[0])
+    return CollisionResult(True, f, k, o,
+                           f"Colisión en el frame {f}: eslabón {k + 1} con obstáculo {o}.")
@@ -0,0 +1,188 @@
+#   Lazo de control simulado a frecuencia fija, sin GUI.
+#
+#   Cada tick calcula la IK/FK del setpoint actual con los solvers escalares del
+#   proyecto (uno por tick, como lo haría un servo). El planificador usa el reloj
+#   monotónico (perf_counter_ns): duerme hasta poco antes del plazo y termina con
+#   espera activa. Se registra por tick:
+#     jitter   = inicio real - inicio programado
+#     latencia = duración del cálculo
+#     fallo    = el cálculo terminó después del fin de su periodo
+#   Si un tick se pasa, los ticks ya vencidos se saltan (no se acumula retraso).
+#
+#   Ejemplos:
+#     python control_loop.py --model rrr --rate 1000 --duration 5
+#     python control_loop.py --model scara --L1 47.5 --L2 37.5 --no-gc --max-miss 0.001
+
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+from dataclasses import dataclass, asdict
+import numpy as np
+
+# ------------------ Solvers escalares por modelo ------------------
+
+def _tick_2r(L1, L2):
+    from Robot_planar_tarea_1 import _ik_2r, fk_2r
+
+    def tick(p):
+        r = _ik_2r(L1, L2, p[0], p[1], "arriba")
+        if r.reachable:
+            fk_2r(L1, L2, r.theta1_deg, r.theta2_deg)
+        return r.reachable
+    return tick, 2
+
+def _tick_2r_yz(L1, L2):
+    from Robot_planar_tarea_2 import _ik_2r_yz, fk_2r_yz
+
+    def tick(p):
+        r = _ik_2r_yz(L1, L2, p[0], p[1], "arriba")
+        if r.reachable:
+            fk_2r_yz(L1, L2, r.theta1_deg, r.theta2_deg)
+        return r.reachable
+    return tick, 2
+
+def _tick_rrr(L1, L2):
+    from Robot_planar_tarea_3 import ik_rrr_spherical, fk_rrr_spherical
+
+    def tick(p):
+        r = ik_rrr_spherical(L1, L2, p[0], p[1], p[2], "arriba")
+        if r.reachable:
+            fk_rrr_spherical(L1, L2, r.th1_deg, r.th2_deg, r.th3_deg)
+        return r.reachable
+    return tick, 3
+
+def _tick_scara(L1, L2):
+    from Examen_parcial_3 import ik_SCARA_batch, forward_kinematics_SCARA
+
+    def tick(p):
+        ok, t1, t2, d3, t4 = ik_SCARA_batch(p[0], p[1], p[2], p[3], L1, L2)
+        if ok:
+            forward_kinematics_SCARA(float(t1), float(t2), float(d3), float(t4), L1, L2)
+        return bool(ok)
+    return tick, 4
+
+TICKS = {'2r': _tick_2r, '2r_yz': _tick_2r_yz, 'rrr': _tick_rrr, 'scara': _tick_scara}
+
+def circle_setpoints(model: str, L1: float, L2: float, n: int, period_ticks: int = 1000):
+    """ Setpoints (n, k) sobre un círculo dentro del alcance, una vuelta cada period_ticks. """
+    a = 2.0 * np.pi * np.arange(n) / period_ticks
+    r = 0.5 * (abs(L1 - L2) + L1 + L2)
+    cols = [r * np.cos(a), r * np.sin(a)]
+    if model == 'rrr':
+        cols.append(0.2 * r * np.sin(2.0 * a))
+    elif model == 'scara':
+        cols += [-5.0 - 5.0 * np.sin(a), np.degrees(a) % 360.0 - 180.0]
+    return np.column_stack(cols)
+
+# ------------------ Planificador ------------------
+
+@dataclass
+class LoopStats:
+    rate_hz: float
+    ticks: int
+    missed: int
+    skipped: int
+    miss_rate: float
+    latency_us: dict
+    jitter_us: dict
+    unreachable: int
+
+def _dist(x_ns) -> dict:
+    x = np.asarray(x_ns, dtype=float) / 1e3
+    if len(x) == 0:
+        return {}
+    p50, p90, p99, p999 = np.percentile(x, [50, 90, 99, 99.9])
+    return {'mean': float(x.mean()), 'p50': float(p50), 'p90': float(p90), 'p99': float(p99),
+            'p99.9': float(p999), 'max': float(x.max())}
+
+def run_loop(tick, setpoints, rate_hz: float = 1000.0, ticks: int | None = None,
+             spin_us: float = 200.0, disable_gc: bool = False) -> LoopStats:
+    """
+    Ejecuta tick(setpoints[k]) a rate_hz. setpoints: (N, k); si ticks > N se recorre cíclicamente.
+    spin_us: margen final de espera activa (el sleep del SO no es preciso al µs).
+    """
+    if rate_hz <= 0:
+        raise ValueError("rate_hz debe ser positivo.")
+    sp = [tuple(p) for p in np.asarray(setpoints, dtype=float).tolist()]
+    n = ticks or len(sp)
+    period = int(round(1e9 / rate_hz))
+    spin = int(spin_us * 1e3)
+    lat = np.empty(n, dtype=np.int64)
+    jit = np.empty(n, dtype=np.int64)
+    missed = skipped = unreachable = done = 0
+    clock = time.perf_counter_ns
+    sleep = time.sleep
+
+    gc_was = gc.isenabled()
+    if disable_gc:
+        gc.disable()
+    try:
+        t0 = clock() + period
+        k = 0                       # índice del tick programado
+        while done < n:
+            deadline = t0 + k * period
+            now = clock()
+            if deadline - now > spin:
+                sleep((deadline - now - spin) / 1e9)
+            while clock() < deadline:
+                pass
+            start = clock()
+            if not tick(sp[done % len(sp)]):
+                unreachable += 1
+            end = clock()
+            lat[done] = end - start
+            jit[done] = start - deadline
+            if end > deadline + period:
+                missed += 1
+                # Saltar los periodos que ya vencieron
+                late = (end - deadline) // period
+                skipped += int(late)
+                k += int(late)
+            k += 1
+            done += 1
+    finally:
+        if disable_gc and gc_was:
+            gc.enable()
+
+    return LoopStats(rate_hz, n, missed, skipped, missed / n if n else 0.0,
+                     _dist(lat), _dist(jit), unreachable)
+
+# ------------------ CLI ------------------
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Lazo de control a frecuencia fija con estadísticas de plazos.")
+    p.add_argument('--model', choices=sorted(TICKS), default='2r')
+    p.add_argument('--L1', type=float, default=5.0)
+    p.add_argument('--L2', type=float, default=4.0)
+    p.add_argument('--rate', type=float, default=1000.0, help="frecuencia de control [Hz]")
+    p.add_argument('--duration', type=float, default=2.0, help="segundos de simulación")
+    p.add_argument('--spin-us', type=float, default=200.0)
+    p.add_argument('--no-gc', action='store_true', help="desactiva el recolector durante el lazo")
+    p.add_argument('--out', default='-', help="archivo JSON ('-' = stdout)")
+    p.add_argument('--max-miss', type=float, default=None,
+                   help="código de salida 1 si la tasa de plazos perdidos la supera")
+    args = p.parse_args(argv)
+
+    tick, _ = TICKS[args.model](args.L1, args.L2)
+    n = max(1, int(math.ceil(args.duration * args.rate)))
+    sp = circle_setpoints(args.model, args.L1, args.L2, n, period_ticks=int(args.rate))
+    stats = run_loop(tick, sp, args.rate, n, args.spin_us, args.no_gc)
+    text = json.dumps({'model': args.model, **asdict(stats)}, indent=2)
+    if args.out == '-':
+        print(text)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    if args.max_miss is not None and stats.miss_rate > args.max_miss:
+        sys.stderr.write(f"[PLAZOS] {stats.missed}/{stats.ticks} ticks fuera de plazo "
+                         f"({stats.miss_rate:.2%} > {args.max_miss:.2%})\n")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    sys.exit(main())
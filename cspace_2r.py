@@ -0,0 +1,159 @@
+#   Mapa de obstáculos en el espacio de configuración (θ1, θ2) del 2R planar.
+#
+#   Se rasteriza una sola vez por distribución de celda: FK vectorizada
+#   (fk_2r_batch) sobre toda la rejilla + chequeo de colisión de collision.py.
+#   El resultado es un bitmap empaquetado (1 bit por celda); después cada
+#   consulta es un índice en un arreglo, O(1), y el mismo mapa alimenta a los
+#   planificadores.
+#
+#   Obstáculos planos: collision.Sphere con z=0 (círculo) y collision.AABB que
+#   cruce z=0 (rectángulo), o cualquier otro obstáculo de collision.py.
+
+import hashlib
+import json
+import numpy as np
+
+from Robot_planar_tarea_1 import fk_2r_batch
+from collision import BVH, collision_pairs, Sphere, AABB, OBB
+
+# ------------------ Mapa ------------------
+
+class CSpaceMap:
+    """
+    Bitmap de ocupación sobre θ1, θ2 en [-180, 180) grados.
+    La celda (i, j) cubre θ1 en [-180 + i*d1, -180 + (i+1)*d1) y análogo para θ2.
+    """
+
+    def __init__(self, bits, n1: int, n2: int, L1: float, L2: float, key: str = ""):
+        self.bits = bits            # np.uint8 empaquetado, n1*n2 bits (orden C)
+        self.n1, self.n2 = n1, n2
+        self.L1, self.L2 = L1, L2
+        self.key = key
+        self.d1 = 360.0 / n1
+        self.d2 = 360.0 / n2
+
+    # --- índices ---
+    def cell(self, th1_deg, th2_deg):
+        """ Índices (i, j) de la celda que contiene cada configuración (vectorizado). """
+        i = np.floor((np.mod(np.asarray(th1_deg, dtype=float) + 180.0, 360.0)) / self.d1).astype(np.intp)
+        j = np.floor((np.mod(np.asarray(th2_deg, dtype=float) + 180.0, 360.0)) / self.d2).astype(np.intp)
+        return np.minimum(i, self.n1 - 1), np.minimum(j, self.n2 - 1)
+
+    def center(self, i, j):
+        """ Ángulos (grados) del centro de la celda (i, j). """
+        return (-180.0 + (np.asarray(i) + 0.5) * self.d1,
+                -180.0 + (np.asarray(j) + 0.5) * self.d2)
+
+    # --- consultas ---
+    def occupied_cell(self, i, j):
+        k = np.asarray(i, dtype=np.intp) * self.n2 + np.asarray(j, dtype=np.intp)
+        return ((self.bits[k >> 3] >> (7 - (k & 7))) & 1).astype(bool)
+
+    def occupied(self, th1_deg, th2_deg):
+        """ True si la configuración choca (acepta escalares o arreglos). """
+        return self.occupied_cell(*self.cell(th1_deg, th2_deg))
+
+    def free(self, th1_deg, th2_deg):
+        return ~self.occupied(th1_deg, th2_deg)
+
+    def as_bool(self):
+        """ Rejilla (n1, n2) de booleanos (True = ocupada). """
+        return np.unpackbits(self.bits, count=self.n1 * self.n2).reshape(self.n1, self.n2).astype(bool)
+
+    def fraction_occupied(self) -> float:
+        return float(np.unpackbits(self.bits, count=self.n1 * self.n2).mean())
+
+    # --- persistencia ---
+    def save(self, path: str):
+        meta = json.dumps({'n1': self.n1, 'n2': self.n2, 'L1': self.L1, 'L2': self.L2,
+                           'key': self.key})
+        np.savez_compressed(path, bits=self.bits, meta=np.array(meta))
+
+    @staticmethod
+    def load(path: str) -> "CSpaceMap":
+        with np.load(path) as z:
+            meta = json.loads(str(z['meta']))
+            return CSpaceMap(z['bits'], meta['n1'], meta['n2'], meta['L1'], meta['L2'], meta['key'])
+
+# ------------------ Construcción ------------------
+
+def _obstacle_desc(o):
+    if isinstance(o, Sphere):
+        return ['sphere', np.asarray(o.center, float).tolist(), float(o.radius)]
+    if isinstance(o, AABB):
+        return ['aabb', np.asarray(o.lo, float).tolist(), np.asarray(o.hi, float).tolist()]
+    if isinstance(o, OBB):
+        return ['obb', np.asarray(o.center, float).tolist(), np.asarray(o.R, float).tolist(),
+                np.asarray(o.half, float).tolist()]
+    raise TypeError(f"Obstáculo no soportado: {type(o).__name__}")
+
+def layout_key(L1, L2, obstacles, n1, n2, link_radius, conservative, fk=fk_2r_batch) -> str:
+    """ Huella de la distribución de celda: mismo key => mismo bitmap. """
+    desc = json.dumps([L1, L2, n1, n2, link_radius, conservative, fk.__name__,
+                       [_obstacle_desc(o) for o in obstacles]])
+    return hashlib.sha1(desc.encode('utf-8')).hexdigest()
+
+def build_cspace(L1: float, L2: float, obstacles, n1: int = 360, n2: int = 360,
+                 link_radius: float = 0.0, conservative: bool = True,
+                 rows_per_chunk: int = 64, fk=fk_2r_batch) -> CSpaceMap:
+    """
+    Rasteriza el C-space del 2R. Con conservative=True se infla el radio de los
+    eslabones por el desplazamiento máximo dentro de media celda, así ninguna
+    configuración libre en el mapa choca en la realidad.
+    fk: FK vectorizada del 2R (fk_2r_batch en XY, o fk_2r_yz_batch para el plano YZ).
+    """
+    if L1 <= 0 or L2 <= 0:
+        raise ValueError("L1 y L2 deben ser positivos.")
+    d1 = np.radians(360.0 / n1)
+    d2 = np.radians(360.0 / n2)
+    radii = np.full(2, float(link_radius))
+    if conservative:
+        radii[0] += L1 * d1 / 2.0
+        radii[1] += (L1 + L2) * d1 / 2.0 + L2 * d2 / 2.0
+
+    bvh = BVH(obstacles) if obstacles else None
+    occ = np.zeros((n1, n2), dtype=bool)
+    th2 = -180.0 + (np.arange(n2) + 0.5) * (360.0 / n2)
+    if bvh is not None:
+        for i0 in range(0, n1, rows_per_chunk):
+            i1 = min(n1, i0 + rows_per_chunk)
+            th1 = -180.0 + (np.arange(i0, i1) + 0.5) * (360.0 / n1)
+            T1, T2 = np.meshgrid(th1, th2, indexing='ij')
+            pts = np.stack(fk(L1, L2, T1.ravel(), T2.ravel()), axis=1)
+            frames, _, _ = collision_pairs(pts, None, radii, bvh)
+            occ[i0:i1].reshape(-1)[frames] = True
+
+    key = layout_key(L1, L2, obstacles or [], n1, n2, link_radius, conservative, fk)
+    return CSpaceMap(np.packbits(occ.ravel()), n1, n2, L1, L2, key)
+
+def load_or_build(path: str, L1: float, L2: float, obstacles, **kwargs) -> CSpaceMap:
+    """ Reutiliza el bitmap en disco si corresponde a la misma distribución de celda. """
+    n1, n2 = kwargs.get('n1', 360), kwargs.get('n2', 360)
+    key = layout_key(L1, L2, obstacles or [], n1, n2, kwargs.get('link_radius', 0.0),
+                     kwargs.get('conservative', True), kwargs.get('fk', fk_2r_batch))
+    try:
+        m = CSpaceMap.load(path)
+        if m.key == key:
+            return m
+    except (OSError, KeyError, ValueError):
+        pass
+    m = build_cspace(L1, L2, obstacles, **kwargs)
+    m.save(path)
+    return m
+
+# ------------------ Vista ------------------
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    import matplotlib.pyplot as plt
+
+    L1, L2 = 5.0, 4.0
+    obstacles = [Sphere((5.0, 4.0, 0.0), 1.5),
+                 AABB((-7.0, -3.0, -1.0), (-5.0, 3.0, 1.0))]
+    cmap = build_cspace(L1, L2, obstacles, n1=360, n2=360)
+    print(f"Ocupado: {cmap.fraction_occupied():.1%}")
+    plt.imshow(cmap.as_bool().T, origin='lower', extent=(-180, 180, -180, 180), cmap='Greys')
+    plt.xlabel("θ1 (grados)"); plt.ylabel("θ2 (grados)")
+    plt.title("C-space 2R (negro = colisión)")
+    plt.show()
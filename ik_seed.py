@@ -0,0 +1,345 @@
+#   IK numérica sembrada desde una base de datos de muestras de FK.
+#
+#   Para cadenas sin inversa cerrada (brazo de 3 eslabones inclinado de
+#   Examen_parcial_1, cadenas DH de dynamics.py):
+#     1. se muestrea una vez el espacio articular y se guarda (q, x_efector) en
+#        float32 con el formato .rtraj de traj_mmap (se reutiliza entre corridas),
+#     2. se indexan las posiciones con un árbol KD (scipy.spatial.cKDTree si está
+#        instalado; si no, una rejilla uniforme con consultas vectorizadas en NumPy),
+#     3. cada objetivo arranca desde sus k muestras más cercanas y se refina con
+#        mínimos cuadrados amortiguados (DLS), todas las semillas en un solo lote.
+#
+#   Ángulos en grados; Jacobiano por diferencias centrales (sirve para cualquier fk).
+#
+#   Ejemplo:  python ik_seed.py     (compara arranque en frío vs. sembrado)
+
+import os
+from dataclasses import dataclass, field
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:                 # opcional: se usa la rejilla de NumPy
+    cKDTree = None
+
+# ------------------ Modelos ------------------
+
+@dataclass
+class ArmModel:
+    name: str
+    fk: object                      # Q (N, n) -> posiciones del efector (N, 3)
+    lower: np.ndarray               # límites articulares (n,)
+    upper: np.ndarray
+    params: dict = field(default_factory=dict)   # descripción estable (clave de la base)
+    modules: tuple = ()             # módulos cuyo código define la fk
+
+    @property
+    def n(self) -> int:
+        return len(self.lower)
+
+def tilted_arm(l1: float = 7.5, l2: float = 6.0, l3: float = 4.5,
+               limits=((-180, 180), (-150, 150), (-150, 150), (-90, 90))) -> ArmModel:
+    """ forward_frames de Examen_parcial_1: q = (t1, t2, t3, phi_y). """
+    from Examen_parcial_1 import forward_tip_batch
+
+    def fk(Q):
+        return forward_tip_batch(Q[:, 0], Q[:, 1], Q[:, 2], l1, l2, l3, Q[:, 3])
+    lim = np.asarray(limits, dtype=float)
+    return ArmModel('tilted_3r', fk, lim[:, 0], lim[:, 1],
+                    {'model': 'tilted_3r', 'l': (l1, l2, l3), 'limits': lim.tolist()},
+                    ('ik_seed', 'Examen_parcial_1'))
+
+def dh_model(chain, limits, name: str = 'dh') -> ArmModel:
+    """ Cadena DH de dynamics.py; límites en grados (rotacionales) o unidades de longitud. """
+    from dynamics import _link_transforms
+
+    rot = np.array([l.joint == 'R' for l in chain.links])
+
+    def fk(Q):
+        Q = np.where(rot, np.radians(Q), Q)
+        R = np.broadcast_to(np.eye(3), (len(Q), 3, 3))
+        o = np.zeros((len(Q), 3))
+        for i, link in enumerate(chain.links):
+            Ai, pi = _link_transforms(link, Q[:, i])
+            o = o + np.einsum('nij,nj->ni', R, pi)
+            R = R @ Ai
+        return o
+    lim = np.asarray(limits, dtype=float)
+    return ArmModel(name, fk, lim[:, 0], lim[:, 1],
+                    {'model': name, 'chain': chain, 'limits': lim.tolist()},
+                    ('ik_seed', 'dynamics'))
+
+# ------------------ Índice espacial ------------------
+
+class _GridIndex:
+    """
+    Vecinos más cercanos sin scipy: puntos ordenados por celda de una rejilla
+    uniforme; las consultas se resuelven todas a la vez revisando el cubo de
+    celdas de radio r y solo las que no quedan garantizadas (k-ésimo vecino fuera
+    del radio cubierto) repiten con 2r; las que siguen sin resolverse (lejos de
+    las muestras) se buscan por fuerza bruta. El resultado es exacto.
+    Las dimensiones sin extensión (cadenas planas) no se dividen en celdas.
+    """
+
+    def __init__(self, X, per_cell: int = 8, max_cells: int = 1 << 22):
+        X = np.asarray(X, dtype=float)
+        self.X = X
+        self.lo = X.min(axis=0)
+        span = X.max(axis=0) - self.lo
+        self.active = span > 1e-9 * max(float(span.max()), 1e-12)
+        d = max(int(self.active.sum()), 1)
+        act = np.where(self.active, span, 1.0)
+        limit = min(max_cells, 8 * len(X))
+        self.cell = float((np.prod(act[self.active]) * per_cell / len(X)) ** (1.0 / d)) if self.active.any() else 1.0
+        # Las muestras de FK no son uniformes: se achica la celda hasta que la
+        # ocupación media vista desde un punto (Σ n² / N) ronde per_cell,
+        # sin pasar de limit celdas
+        for _ in range(12):
+            self._set_dims(act)
+            if np.prod(self.dims) > limit:
+                self.cell *= 1.25
+                self._set_dims(act)
+                break
+            _, n = np.unique(self._ids(self._cells(X)), return_counts=True)
+            if (n * n).sum() / len(X) <= 2 * per_cell:
+                break
+            self.cell /= 1.25
+        ids = self._ids(self._cells(X))
+        self.order = np.argsort(ids, kind='stable')
+        self.Xs = X[self.order]                 # muestras contiguas por celda
+        self._x2 = np.einsum('ij,ij->i', X, X)   # |x|² para _brute
+        self.starts = np.searchsorted(ids[self.order], np.arange(int(np.prod(self.dims)) + 1))
+
+    def _set_dims(self, act):
+        self.dims = np.where(self.active, np.floor(act / self.cell).astype(np.int64) + 1, 1)
+
+    def _cells(self, P):
+        c = np.floor((P - self.lo) / self.cell).astype(np.int64)
+        return np.clip(np.where(self.active, c, 0), 0, self.dims - 1)
+
+    def _ids(self, c):
+        return (c[..., 0] * self.dims[1] + c[..., 1]) * self.dims[2] + c[..., 2]
+
+    def _ring(self, P, C, r: int, k: int):
+        """ k vecinos de cada fila de P dentro del cubo de radio r; ok si son exactos. """
+        m = len(P)
+        off = np.stack(np.meshgrid(*[np.arange(-r, r + 1) if a else np.zeros(1, np.int64)
+                                     for a in self.active], indexing='ij'), axis=-1).reshape(-1, 3)
+        G = C[:, None, :] + off                                 # (m, g, 3)
+        valid = np.all((G >= 0) & (G < self.dims), axis=-1)
+        ids = self._ids(np.clip(G, 0, self.dims - 1))
+        s = self.starts[ids]
+        n = np.where(valid, self.starts[ids + 1] - s, 0)
+        per_q = n.sum(axis=1)
+        n, s = n.ravel(), s.ravel()
+        # Candidatos de todas las consultas en un arreglo plano, luego a una matriz
+        # (m, máx. candidatos) rellena con inf para elegir los k menores por fila
+        sorted_idx = np.repeat(s - np.cumsum(n) + n, n) + np.arange(n.sum())
+        qid = np.repeat(np.arange(m), per_q)
+        col = np.arange(len(qid)) - np.repeat(np.cumsum(per_q) - per_q, per_q)
+        width = max(int(per_q.max(initial=0)), k)
+        Dm = np.full((m, width), np.inf)
+        Im = np.zeros((m, width), dtype=np.int64)
+        Dm[qid, col] = np.linalg.norm(self.Xs[sorted_idx] - P[qid], axis=1)
+        Im[qid, col] = sorted_idx
+        part = np.argpartition(Dm, k - 1, axis=1)[:, :k] if width > k else np.broadcast_to(np.arange(k), (m, k))
+        D = np.take_along_axis(Dm, part, axis=1)
+        o = np.argsort(D, axis=1)
+        D = np.take_along_axis(D, o, axis=1)
+        I = self.order[np.take_along_axis(np.take_along_axis(Im, part, axis=1), o, axis=1)]
+        # Radio cubierto: distancia de p a la cara más cercana del cubo que no sea borde de la rejilla
+        lo_face = np.where(C - r <= 0, -np.inf, self.lo + (C - r) * self.cell)
+        hi_face = np.where(C + r >= self.dims - 1, np.inf, self.lo + (C + r + 1) * self.cell)
+        covered = np.min(np.where(self.active, np.minimum(P - lo_face, hi_face - P), np.inf), axis=1)
+        # En las dimensiones sin extensión todas las muestras valen lo: esa parte de
+        # la distancia es la misma para todas y no cuenta contra el radio cubierto
+        perp2 = np.sum(np.where(self.active, 0.0, P - self.lo) ** 2, axis=1)
+        return D, I, np.sqrt(np.maximum(D[:, -1] ** 2 - perp2, 0.0)) <= covered
+
+    def _brute(self, P, k: int, chunk: int = 64):
+        """ Todas las muestras contra bloques de consultas (|x|² - 2 x·p + |p|², BLAS). """
+        D = np.empty((len(P), k)); I = np.empty((len(P), k), dtype=np.int64)
+        for a in range(0, len(P), chunk):
+            Pb = P[a:a + chunk]
+            d2 = self._x2 - 2.0 * (Pb @ self.X.T)                    # (b, N) sin |p|²
+            part = np.argpartition(d2, k - 1, axis=1)[:, :k] if len(self.X) > k else \
+                np.broadcast_to(np.arange(k), (len(Pb), k))
+            d = np.linalg.norm(self.X[part] - Pb[:, None, :], axis=2)
+            o = np.argsort(d, axis=1)
+            D[a:a + chunk] = np.take_along_axis(d, o, axis=1)
+            I[a:a + chunk] = np.take_along_axis(part, o, axis=1)
+        return D, I
+
+    def query(self, P, k: int = 1, chunk: int = 2048, max_r: int = 4):
+        """ Las consultas que no se resuelven con r <= max_r (lejos de las muestras) van por fuerza bruta. """
+        P = np.atleast_2d(np.asarray(P, dtype=float))
+        if k > len(self.X):
+            raise ValueError("k es mayor que el número de muestras.")
+        D = np.empty((len(P), k)); I = np.empty((len(P), k), dtype=np.int64)
+        for a in range(0, len(P), chunk):
+            rows = np.arange(a, min(a + chunk, len(P)))
+            C = self._cells(P[rows])
+            r = 1
+            while len(rows) and r <= max_r:
+                Dr, Ir, ok = self._ring(P[rows], C, r, k)
+                D[rows[ok]], I[rows[ok]] = Dr[ok], Ir[ok]
+                rows, C = rows[~ok], C[~ok]
+                r *= 2
+            if len(rows):
+                D[rows], I[rows] = self._brute(P[rows], k)
+        return D, I
+
+def _make_index(X):
+    if cKDTree is not None:
+        return cKDTree(X)
+    return _GridIndex(X)
+
+# ------------------ Base de datos de muestras ------------------
+
+class FKDatabase:
+    """ Muestras (q, x) de la FK con índice de vecinos sobre x. """
+
+    def __init__(self, model: ArmModel, q, x):
+        self.model = model
+        self.q = np.asarray(q, dtype=float)
+        self.x = np.asarray(x, dtype=float)
+        self.index = _make_index(self.x)
+
+    @classmethod
+    def build(cls, model: ArmModel, n_samples: int = 100_000, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        q = model.lower + rng.random((n_samples, model.n)) * (model.upper - model.lower)
+        return cls(model, q, model.fk(q))
+
+    def nearest(self, targets, k: int = 4):
+        """ (distancias (M, k), configuraciones semilla (M, k, n)). """
+        d, i = self.index.query(np.atleast_2d(targets), k=k)
+        d, i = np.asarray(d).reshape(-1, k), np.asarray(i).reshape(-1, k)
+        return d, self.q[i]
+
+def _db_key(model: ArmModel, n_samples: int, seed: int) -> str:
+    from traj_cache import cache_key, code_version
+    return cache_key(model.params, {'n': n_samples, 'seed': seed}, code_version(*model.modules))
+
+def load_or_build(model: ArmModel, path: str | None = None, n_samples: int = 100_000,
+                  seed: int = 0) -> FKDatabase:
+    """
+    Abre la base guardada en path si corresponde al mismo modelo, muestreo y
+    código; si no, la construye y la guarda (escritura atómica).
+    """
+    from traj_mmap import open_trajectory, save_trajectory
+    path = path or f"ikdb_{model.name}.rtraj"
+    key = _db_key(model, n_samples, seed)
+    try:
+        traj = open_trajectory(path)
+        if traj.robot.get('key') == key:
+            return FKDatabase(model, np.array(traj['q']), np.array(traj['x']))
+    except (OSError, ValueError):
+        pass
+    db = FKDatabase.build(model, n_samples, seed)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    save_trajectory(tmp, {'model': model.name, 'key': key}, dtype='float32', q=db.q, x=db.x)
+    os.replace(tmp, path)
+    return db
+
+# ------------------ Solver DLS por lotes ------------------
+
+@dataclass
+class IKResult:
+    q: np.ndarray        # (M, n)
+    ok: np.ndarray       # (M,) convergió bajo tol
+    err: np.ndarray      # (M,) error de posición final
+    iters: np.ndarray    # (M,) iteraciones de la solución elegida
+
+def jacobian(fk, Q, h: float = 1e-4):
+    """ Jacobiano (B, 3, n) por diferencias centrales, en un solo llamado a fk. """
+    B, n = Q.shape
+    E = np.eye(n) * h
+    Qp = (Q[:, None, :] + E).reshape(-1, n)
+    Qm = (Q[:, None, :] - E).reshape(-1, n)
+    X = fk(np.vstack([Qp, Qm]))
+    d = (X[:B * n] - X[B * n:]).reshape(B, n, 3) / (2.0 * h)
+    return np.swapaxes(d, 1, 2)
+
+def dls_refine(model: ArmModel, targets, Q0, tol: float = 1e-4, max_iters: int = 100,
+               damping: float = 0.05, max_step: float = 20.0):
+    """
+    Refina B configuraciones hacia B objetivos con mínimos cuadrados amortiguados:
+        Δq = Jᵀ (J Jᵀ + λ² I)⁻¹ e,   λ² = damping² · tr(J Jᵀ)/3
+    Cada iteración opera solo sobre las filas que aún no convergen.
+    Devuelve (Q, err, iters).
+    """
+    T = np.asarray(targets, dtype=float)
+    Q = np.array(Q0, dtype=float)
+    iters = np.zeros(len(Q), dtype=np.int64)
+    err = np.linalg.norm(T - model.fk(Q), axis=1)
+    active = np.flatnonzero(err >= tol)
+    for _ in range(max_iters):
+        if len(active) == 0:
+            break
+        Qa = Q[active]
+        e = T[active] - model.fk(Qa)
+        J = jacobian(model.fk, Qa)
+        JJt = J @ np.swapaxes(J, 1, 2)
+        lam2 = damping**2 * np.trace(JJt, axis1=1, axis2=2) / 3.0
+        y = np.linalg.solve(JJt + lam2[:, None, None] * np.eye(3), e[..., None])
+        dq = (np.swapaxes(J, 1, 2) @ y)[..., 0]
+        big = np.abs(dq).max(axis=1, keepdims=True)
+        dq *= np.minimum(1.0, max_step / np.maximum(big, 1e-12))
+        Q[active] = np.clip(Qa + dq, model.lower, model.upper)
+        iters[active] += 1
+        err[active] = np.linalg.norm(T[active] - model.fk(Q[active]), axis=1)
+        active = active[err[active] >= tol]
+    return Q, err, iters
+
+def solve_ik(model: ArmModel, targets, db: FKDatabase | None = None, k_seeds: int = 4,
+             q0=None, tol: float = 1e-4, max_iters: int = 100, **kwargs) -> IKResult:
+    """
+    IK de M objetivos (M, 3). Con db: se prueba la muestra más cercana y, solo para
+    los objetivos que no convergen, las siguientes (hasta k_seeds). Sin db:
+    arranque en frío desde q0 (por defecto el centro de los límites).
+    max_iters se reparte entre las semillas; iters cuenta las de todas las probadas.
+    """
+    X = np.atleast_2d(np.asarray(targets, dtype=float))
+    M = len(X)
+    if db is not None:
+        _, seeds = db.nearest(X, k_seeds)
+    else:
+        q0 = 0.5 * (model.lower + model.upper) if q0 is None else np.asarray(q0, dtype=float)
+        seeds = np.broadcast_to(q0, (M, 1, model.n))
+    Q = np.array(seeds[:, 0], dtype=float)
+    err = np.full(M, np.inf)
+    iters = np.zeros(M, dtype=np.int64)
+    pending = np.arange(M)
+    k = seeds.shape[1]
+    per_seed = max(10, max_iters // k)          # una semilla atascada cede el turno a la siguiente
+    for j in range(k):
+        Qj, ej, ij = dls_refine(model, X[pending], seeds[pending, j], tol, per_seed, **kwargs)
+        iters[pending] += ij
+        better = ej < err[pending]
+        Q[pending[better]], err[pending[better]] = Qj[better], ej[better]
+        pending = pending[ej >= tol]
+        if len(pending) == 0:
+            break
+    return IKResult(Q, err < tol, err, iters)
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    import time
+
+    model = tilted_arm()
+    t0 = time.perf_counter()
+    db = load_or_build(model)
+    print(f"Base: {len(db.q)} muestras en {time.perf_counter() - t0:.2f} s "
+          f"(índice {'cKDTree' if cKDTree is not None else 'rejilla NumPy'})")
+
+    rng = np.random.default_rng(1)
+    q_true = model.lower + rng.random((2000, model.n)) * (model.upper - model.lower)
+    X = model.fk(q_true)
+    for label, kw in (("frío", {}), ("sembrado", {'db': db})):
+        t0 = time.perf_counter()
+        res = solve_ik(model, X, **kw)
+        dt = time.perf_counter() - t0
+        print(f"{label:9s}: convergencia {res.ok.mean():.1%}, iteraciones medias "
+              f"{res.iters[res.ok].mean():.1f}, {dt * 1e3:.0f} ms para {len(X)} objetivos")
@@ -0,0 +1,210 @@
+#   Servicio local de IK/FK (asyncio) con micro-lotes.
+#
+#   Protocolo: JSON Lines sobre socket Unix o TCP. Cada línea es una petición
+#   y cada respuesta lleva el mismo "id" (pueden llegar en otro orden):
+#     -> {"id": 1, "model": "2r", "L1": 5, "L2": 4, "elbow": "arriba", "target": [3, 4]}
+#     <- {"id": 1, "reachable": true, "joints": [5.97, 113.58]}
+#     -> {"id": 2, "model": "rrr", "mode": "fk", "L1": 5, "L2": 4, "joints": [0, 30, 60]}
+#     <- {"id": 2, "target": [...]}
+#
+#   Las peticiones concurrentes con el mismo robot (modelo, L1, L2, codo, modo)
+#   se agrupan en un solo llamado al solver vectorizado: el lote se despacha al
+#   llegar a --max-batch o cuando el primero lleva --max-wait-ms esperando.
+#   El lote se resuelve en un hilo (run_in_executor): un lote grande no detiene
+#   el bucle de eventos ni a los demás clientes.
+#
+#   Contrapresión: cada conexión tiene como máximo --max-inflight peticiones sin
+#   responder; al llegar al tope se deja de leer el socket hasta que se libere
+#   alguna, así un cliente que encadena peticiones más rápido de lo que se
+#   resuelven no hace crecer la memoria sin límite.
+#
+#   Ejemplo:
+#     python ik_server.py --socket /tmp/ik.sock --max-batch 256 --max-wait-ms 1
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import numpy as np
+
+from batch_ik import MODELS, solve_chunk
+
+# ------------------ Micro-lotes ------------------
+
+class MicroBatcher:
+    """ Junta peticiones individuales por clave de robot y las resuelve en bloque. """
+
+    def __init__(self, max_batch: int = 256, max_wait_ms: float = 1.0):
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._pending = {}     # clave -> [(fila, future), ...]
+        self._timers = {}      # clave -> TimerHandle
+        self._solving = set()  # lotes en el ejecutor (referencia para que no se recolecten)
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, key: tuple, row):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        pend = self._pending.setdefault(key, [])
+        pend.append((row, fut))
+        if len(pend) >= self.max_batch:
+            self._flush(key)
+        elif len(pend) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await fut
+
+    def _flush(self, key: tuple):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pend = self._pending.pop(key, None)
+        if not pend:
+            return
+        self.batches += 1
+        self.requests += len(pend)
+        t = asyncio.get_running_loop().create_task(self._solve(key, pend))
+        self._solving.add(t)
+        t.add_done_callback(self._solving.discard)
+
+    async def _solve(self, key: tuple, pend):
+        model, mode, L1, L2, elbow = key
+        X = np.array([r for r, _ in pend])
+        try:
+            _, Y = await asyncio.get_running_loop().run_in_executor(
+                None, solve_chunk, model, mode, L1, L2, X, elbow)
+        except Exception as e:
+            for _, fut in pend:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), y in zip(pend, Y.tolist()):
+            if not fut.done():
+                fut.set_result(y)
+
+    def stats(self) -> dict:
+        mean = self.requests / self.batches if self.batches else 0.0
+        return {'batches': self.batches, 'requests': self.requests, 'mean_batch': mean}
+
+# ------------------ Peticiones ------------------
+
+def _clean(v):
+    return None if v != v else v     # NaN -> null
+
+async def handle_request(batcher: MicroBatcher, req: dict) -> dict:
+    """ Valida una petición, la encola en el micro-lote y arma la respuesta. """
+    rid = req.get('id')
+    try:
+        if req.get('op') == 'stats':
+            return {'id': rid, **batcher.stats()}
+        model = req.get('model', '2r')
+        mode = req.get('mode', 'ik')
+        spec = MODELS.get(model)
+        if spec is None:
+            raise ValueError(f"Modelo desconocido: {model}")
+        if mode not in ('ik', 'fk'):
+            raise ValueError("mode debe ser 'ik' o 'fk'.")
+        L1, L2 = float(req['L1']), float(req['L2'])
+        if L1 <= 0 or L2 <= 0:
+            raise ValueError("L1 y L2 deben ser positivos.")
+        elbow = 'arriba' if str(req.get('elbow', 'arriba')).lower().startswith('arr') else 'abajo'
+        cols = spec['targets'] if mode == 'ik' else spec['joints']
+        row = [float(v) for v in req['target' if mode == 'ik' else 'joints']]
+        if len(row) != len(cols):
+            raise ValueError(f"Se esperaban {len(cols)} valores ({', '.join(cols)}).")
+    except (KeyError, TypeError, ValueError) as e:
+        return {'id': rid, 'error': str(e) if not isinstance(e, KeyError) else f"Falta el campo {e}"}
+
+    y = await batcher.submit((model, mode, L1, L2, elbow), row)
+    if mode == 'ik':
+        return {'id': rid, 'reachable': bool(y[0]), 'joints': [_clean(v) for v in y[1:]]}
+    return {'id': rid, 'target': [_clean(v) for v in y]}
+
+async def _serve_client(batcher: MicroBatcher, reader, writer, max_inflight: int = 1024):
+    lock = asyncio.Lock()
+    inflight = asyncio.Semaphore(max(1, int(max_inflight)))
+    tasks = set()
+
+    async def answer(line: bytes):
+        try:
+            # Toda línea recibe exactamente una respuesta, falle lo que falle
+            rid = None
+            try:
+                req = json.loads(line)
+                if not isinstance(req, dict):
+                    resp = {'id': None, 'error': "La petición debe ser un objeto JSON."}
+                else:
+                    rid = req.get('id')
+                    resp = await handle_request(batcher, req)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                resp = {'id': None, 'error': f"JSON inválido: {e}"}
+            except Exception as e:
+                resp = {'id': rid, 'error': f"Error interno: {e}"}
+            async with lock:
+                writer.write((json.dumps(resp) + '\n').encode('utf-8'))
+                await writer.drain()
+        finally:
+            inflight.release()
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            # Cada línea en su propia tarea: así se juntan en el mismo lote.
+            # Con max_inflight pendientes se espera aquí (sin leer más del socket).
+            await inflight.acquire()
+            t = asyncio.create_task(answer(line))
+            tasks.add(t)
+            t.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+# ------------------ Servidor ------------------
+
+async def serve(socket_path: str | None = None, host: str = '127.0.0.1', port: int = 8765,
+                max_batch: int = 256, max_wait_ms: float = 1.0, max_inflight: int = 1024):
+    batcher = MicroBatcher(max_batch=max_batch, max_wait_ms=max_wait_ms)
+    handler = lambda r, w: _serve_client(batcher, r, w, max_inflight)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)     # socket viejo de una ejecución anterior
+        server = await asyncio.start_unix_server(handler, path=socket_path)
+        where = socket_path
+    else:
+        server = await asyncio.start_server(handler, host=host, port=port)
+        where = f"{host}:{port}"
+    sys.stderr.write(f"[ik_server] escuchando en {where} "
+                     f"(max_batch={batcher.max_batch}, max_wait={max_wait_ms} ms, "
+                     f"max_inflight={max_inflight})\n")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Servicio local de IK/FK con micro-lotes.")
+    p.add_argument('--socket', default=None, help="ruta de socket Unix (si no, TCP)")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--max-batch', type=int, default=256)
+    p.add_argument('--max-wait-ms', type=float, default=1.0)
+    p.add_argument('--max-inflight', type=int, default=1024,
+                   help="peticiones sin responder por conexión antes de dejar de leer")
+    args = p.parse_args(argv)
+    try:
+        asyncio.run(serve(args.socket, args.host, args.port, args.max_batch, args.max_wait_ms,
+                          args.max_inflight))
+    except KeyboardInterrupt:
+        print("\nSaliendo...")
+    return 0
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    sys.exit(main())
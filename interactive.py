@@ -0,0 +1,336 @@
+#   Selección de objetivos por eventos (clic / arrastre) con recálculo en segundo plano.
+#
+#   Vista 2D del plano de trabajo del brazo (XY para '2r' y 'rrr', YZ para '2r_yz')
+#   con sliders de L1, L2 (y Z para el RRR) y botones de codo. Cada evento envía
+#   una petición a un hilo de fondo (DebouncedWorker) que:
+#     - espera a que el puntero se quede quieto debounce_ms (agrupa ráfagas),
+#     - durante un arrastre continuo resuelve igualmente cada max_wait_ms
+#       (la vista previa sigue al puntero aunque nunca se quede quieto),
+#     - resuelve solo la petición más reciente (las viejas se descartan),
+#     - abandona el cálculo si llega otra petición mientras trabaja (salvo el
+#       forzado por max_wait_ms, que se termina y se publica).
+#   El hilo de la UI nunca calcula IK: un temporizador de matplotlib recoge el
+#   último resultado y actualiza los artistas (vista previa continua). Al soltar
+#   el botón el brazo recorre la trayectoria.
+#
+#   Uso:  python Robot_planar_tarea_1.py --pick   (o tarea_2 / tarea_3)
+
+import queue
+import threading
+import time
+import numpy as np
+
+# ------------------ Trabajador con debounce ------------------
+
+class Cancelled(Exception):
+    """ La petición quedó obsoleta antes de terminar. """
+
+class DebouncedWorker:
+    """
+    Hilo de fondo que ejecuta fn(req, is_stale) solo sobre la última petición.
+    is_stale() devuelve True si llegó otra petición después; fn puede consultarla
+    entre etapas y lanzar Cancelled. Los resultados vigentes se recogen con poll(),
+    etiquetados con la generación de la petición (submit() la devuelve).
+    max_wait_ms: tope de espera desde la primera petición pendiente; si el flujo
+    de peticiones no se detiene, la última se resuelve sin cancelarse al cumplirse.
+    """
+
+    def __init__(self, fn, debounce_ms: float = 30.0, max_wait_ms: float = 100.0):
+        self.fn = fn
+        self.debounce = debounce_ms / 1000.0
+        self.max_wait = max(max_wait_ms, debounce_ms) / 1000.0
+        self._cv = threading.Condition()
+        self._req = None
+        self._gen = 0
+        self._t_first = 0.0
+        self._t_last = 0.0
+        self._stop = False
+        self._results = queue.SimpleQueue()
+        self.stats = {'submitted': 0, 'solved': 0, 'cancelled': 0}
+        self._thread = threading.Thread(target=self._run, name="ik-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, req) -> int:
+        with self._cv:
+            self._gen += 1
+            self._t_last = time.monotonic()
+            if self._req is None:
+                self._t_first = self._t_last
+            self._req = (self._gen, req)
+            self.stats['submitted'] += 1
+            self._cv.notify()
+            return self._gen
+
+    @property
+    def generation(self) -> int:
+        """ Generación de la última petición enviada. """
+        return self._gen
+
+    def _is_stale(self, gen: int) -> bool:
+        return gen != self._gen
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while self._req is None and not self._stop:
+                    self._cv.wait()
+                if self._stop:
+                    return
+                # Debounce: esperar a que no lleguen peticiones durante self.debounce,
+                # pero nunca más de self.max_wait desde la primera pendiente
+                forced = False
+                while not self._stop:
+                    now = time.monotonic()
+                    remaining = self._t_last + self.debounce - now
+                    if remaining <= 0:
+                        break
+                    forced = now >= self._t_first + self.max_wait
+                    if forced:
+                        break
+                    self._cv.wait(min(remaining, self._t_first + self.max_wait - now))
+                if self._stop:
+                    return
+                gen, req = self._req
+                self._req = None
+            # El forzado por max_wait no se cancela: es la vista previa más reciente
+            stale = (lambda: False) if forced else (lambda: self._is_stale(gen))
+            try:
+                out = self.fn(req, stale)
+            except Cancelled:
+                self.stats['cancelled'] += 1
+                continue
+            except Exception as e:          # el error se muestra en la UI
+                out = e
+            if stale():
+                self.stats['cancelled'] += 1
+            else:
+                self.stats['solved'] += 1
+                self._results.put((gen, req, out))
+
+    def poll(self):
+        """ Último resultado disponible (gen, req, out) o None; descarta los intermedios. """
+        last = None
+        while True:
+            try:
+                last = self._results.get_nowait()
+            except queue.Empty:
+                return last
+
+    def close(self):
+        with self._cv:
+            self._stop = True
+            self._cv.notify()
+        self._thread.join(timeout=1.0)
+
+# ------------------ Planificación (hilo de fondo) ------------------
+
+#   model -> (índices del plano de la vista, etiquetas, nº de articulaciones)
+VIEWS = {'2r': ((0, 1), ("X", "Y"), 2), '2r_yz': ((1, 2), ("Y", "Z"), 2), 'rrr': ((0, 1), ("X", "Y"), 3)}
+
+def plan_preview(req: dict, is_stale=lambda: False):
+    """
+    Trayectoria recta desde el efector actual hasta el objetivo con IK vectorizada
+    (todo el recorrido en una llamada). Si la recta sale del espacio de trabajo se
+    usa interpolación articular. Devuelve dict con 'thetas' (N, n) y 'points' (N, 3, 3).
+    """
+    import batch_ik
+    from traj_mmap import arm_points
+
+    model, L1, L2 = req['model'], req['L1'], req['L2']
+    spec = batch_ik.MODELS[model]
+    q0 = np.asarray(req['start'], dtype=float)
+    tip0 = arm_points(model, L1, L2, q0[None])[0, -1]
+    cols = {'2r': [0, 1], '2r_yz': [1, 2], 'rrr': [0, 1, 2]}[model]
+    p0 = tip0[cols]
+    p1 = np.asarray(req['target'], dtype=float)
+    s = np.linspace(0.0, 1.0, req['frames'])[:, None]
+    ok, Q = spec['ik'](L1, L2, p0 + s * (p1 - p0), req['elbow'])
+    if is_stale():
+        raise Cancelled()
+    from Robot_planar_tarea_1 import joint_interp, _wrap_deg
+    if ok.all():
+        # Desenvolver respecto a la pose actual para que no haya saltos de 360°
+        Q = q0 + np.cumsum(_wrap_deg(np.diff(np.vstack([q0, Q]), axis=0)), axis=0)
+        mode = 'cartesian'
+    elif ok[-1]:
+        Q = joint_interp(q0, Q[-1], req['frames'])
+        mode = 'joint'
+    else:
+        raise RuntimeError("Objetivo fuera del alcance.")
+    pts = arm_points(model, L1, L2, Q)
+    if is_stale():
+        raise Cancelled()
+    return {'thetas': Q, 'points': pts, 'mode': mode}
+
+# ------------------ Interfaz ------------------
+
+class TargetPicker:
+    """
+    Clic o arrastre en el plano = nuevo objetivo (vista previa continua);
+    al soltar, el brazo recorre la última trayectoria calculada.
+    """
+
+    def __init__(self, model: str = '2r', L1: float = 5.0, L2: float = 4.0,
+                 elbow: str = 'arriba', frames: int = 120, interval_ms: int = 20,
+                 debounce_ms: float = 30.0, max_wait_ms: float = 100.0):
+        if model not in VIEWS:
+            raise ValueError(f"Modelo no soportado: {model}")
+        self.model, self.L1, self.L2, self.elbow = model, L1, L2, elbow
+        self.frames, self.interval_ms = frames, interval_ms
+        self.plane, self.labels, n = VIEWS[model]
+        self.q = np.zeros(n)               # pose actual (brazo extendido)
+        self.z = 0.0                       # altura del objetivo (solo RRR)
+        self.target = None
+        self.preview = None                # último resultado vigente
+        self.preview_gen = 0               # generación de la petición que lo produjo
+        self.playing = None                # (thetas, índice) durante la animación
+        self.dragging = False
+        self.worker = DebouncedWorker(plan_preview, debounce_ms, max_wait_ms)
+        self._build()
+
+    # --- construcción ---
+    def _build(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.widgets import Slider, RadioButtons
+
+        self.fig = plt.figure(figsize=(8, 7))
+        self.ax = self.fig.add_axes([0.08, 0.28, 0.62, 0.66])
+        ax = self.ax
+        ax.set_aspect('equal')
+        ax.set_xlabel(self.labels[0]); ax.set_ylabel(self.labels[1])
+        ax.grid(True)
+        self.reach_outer = plt.Circle((0, 0), 1.0, fill=False, ls='--', color='gray')
+        self.reach_inner = plt.Circle((0, 0), 1.0, fill=False, ls=':', color='gray')
+        ax.add_patch(self.reach_outer); ax.add_patch(self.reach_inner)
+        self.path_line, = ax.plot([], [], lw=1, color='tab:gray')
+        self.ghost, = ax.plot([], [], marker='o', lw=2, alpha=0.35, color='tab:blue')
+        self.arm, = ax.plot([], [], marker='o', lw=3, color='tab:blue')
+        self.target_mark, = ax.plot([], [], marker='x', ms=10, ls='', color='tab:red')
+        self.status = ax.set_title("Clic o arrastra para fijar el objetivo")
+
+        self.s_L1 = Slider(self.fig.add_axes([0.12, 0.16, 0.55, 0.03]), "L1", 0.5, 15.0, valinit=self.L1)
+        self.s_L2 = Slider(self.fig.add_axes([0.12, 0.11, 0.55, 0.03]), "L2", 0.5, 15.0, valinit=self.L2)
+        self.s_L1.on_changed(self._on_params)
+        self.s_L2.on_changed(self._on_params)
+        if self.model == 'rrr':
+            self.s_z = Slider(self.fig.add_axes([0.12, 0.06, 0.55, 0.03]), "Z", -15.0, 15.0, valinit=0.0)
+            self.s_z.on_changed(self._on_params)
+        self.r_elbow = RadioButtons(self.fig.add_axes([0.76, 0.70, 0.18, 0.15]), ('arriba', 'abajo'),
+                                    active=0 if self.elbow == 'arriba' else 1)
+        self.r_elbow.on_clicked(self._on_elbow)
+
+        c = self.fig.canvas
+        c.mpl_connect('button_press_event', self._on_press)
+        c.mpl_connect('motion_notify_event', self._on_motion)
+        c.mpl_connect('button_release_event', self._on_release)
+        c.mpl_connect('close_event', lambda e: self.close())
+        self.timer = c.new_timer(interval=max(1, int(self.interval_ms)))
+        self.timer.add_callback(self._tick)
+        self.timer.start()
+        self._rescale()
+        self._draw_arm(self.arm, self._points(self.q[None])[0])
+
+    def _points(self, Q):
+        from traj_mmap import arm_points
+        return arm_points(self.model, self.L1, self.L2, Q)
+
+    def _rescale(self):
+        m = self.L1 + self.L2 + 1.0
+        self.ax.set_xlim(-m, m); self.ax.set_ylim(-m, m)
+        self.reach_outer.set_radius(self.L1 + self.L2)
+        self.reach_inner.set_radius(abs(self.L1 - self.L2))
+
+    def _draw_arm(self, line, pts):
+        line.set_data(pts[:, self.plane[0]], pts[:, self.plane[1]])
+
+    # --- eventos (hilo de UI: solo encolan trabajo) ---
+    def _request(self):
+        if self.target is None:
+            return
+        tgt = list(self.target) + ([self.z] if self.model == 'rrr' else [])
+        self.worker.submit({'model': self.model, 'L1': self.L1, 'L2': self.L2,
+                            'elbow': self.elbow, 'start': self.q.copy(),
+                            'target': tgt, 'frames': self.frames})
+
+    def _on_press(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        self.dragging = True
+        self.playing = None
+        self._set_target(event.xdata, event.ydata)
+
+    def _on_motion(self, event):
+        if self.dragging and event.inaxes is self.ax and event.xdata is not None:
+            self._set_target(event.xdata, event.ydata)
+
+    def _on_release(self, event):
+        if not self.dragging:
+            return
+        self.dragging = False
+        self._play_when_ready = True
+
+    def _set_target(self, u, v):
+        self.target = (float(u), float(v))
+        self.target_mark.set_data([u], [v])
+        self._request()
+        self.fig.canvas.draw_idle()
+
+    def _on_params(self, _):
+        self.L1, self.L2 = float(self.s_L1.val), float(self.s_L2.val)
+        if self.model == 'rrr':
+            self.z = float(self.s_z.val)
+        self._rescale()
+        self._draw_arm(self.arm, self._points(self.q[None])[0])
+        self._request()
+
+    def _on_elbow(self, label):
+        self.elbow = label
+        self._request()
+
+    # --- temporizador: aplica resultados y avanza la animación ---
+    _play_when_ready = False
+
+    def _tick(self):
+        res = self.worker.poll()
+        if res is not None:
+            gen, req, out = res
+            self.preview_gen = gen
+            if isinstance(out, Exception):
+                self.preview = None
+                self._play_when_ready = False
+                self.status.set_text(f"[ERROR] {out}")
+                self.path_line.set_data([], []); self.ghost.set_data([], [])
+            else:
+                self.preview = out
+                tip = out['points'][:, -1]
+                self.path_line.set_data(tip[:, self.plane[0]], tip[:, self.plane[1]])
+                self._draw_arm(self.ghost, out['points'][-1])
+                self.status.set_text(f"Vista previa ({out['mode']}) - codo {req['elbow']}")
+            self.fig.canvas.draw_idle()
+        # Reproducir solo la vista previa de la última petición (no una obsoleta
+        # mientras el trabajador aún resuelve la nueva)
+        if (self._play_when_ready and self.preview is not None
+                and self.preview_gen == self.worker.generation):
+            self._play_when_ready = False
+            self.playing = [self.preview, 0]
+        if self.playing is not None:
+            out, k = self.playing
+            self._draw_arm(self.arm, out['points'][k])
+            self.q = out['thetas'][k].copy()
+            if k + 1 >= len(out['thetas']):
+                self.playing = None
+                if self.preview is out:
+                    self.preview = None
+                    self.ghost.set_data([], [])
+                    self.path_line.set_data([], [])
+            else:
+                self.playing[1] = k + 1
+            self.fig.canvas.draw_idle()
+
+    def run(self):
+        import matplotlib.pyplot as plt
+        plt.show()
+
+    def close(self):
+        self.timer.stop()
+        self.worker.close()
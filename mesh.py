@@ -0,0 +1,238 @@
+#   Mallas triangulares: carga (STL ASCII/binario, OBJ), transformación por lotes
+#   con apply_SE3 y dibujo como un único Poly3DCollection.
+#
+#   Representación contigua:
+#       vertices (V, 3) float64   faces (F, 3) int32 (índices a vertices)
+#   Una pose (4, 4) transforma todos los vértices en una operación; una pila de
+#   poses (N, 4, 4) da (N, V, 3) de una vez (como en se3_screw.animate_box_screw).
+#
+#   Para mallas grandes:
+#     - culling de caras traseras respecto a la cámara de matplotlib (elev/azim),
+#     - decimación por agrupamiento de vértices en una rejilla (vertex clustering).
+#
+#   Ejemplo:  python mesh.py pieza.stl [caras_max]
+
+import os
+import re
+import sys
+from dataclasses import dataclass
+import numpy as np
+
+from se3_screw import apply_SE3
+
+@dataclass
+class Mesh:
+    vertices: np.ndarray     # (V, 3)
+    faces: np.ndarray        # (F, 3) int32
+
+    def __post_init__(self):
+        self.vertices = np.ascontiguousarray(self.vertices, dtype=float).reshape(-1, 3)
+        self.faces = np.ascontiguousarray(self.faces, dtype=np.int32).reshape(-1, 3)
+
+    @property
+    def n_faces(self) -> int:
+        return len(self.faces)
+
+    def triangles(self, vertices=None):
+        """ Triángulos (..., F, 3, 3); vertices puede ser una pila (N, V, 3) ya transformada. """
+        V = self.vertices if vertices is None else vertices
+        return V[..., self.faces, :]
+
+    def transformed(self, T):
+        """ Vértices (V, 3) con T (4, 4), o (N, V, 3) con T (N, 4, 4). """
+        return apply_SE3(self.vertices, T)
+
+# ------------------ Carga ------------------
+
+_STL_DTYPE = np.dtype([('normal', '<f4', (3,)), ('v', '<f4', (3, 3)), ('attr', '<u2')])
+
+def _weld(tri, decimals: int = 6) -> Mesh:
+    """ Triángulos sueltos (F, 3, 3) -> malla indexada (vértices compartidos). """
+    flat = tri.reshape(-1, 3).astype(float)
+    key = np.round(flat, decimals)
+    uniq, inv = np.unique(key, axis=0, return_inverse=True)
+    return Mesh(uniq, inv.reshape(-1, 3))
+
+def load_stl(path: str) -> Mesh:
+    """ STL binario o ASCII (se distingue por el tamaño, no por 'solid'). """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head = f.read(84)
+        if len(head) == 84:
+            n = int(np.frombuffer(head[80:84], '<u4')[0])
+            if 84 + 50 * n == size:
+                data = np.fromfile(f, dtype=_STL_DTYPE, count=n)
+                return _weld(data['v'])
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        text = f.read()
+    nums = re.findall(r'vertex\s+(\S+)\s+(\S+)\s+(\S+)', text)
+    if not nums or len(nums) % 3:
+        raise ValueError(f"{path}: STL no válido.")
+    return _weld(np.array(nums, dtype=float).reshape(-1, 3, 3))
+
+def load_obj(path: str) -> Mesh:
+    """ OBJ: líneas 'v' y 'f' (v, v/vt, v/vt/vn, v//vn); polígonos en abanico; índices negativos. """
+    verts, faces = [], []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('v '):
+                verts.append(line.split()[1:4])
+            elif line.startswith('f '):
+                idx = [int(tok.split('/')[0]) for tok in line.split()[1:]]
+                nv = len(verts)
+                idx = [i - 1 if i > 0 else nv + i for i in idx]
+                faces.extend((idx[0], idx[k], idx[k + 1]) for k in range(1, len(idx) - 1))
+    if not verts or not faces:
+        raise ValueError(f"{path}: OBJ sin vértices o caras.")
+    return Mesh(np.array(verts, dtype=float), np.array(faces))
+
+def load_mesh(path: str) -> Mesh:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.stl':
+        return load_stl(path)
+    if ext == '.obj':
+        return load_obj(path)
+    raise ValueError(f"Formato no soportado: {ext} (use .stl u .obj)")
+
+def box_mesh(pts8) -> Mesh:
+    """ Caja de 8 vértices (orden de box_init de los Box3D): 12 triángulos, normales hacia afuera. """
+    faces = [(0, 1, 2), (0, 2, 3),     # y = 0
+             (4, 6, 5), (4, 7, 6),     # y = 2
+             (0, 5, 1), (0, 4, 5),     # z = 0
+             (3, 6, 7), (3, 2, 6),     # z = 3
+             (0, 7, 4), (0, 3, 7),     # x = 0
+             (1, 6, 2), (1, 5, 6)]     # x = 7
+    return Mesh(np.asarray(pts8, dtype=float), np.array(faces))
+
+# ------------------ Geometría ------------------
+
+def face_normals(tri):
+    """ Normales unitarias (..., F, 3) de triángulos (..., F, 3, 3) (regla de la mano derecha). """
+    n = np.cross(tri[..., 1, :] - tri[..., 0, :], tri[..., 2, :] - tri[..., 0, :])
+    norm = np.linalg.norm(n, axis=-1, keepdims=True)
+    return n / np.where(norm > 0, norm, 1.0)
+
+def view_vector(elev: float, azim: float):
+    """ Dirección hacia la cámara de un Axes3D (proyección ortográfica). """
+    e, a = np.radians(elev), np.radians(azim)
+    return np.array([np.cos(e) * np.cos(a), np.cos(e) * np.sin(a), np.sin(e)])
+
+def cull_backfaces(tri, view):
+    """ Máscara (F,) de caras que miran hacia la cámara (view: vector hacia el observador). """
+    return face_normals(tri) @ np.asarray(view, dtype=float) > 0.0
+
+def decimate(mesh: Mesh, max_faces: int, iters: int = 8) -> Mesh:
+    """
+    Reduce a <= max_faces caras por agrupamiento de vértices: cada celda de una
+    rejilla uniforme colapsa a la media de sus vértices; se eliminan caras
+    degeneradas y repetidas. El tamaño de celda se ajusta por bisección.
+    """
+    if mesh.n_faces <= max_faces:
+        return mesh
+    V, F = mesh.vertices, mesh.faces
+    lo_v, hi_v = V.min(axis=0), V.max(axis=0)
+    diag = float(np.linalg.norm(hi_v - lo_v)) or 1.0
+    lo, hi = 0.0, diag
+    best = None
+    for _ in range(iters):
+        cell = 0.5 * (lo + hi)
+        out = _cluster(V, F, lo_v, cell)
+        if out.n_faces <= max_faces:
+            best, hi = out, cell
+        else:
+            lo = cell
+    return best if best is not None else _cluster(V, F, lo_v, diag)
+
+def _cluster(V, F, origin, cell: float) -> Mesh:
+    q = np.floor((V - origin) / cell).astype(np.int64)
+    _, cid, counts = np.unique(q, axis=0, return_inverse=True, return_counts=True)
+    cid = cid.ravel()
+    C = np.zeros((len(counts), 3))
+    np.add.at(C, cid, V)
+    C /= counts[:, None]
+    G = cid[F]
+    keep = (G[:, 0] != G[:, 1]) & (G[:, 1] != G[:, 2]) & (G[:, 0] != G[:, 2])
+    G = G[keep]
+    # Caras repetidas (mismos tres vértices, cualquier orden)
+    _, first = np.unique(np.sort(G, axis=1), axis=0, return_index=True)
+    G = G[np.sort(first)]
+    used, G = np.unique(G, return_inverse=True)
+    return Mesh(C[used], G.reshape(-1, 3))
+
+# ------------------ Dibujo ------------------
+
+class MeshArtist:
+    """
+    Un Poly3DCollection para toda la malla. update(T) transforma, descarta las
+    caras traseras y sombrea (Lambert) en bloque; no crea artistas nuevos por frame.
+    """
+
+    def __init__(self, ax, mesh: Mesh, color=(0.2, 0.6, 0.7), cull: bool = True,
+                 light=(0.4, -0.3, 0.85), edgecolor='none', T=None):
+        from matplotlib.colors import to_rgb
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+        self.ax, self.mesh, self.cull = ax, mesh, cull
+        self.color = np.asarray(to_rgb(color))
+        self.light = np.asarray(light, dtype=float) / np.linalg.norm(light)
+        self.coll = Poly3DCollection([], edgecolor=edgecolor, linewidths=0.2)
+        ax.add_collection3d(self.coll)
+        self.update(np.eye(4) if T is None else T)
+
+    def update(self, T):
+        tri = self.mesh.triangles(self.mesh.transformed(T))
+        n = face_normals(tri)
+        if self.cull:
+            keep = n @ view_vector(self.ax.elev, self.ax.azim) > 0.0
+            tri, n = tri[keep], n[keep]
+        shade = 0.35 + 0.65 * np.clip(n @ self.light, 0.0, 1.0)
+        self.coll.set_verts(tri)
+        self.coll.set_facecolor(shade[:, None] * self.color)
+        return self.coll
+
+def draw_mesh(ax, mesh: Mesh, T=None, **kwargs) -> MeshArtist:
+    """ Dibuja la malla (pose T) en ax como un único Poly3DCollection. """
+    return MeshArtist(ax, mesh, T=T, **kwargs)
+
+def set_limits(ax, points, pad: float = 0.05):
+    """ Límites cúbicos que contienen points (..., 3). """
+    P = np.asarray(points).reshape(-1, 3)
+    c = 0.5 * (P.min(axis=0) + P.max(axis=0))
+    r = 0.5 * float((P.max(axis=0) - P.min(axis=0)).max()) * (1.0 + pad) or 1.0
+    ax.set_xlim3d(c[0] - r, c[0] + r); ax.set_ylim3d(c[1] - r, c[1] + r); ax.set_zlim3d(c[2] - r, c[2] + r)
+
+# ------------------ Demo: pieza moviéndose en tornillo ------------------
+
+def animate_mesh_screw(mesh: Mesh, T_start, T_end, steps: int = 120, interval_ms: int = 20):
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+    from se3_screw import screw_interp
+
+    poses = screw_interp(T_start, T_end, steps)
+    fig, ax = plt.subplots(subplot_kw={'projection': '3d'})
+    ax.view_init(elev=30, azim=40)
+    set_limits(ax, mesh.transformed(poses[::max(1, steps // 8)]))
+    art = draw_mesh(ax, mesh, T=poses[0])
+    ax.set_title(f"{mesh.n_faces} caras")
+
+    def update(k):
+        return art.update(poses[k]),
+
+    anim = FuncAnimation(fig, update, frames=steps, interval=interval_ms, blit=False, repeat=False)
+    fig._anim = anim
+    plt.show()
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    from se3_screw import build_SE3, RotX, RotZ, box_init
+
+    if len(sys.argv) > 1:
+        m = load_mesh(sys.argv[1])
+        if len(sys.argv) > 2:
+            m = decimate(m, int(sys.argv[2]))
+    else:
+        m = box_mesh(box_init)
+    size = float(np.ptp(m.vertices, axis=0).max())
+    T_a = build_SE3(np.eye(3), (0, 0, 0))
+    T_b = build_SE3(RotZ(90) @ RotX(40), (1.5 * size, size, 0.8 * size))
+    animate_mesh_screw(m, T_a, T_b)
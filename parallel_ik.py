@@ -0,0 +1,141 @@
+#   Solver multiproceso por bloques para archivos de objetivos muy grandes.
+#
+#   Divide la entrada en bloques (batch_ik.iter_chunks), los reparte a un
+#   ProcessPoolExecutor cuyos workers cargan el modelo una sola vez, y escribe
+#   los resultados EN ORDEN. El número de bloques en vuelo está acotado, así la
+#   memoria se mantiene plana aunque el archivo tenga millones de filas.
+#
+#   Ejemplo:
+#     python parallel_ik.py --model scara --L1 47.5 --L2 37.5 -i obj.npy -o sol.npy --workers 8
+
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_ik
+
+# ------------------ Worker ------------------
+#   Estado por proceso: se fija una vez en el initializer y cada bloque solo
+#   viaja como arreglo (sin re-enviar parámetros del robot).
+
+_WORKER = {}
+
+def _init_worker(model: str, mode: str, L1: float, L2: float, elbow: str):
+    from profiling import install_worker
+    install_worker(globals())     # ROBOT_PROFILE=timers: un .json por worker
+    _WORKER.update(model=model, mode=mode, L1=L1, L2=L2, elbow=elbow)
+    batch_ik.MODELS[model]       # falla temprano si el modelo no existe
+
+def _solve(X):
+    w = _WORKER
+    _, Y = batch_ik.solve_chunk(w['model'], w['mode'], w['L1'], w['L2'], X, w['elbow'])
+    return Y
+
+# ------------------ Progreso ------------------
+
+class Progress:
+    """ Reporte de filas procesadas y throughput (filas/s) hacia stderr. """
+
+    def __init__(self, every_s: float = 1.0, stream=sys.stderr):
+        self.t0 = time.perf_counter()
+        self.last = self.t0
+        self.every_s = every_s
+        self.stream = stream
+        self.rows = 0
+        self.chunks = 0
+
+    def update(self, n: int):
+        self.rows += n
+        self.chunks += 1
+        now = time.perf_counter()
+        if self.stream is not None and now - self.last >= self.every_s:
+            self.last = now
+            self.stream.write(f"[progreso] {self.rows} filas, {self.chunks} bloques, "
+                              f"{self.rate():,.0f} filas/s\n")
+
+    def rate(self) -> float:
+        dt = time.perf_counter() - self.t0
+        return self.rows / dt if dt > 0 else 0.0
+
+    def done(self):
+        if self.stream is not None:
+            dt = time.perf_counter() - self.t0
+            self.stream.write(f"[fin] {self.rows} filas en {dt:.2f} s "
+                              f"({self.rate():,.0f} filas/s)\n")
+
+# ------------------ Driver ------------------
+
+def run_parallel(args, workers: int | None = None, max_inflight: int | None = None,
+                 progress: Progress | None = None) -> int:
+    """
+    Resuelve todos los bloques en paralelo y los escribe en el orden de entrada.
+    max_inflight: bloques enviados y aún no escritos (por defecto 2 por worker).
+    Devuelve el número de filas escritas.
+    """
+    spec = batch_ik.MODELS[args.model]
+    elbow = 'arriba' if args.elbow.lower().startswith('arr') else 'abajo'
+    in_cols = spec['targets'] if args.mode == 'ik' else spec['joints']
+    out_cols = (('reachable',) + spec['joints']) if args.mode == 'ik' else spec['targets']
+    fmt_in = batch_ik._detect_format(args.input, args.format)
+    fmt_out = batch_ik._detect_format(args.output, args.out_format)
+
+    workers = workers or os.cpu_count() or 1
+    max_inflight = max(1, max_inflight or 2 * workers)
+    progress = progress or Progress(stream=None)
+
+    writer = batch_ik._Writer(args.output, fmt_out, out_cols)
+    pending = deque()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(args.model, args.mode, args.L1, args.L2, elbow)) as pool:
+            for X in batch_ik.iter_chunks(args.input, fmt_in, in_cols, args.chunk):
+                if len(pending) >= max_inflight:
+                    Y = pending.popleft().result()     # espera al más antiguo (orden)
+                    writer.write(Y)
+                    progress.update(len(Y))
+                pending.append(pool.submit(_solve, X))
+            while pending:
+                Y = pending.popleft().result()
+                writer.write(Y)
+                progress.update(len(Y))
+    finally:
+        for fut in pending:
+            fut.cancel()
+        writer.close()
+    progress.done()
+    return progress.rows
+
+# ------------------ CLI ------------------
+
+def build_parser():
+    p = batch_ik.build_parser()
+    p.description = "IK/FK por lotes en paralelo (multiproceso), sin GUI."
+    p.add_argument('--workers', type=int, default=None, help="procesos (por defecto: núcleos)")
+    p.add_argument('--max-inflight', type=int, default=None,
+                   help="bloques en vuelo como máximo (por defecto: 2 por worker)")
+    p.add_argument('--quiet', action='store_true', help="sin reporte de progreso")
+    p.set_defaults(model='rrr')
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.L1 <= 0 or args.L2 <= 0:
+        sys.stderr.write("[ERROR] L1 y L2 deben ser positivos.\n")
+        return 2
+    progress = Progress(stream=None if args.quiet else sys.stderr)
+    try:
+        run_parallel(args, workers=args.workers, max_inflight=args.max_inflight,
+                     progress=progress)
+    except BrokenPipeError:
+        pass
+    except (ValueError, OSError) as e:
+        sys.stderr.write(f"[ERROR] {e}\n")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#   Precálculo encadenado de movimientos: mientras se anima un movimiento, un
+#   trabajador (hilo o proceso) ya está resolviendo el siguiente.
+#
+#       entrada (cola acotada)  ->  trabajador: plan(*args, start=q, **kw)  ->  salida (cola acotada)
+#
+#   El trabajador encadena las poses: cada plan parte del último frame del plan
+#   anterior que tuvo éxito, así los resultados se pueden reproducir en orden sin
+#   saltos. Las colas acotadas limitan cuánto se adelanta (memoria) y frenan al
+#   productor si el consumidor (la animación) se retrasa.
+#
+#   backend='thread'  : un hilo; sirve cuando el plan es NumPy o la UI pasa el
+#                       tiempo dormida en plt.pause.
+#   backend='process' : el plan corre en un proceso aparte (ProcessPoolExecutor),
+#                       útil para IK en Python puro o con chequeo de colisiones,
+#                       que de otro modo competiría por el GIL con la animación.
+
+import queue
+import threading
+
+_END = object()
+
+class MotionPipeline:
+    """
+    Encola objetivos con put(*args, **kwargs) y consume resultados en orden con get()
+    o iterando. Cada resultado es (args, kwargs, trayectoria | excepción).
+    plan debe aceptar el argumento start (pose inicial) y devolver una lista de poses.
+    """
+
+    def __init__(self, plan, start, maxsize: int = 2, backend: str = "thread"):
+        if backend not in ("thread", "process"):
+            raise ValueError("backend debe ser 'thread' o 'process'.")
+        if maxsize < 1:
+            raise ValueError("maxsize debe ser >= 1.")
+        self.plan = plan
+        self.q = tuple(start)                 # pose final del último plan exitoso
+        self._in = queue.Queue(maxsize)
+        self._out = queue.Queue(maxsize)
+        self._cancel = threading.Event()
+        self._pool = None
+        if backend == "process":
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=1)
+        self._thread = threading.Thread(target=self._run, name="motion-pipeline", daemon=True)
+        self._thread.start()
+
+    # --- productor ---
+    def put(self, *args, **kwargs):
+        """ Encola un objetivo; bloquea si ya hay maxsize pendientes. """
+        self._in.put((args, kwargs))
+
+    def close(self):
+        """ No habrá más objetivos: la iteración termina al agotar los pendientes. """
+        self._in.put(_END)
+
+    def cancel(self):
+        """ Descarta todo lo pendiente y detiene el trabajador. """
+        self._cancel.set()
+        for q in (self._in, self._out):
+            try:
+                while True:
+                    q.get_nowait()
+            except queue.Empty:
+                pass
+        try:
+            self._in.put_nowait(_END)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=5.0)
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    # --- trabajador ---
+    def _solve(self, args, kwargs):
+        if self._pool is None:
+            return self.plan(*args, start=self.q, **kwargs)
+        return self._pool.submit(self.plan, *args, start=self.q, **kwargs).result()
+
+    def _run(self):
+        try:
+            while not self._cancel.is_set():
+                item = self._in.get()
+                if item is _END:
+                    break
+                args, kwargs = item
+                try:
+                    out = self._solve(args, kwargs)
+                    self.q = tuple(out[-1])
+                except Exception as e:            # se entrega al consumidor
+                    out = e
+                self._out.put((args, kwargs, out))
+        finally:
+            if not self._cancel.is_set():
+                self._out.put(_END)
+            if self._pool is not None and not self._cancel.is_set():
+                self._pool.shutdown(wait=False)
+
+    # --- consumidor ---
+    def get(self, timeout: float | None = None):
+        """ Siguiente resultado en orden, o None si el pipeline terminó. """
+        item = self._out.get(timeout=timeout)
+        if item is _END:
+            self._out.put(_END)                   # para llamadas posteriores
+            return None
+        return item
+
+    def __iter__(self):
+        while True:
+            item = self.get()
+            if item is None:
+                return
+            yield item
+
+def feed(pipe: MotionPipeline, targets, **kwargs):
+    """ Encola targets [(args...), ...] desde un hilo aparte y cierra el pipeline. """
+    def run():
+        for t in targets:
+            if pipe._cancel.is_set():
+                return
+            pipe.put(*t, **kwargs)
+        pipe.close()
+    th = threading.Thread(target=run, name="motion-feed", daemon=True)
+    th.start()
+    return th
@@ -0,0 +1,423 @@
+#   Planificador en espacio articular para los brazos de Robot_planar_tarea_1/2/3.
+#
+#   - 2R (plano XY o YZ): frente de onda vectorizado sobre el bitmap de C-space
+#     precalculado (cspace_2r),
+#     8-conexo, con vuelta completa en las articulaciones sin límites.
+#   - RRR esférico: RRT-Connect con chequeo de colisión vectorizado por arista
+#     (collision.py) y vecino más cercano por barrido vectorizado sobre los nodos.
+#
+#   Ambos respetan límites articulares, suavizan el camino con atajos y devuelven
+#   un PlanResult con la ruta en grados. Así los movimientos que hoy fallan con
+#   "Trayectoria inalcanzable..." (la recta sale del espacio de trabajo) se
+#   resuelven moviéndose en espacio articular.
+
+import math
+from dataclasses import dataclass
+import numpy as np
+
+from collision import BVH, collision_mask
+
+@dataclass
+class PlanResult:
+    success: bool
+    path: np.ndarray | None      # (K, n_joints) en grados, desde el inicio hasta la meta
+    message: str
+
+FULL = (-180.0, 180.0)
+
+def _wrap_deg(d):
+    return d - 360.0 * np.ceil((np.asarray(d, dtype=float) - 180.0) / 360.0)
+
+def _in_limits(q, limits):
+    lo = np.array([l[0] for l in limits]); hi = np.array([l[1] for l in limits])
+    return np.all((q >= lo - 1e-9) & (q <= hi + 1e-9), axis=-1)
+
+def densify(path, max_step_deg: float = 1.0):
+    """ Interpola linealmente la ruta para que ningún paso supere max_step_deg. """
+    path = np.asarray(path, dtype=float)
+    out = [path[:1]]
+    for a, b in zip(path[:-1], path[1:]):
+        n = max(1, int(math.ceil(np.abs(b - a).max() / max_step_deg)))
+        s = np.linspace(0.0, 1.0, n + 1)[1:, None]
+        out.append(a + s * (b - a))
+    return np.concatenate(out)
+
+# ------------------ 2R: frente de onda sobre el C-space ------------------
+
+_STEPS = np.array([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+_BITS = (1 << np.arange(len(_STEPS))).astype(np.uint8)
+
+class _Wavefront:
+    """
+    Rejilla plana con un borde de una celda (copia envuelta en los ejes con
+    vuelta completa, ocupada en los demás). Guarda por celda la máscara de 8
+    bits de pasos permitidos (vecino libre y sin cortar esquinas ocupadas en
+    diagonal) y el índice canónico de las celdas del borde, así cada capa del
+    frente de onda se expande entera con operaciones NumPy.
+    """
+
+    def __init__(self, free, wrap):
+        n1, n2 = free.shape
+        self.shape, self.wrap = (n1, n2), wrap
+        w = self.w = n2 + 2
+        P = np.zeros((n1 + 2, w), dtype=bool)
+        P[1:-1, 1:-1] = free
+        if wrap[0]:
+            P[0, 1:-1], P[-1, 1:-1] = free[-1], free[0]
+        if wrap[1]:
+            P[:, 0], P[:, -1] = P[:, -2], P[:, 1]
+        P = P.ravel()
+        lo, hi = w + 1, P.size - w - 1
+        self.valid = np.zeros(P.size, dtype=np.uint8)
+        for c, (di, dj) in enumerate(_STEPS):
+            o = di * w + dj
+            ok = P[lo:hi] & P[lo + o:hi + o] & P[lo + di * w:hi + di * w] & P[lo + dj:hi + dj]
+            self.valid[lo:hi] |= ok.view(np.uint8) << c
+        i = np.arange(n1 + 2); j = np.arange(w)
+        if wrap[0]: i = (i - 1) % n1 + 1
+        if wrap[1]: j = (j - 1) % n2 + 1
+        self.canon = (i[:, None] * w + j[None, :]).ravel().astype(np.int32)
+        self.off = (_STEPS[:, 0] * w + _STEPS[:, 1]).astype(np.int32)
+        self._stamp = np.zeros(P.size, dtype=np.int32)
+
+    def index(self, cell):
+        return (int(cell[0]) + 1) * self.w + int(cell[1]) + 1
+
+    def cell(self, k):
+        return (int(k) // self.w - 1, int(k) % self.w - 1)
+
+    def expand(self, front, dist, d):
+        """ Vecinos aún sin distancia de todo el frente; les asigna la capa d. """
+        ok = (self.valid[front][:, None] & _BITS) != 0
+        nb = self.canon[(front[:, None] + self.off)[ok]]
+        nb = nb[dist[nb] < 0]
+        self._stamp[nb] = np.arange(nb.size)
+        nb = nb[self._stamp[nb] == np.arange(nb.size)]      # sin duplicados, sin ordenar
+        dist[nb] = d
+        return nb
+
+    def descend(self, k, dist, target):
+        """ Baja por dist desde k hasta la capa 0, desempatando con la distancia octil a target. """
+        (n1, n2), w = self.shape, self.w
+        cells = []
+        while dist[k] > 0:
+            cand = self.canon[k + self.off[(self.valid[k] & _BITS) != 0]]
+            cand = cand[dist[cand] == dist[k] - 1]
+            di = np.abs(cand // w - 1 - target[0]); dj = np.abs(cand % w - 1 - target[1])
+            if self.wrap[0]: di = np.minimum(di, n1 - di)
+            if self.wrap[1]: dj = np.minimum(dj, n2 - dj)
+            k = int(cand[np.argmin(np.maximum(di, dj) + (math.sqrt(2.0) - 1.0) * np.minimum(di, dj))])
+            cells.append(self.cell(k))
+        return cells
+
+def astar_grid(free, start, goal, wrap=(True, True)):
+    """
+    Camino 8-conexo más corto en pasos sobre una rejilla booleana (True = libre),
+    sin cortar esquinas ocupadas en diagonal. Frente de onda bidireccional
+    vectorizado (_Wavefront) desde el inicio y la meta; al encontrarse se baja
+    por ambos campos de distancia. Devuelve la lista de celdas (i, j) o None
+    si no hay camino.
+    """
+    free = np.asarray(free, dtype=bool)
+    if not free[tuple(start)] or not free[tuple(goal)]:
+        return None
+    start = (int(start[0]), int(start[1])); goal = (int(goal[0]), int(goal[1]))
+    if start == goal:
+        return [start]
+    wf = _Wavefront(free, wrap)
+    s, g = wf.index(start), wf.index(goal)
+    dist = [np.full(wf.valid.size, -1, dtype=np.int32) for _ in range(2)]
+    dist[0][s] = dist[1][g] = 0
+    fronts = [np.array([s], dtype=np.int32), np.array([g], dtype=np.int32)]
+    depth = [0, 0]
+    while fronts[0].size and fronts[1].size:
+        a = 0 if fronts[0].size <= fronts[1].size else 1
+        depth[a] += 1
+        fronts[a] = wf.expand(fronts[a], dist[a], depth[a])
+        hit = fronts[a][dist[1 - a][fronts[a]] >= 0]
+        if hit.size:
+            m = int(hit[np.argmin(dist[1 - a][hit])])
+            head = wf.descend(m, dist[0], start)[::-1]
+            return head + [wf.cell(m)] + wf.descend(m, dist[1], goal)
+    return None
+
+def _limits_mask(cmap, limits):
+    c1, c2 = cmap.center(np.arange(cmap.n1), np.arange(cmap.n2))
+    m1 = (c1 >= limits[0][0]) & (c1 <= limits[0][1])
+    m2 = (c2 >= limits[1][0]) & (c2 <= limits[1][1])
+    return m1[:, None] & m2[None, :]
+
+def _segment_free_2r(cmap, a, b, limits, res_deg):
+    n = max(2, int(math.ceil(np.abs(b - a).max() / res_deg)) + 1)
+    q = a + np.linspace(0.0, 1.0, n)[:, None] * (b - a)
+    w = _wrap_deg(q)
+    ok = ~cmap.occupied(w[:, 0], w[:, 1])
+    for k, lim in enumerate(limits):
+        if lim != FULL:
+            ok &= (q[:, k] >= lim[0]) & (q[:, k] <= lim[1])
+    return bool(ok.all())
+
+def _shortcut(path, segment_free):
+    """ Atajos codiciosos: desde cada punto salta al más lejano visible. """
+    out = [path[0]]
+    i = 0
+    while i < len(path) - 1:
+        j = len(path) - 1
+        while j > i + 1 and not segment_free(path[i], path[j]):
+            j -= 1
+        out.append(path[j])
+        i = j
+    return np.array(out)
+
+def plan_2r(cmap, q_start, q_goal, limits=(FULL, FULL)) -> PlanResult:
+    """
+    Ruta libre de colisiones entre dos configuraciones (grados) del 2R usando el
+    bitmap cmap (cspace_2r.CSpaceMap). La ruta es continua (ángulos desenvueltos).
+    """
+    q_start = np.asarray(q_start, dtype=float)
+    q_goal = np.asarray(q_goal, dtype=float)
+    limits = tuple(tuple(map(float, l)) for l in limits)
+    for name, q in (("inicio", q_start), ("meta", q_goal)):
+        if not _in_limits(q, limits):
+            return PlanResult(False, None, f"La configuración de {name} viola los límites articulares.")
+        if cmap.occupied(*_wrap_deg(q)):
+            return PlanResult(False, None, f"La configuración de {name} está en colisión.")
+
+    free = ~cmap.as_bool() & _limits_mask(cmap, limits)
+    start = tuple(int(v) for v in cmap.cell(*q_start))
+    goal = tuple(int(v) for v in cmap.cell(*q_goal))
+    free[start] = free[goal] = True      # las celdas extremas ya se validaron arriba
+    wrap = tuple(l == FULL for l in limits)
+    cells = astar_grid(free, start, goal, wrap)
+    if cells is None:
+        return PlanResult(False, None, "No existe camino libre de colisiones en el C-space.")
+
+    ij = np.array(cells)
+    c1, c2 = cmap.center(ij[:, 0], ij[:, 1])
+    path = np.column_stack([c1, c2])
+    path[0], path[-1] = _wrap_deg(q_start), _wrap_deg(q_goal)
+    path = np.degrees(np.unwrap(np.radians(path), axis=0))
+    # Volver a anclar al inicio exacto (unwrap conserva el primer punto)
+    path += q_start - path[0]
+
+    res = min(cmap.d1, cmap.d2) / 2.0
+    path = _shortcut(path, lambda a, b: _segment_free_2r(cmap, a, b, limits, res))
+    return PlanResult(True, path, "OK")
+
+# ------------------ RRR: RRT-Connect ------------------
+
+class _Tree:
+    """
+    Nodos en un arreglo preasignado (se duplica al llenarse: connect() puede
+    agregar varios nodos por iteración); el vecino más cercano es un barrido vectorizado.
+    """
+
+    def __init__(self, root, capacity: int):
+        self.q = np.empty((capacity, len(root)))
+        self.parent = np.full(capacity, -1, dtype=int)
+        self.q[0] = root
+        self.n = 1
+
+    def nearest(self, q):
+        d = self.q[:self.n] - q
+        return int(np.argmin(np.einsum('ij,ij->i', d, d)))
+
+    def add(self, q, parent: int) -> int:
+        k = self.n
+        if k == len(self.q):
+            self.q = np.concatenate([self.q, np.empty_like(self.q)])
+            self.parent = np.concatenate([self.parent, np.full(k, -1, dtype=int)])
+        self.q[k] = q
+        self.parent[k] = parent
+        self.n += 1
+        return k
+
+    def path_to_root(self, k):
+        out = []
+        while k != -1:
+            out.append(self.q[k].copy())
+            k = self.parent[k]
+        return out
+
+def plan_rrr(L1: float, L2: float, q_start, q_goal, obstacles, limits=(FULL, (-90.0, 90.0), FULL),
+             link_radius: float = 0.0, step_deg: float = 10.0, res_deg: float = 2.0,
+             max_iters: int = 4000, seed: int = 0) -> PlanResult:
+    """
+    RRT-Connect en (th1, th2, th3) para el RRR esférico. Cada arista se valida
+    muestreándola cada res_deg y chequeando todos los puntos a la vez.
+    """
+    from Robot_planar_tarea_3 import fk_rrr_spherical_batch
+
+    q_start = np.asarray(q_start, dtype=float)
+    q_goal = np.asarray(q_goal, dtype=float)
+    limits = tuple(tuple(map(float, l)) for l in limits)
+    lo = np.array([l[0] for l in limits]); hi = np.array([l[1] for l in limits])
+    bvh = BVH(obstacles) if obstacles else None
+
+    def states_free(Q):
+        ok = _in_limits(Q, limits)
+        if bvh is not None and ok.any():
+            pts = np.stack(fk_rrr_spherical_batch(L1, L2, *Q.T), axis=1)
+            ok &= ~collision_mask(pts, None, link_radius, bvh)
+        return ok
+
+    def edge_free(a, b):
+        n = max(2, int(math.ceil(np.abs(b - a).max() / res_deg)) + 1)
+        Q = a + np.linspace(0.0, 1.0, n)[:, None] * (b - a)
+        return bool(states_free(Q).all())
+
+    for name, q in (("inicio", q_start), ("meta", q_goal)):
+        if not states_free(q[None])[0]:
+            return PlanResult(False, None, f"La configuración de {name} está en colisión o fuera de límites.")
+    if edge_free(q_start, q_goal):
+        return PlanResult(True, np.array([q_start, q_goal]), "OK")
+
+    rng = np.random.default_rng(seed)
+    ta, tb = _Tree(q_start, max_iters + 2), _Tree(q_goal, max_iters + 2)
+
+    def extend(tree, q):
+        k = tree.nearest(q)
+        d = q - tree.q[k]
+        dist = np.linalg.norm(d)
+        new = q if dist <= step_deg else tree.q[k] + d * (step_deg / dist)
+        if not edge_free(tree.q[k], new):
+            return None, False
+        return tree.add(new, k), dist <= step_deg
+
+    def connect(tree, q):
+        while True:
+            k, reached = extend(tree, q)
+            if k is None:
+                return None
+            if reached:
+                return k
+
+    for it in range(max_iters):
+        q_rand = q_goal if it % 10 == 0 else rng.uniform(lo, hi)
+        k_new, _ = extend(ta, q_rand)
+        if k_new is not None:
+            k_conn = connect(tb, ta.q[k_new])
+            if k_conn is not None:
+                pa = ta.path_to_root(k_new)[::-1]
+                pb = tb.path_to_root(k_conn)[1:]
+                path = np.array(pa + pb)
+                if not np.allclose(path[0], q_start):
+                    path = path[::-1]
+                path = _shortcut(path, edge_free)
+                return PlanResult(True, path, "OK")
+        ta, tb = tb, ta
+    return PlanResult(False, None, f"RRT-Connect sin solución en {max_iters} iteraciones.")
+
+# ------------------ Metas cartesianas ------------------
+
+def plan_to_point(model: str, L1: float, L2: float, q_start, target, obstacles=None, cmap=None,
+                  limits=None, **kwargs) -> PlanResult:
+    """
+    Planifica hasta un punto cartesiano probando ambas ramas del codo
+    (se queda con la ruta más corta en espacio articular).
+    model: '2r', '2r_yz' (requieren cmap) o 'rrr' (requiere obstacles).
+    """
+    import batch_ik
+    spec = batch_ik.MODELS[model]
+    best = PlanResult(False, None, "Objetivo fuera del alcance del brazo.")
+    best_len = math.inf
+    for elbow in ('arriba', 'abajo'):
+        ok, J = spec['ik'](L1, L2, np.asarray(target, dtype=float)[None], elbow)
+        if not ok[0]:
+            continue
+        q_goal = J[0]
+        if model == 'rrr':
+            res = plan_rrr(L1, L2, q_start, q_goal, obstacles,
+                           limits=limits or (FULL, (-90.0, 90.0), FULL), **kwargs)
+        else:
+            if cmap is None:
+                raise ValueError("Los modelos 2R necesitan un cmap (cspace_2r.build_cspace).")
+            res = plan_2r(cmap, q_start, q_goal, limits=limits or (FULL, FULL))
+        if res.success:
+            length = float(np.abs(np.diff(res.path, axis=0)).sum())
+            if length < best_len:
+                best, best_len = res, length
+        elif not best.success:
+            best = res
+    return best
+
+def resample(path, frames: int):
+    """ frames poses equiespaciadas en longitud articular a lo largo de la ruta. """
+    path = np.asarray(path, dtype=float)
+    s = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(path, axis=0), axis=1))])
+    if frames <= 1 or s[-1] <= 0.0:
+        return np.repeat(path[-1:], max(frames, 1), axis=0)
+    u = np.linspace(0.0, s[-1], frames)
+    return np.column_stack([np.interp(u, s, path[:, k]) for k in range(path.shape[1])])
+
+def plan_frames(model: str, L1: float, L2: float, q_start, target, frames: int,
+                obstacles=None, link_radius: float = 0.0, cells: int = 180):
+    """
+    Respaldo de plan_once* cuando la recta cartesiana sale del espacio de trabajo:
+    ruta articular hasta el punto (plan_to_point) remuestreada a frames poses.
+    Lanza RuntimeError si no hay ruta.
+    """
+    obstacles = list(obstacles or [])
+    if model == 'rrr':
+        res = plan_to_point(model, L1, L2, q_start, target, obstacles, link_radius=link_radius)
+    else:
+        from cspace_2r import build_cspace
+        if model == '2r_yz':
+            from Robot_planar_tarea_2 import fk_2r_yz_batch as fk
+        else:
+            from Robot_planar_tarea_1 import fk_2r_batch as fk
+        cmap = build_cspace(L1, L2, obstacles, n1=cells, n2=cells, link_radius=link_radius, fk=fk)
+        res = plan_to_point(model, L1, L2, q_start, target, cmap=cmap)
+    if not res.success:
+        pt = ", ".join(f"{v:.3f}" for v in target)
+        raise RuntimeError(f"Trayectoria inalcanzable hasta ({pt}): {res.message}")
+    return resample(res.path, frames)
+
+# ------------------ Animación ------------------
+
+def animate_path(model: str, L1: float, L2: float, path, obstacles=(), max_step_deg: float = 2.0,
+                 interval_ms: int = 20):
+    """ Reproduce una ruta articular (densificada) con FuncAnimation. """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+    from traj_mmap import arm_points
+
+    q = densify(path, max_step_deg)
+    pts = arm_points(model, L1, L2, q)
+
+    fig = plt.figure(figsize=(7, 6))
+    ax = fig.add_subplot(111, projection='3d')
+    for o in obstacles:
+        lo, hi = o.bounds()
+        c = (lo + hi) / 2.0
+        ax.scatter([c[0]], [c[1]], [c[2]], s=400, c='gray', alpha=0.5)
+    arm, = ax.plot(pts[0, :, 0], pts[0, :, 1], pts[0, :, 2], marker='o', linewidth=3)
+    m = L1 + L2 + 2.0
+    ax.set_xlim(-m, m); ax.set_ylim(-m, m); ax.set_zlim(-m, m)
+    ax.set_title(f"Ruta planificada ({model}) - {len(q)} frames")
+    ax.set_xlabel("X"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
+
+    def update(k):
+        arm.set_data_3d(pts[k, :, 0], pts[k, :, 1], pts[k, :, 2])
+        return arm,
+
+    anim = FuncAnimation(fig, update, frames=len(q), interval=interval_ms,
+                         blit=False, repeat=False)
+    fig._anim = anim
+    plt.show()
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    from collision import Sphere
+    from cspace_2r import build_cspace
+
+    L1, L2 = 5.0, 4.0
+    obstacles = [Sphere((0.0, 6.0, 0.0), 1.5)]
+    cmap = build_cspace(L1, L2, obstacles, n1=180, n2=180)
+    # Desde el brazo extendido en +X hasta (-6, 1): la recta pasa por el origen
+    # (fuera del alcance) y el arco directo choca con la esfera.
+    res = plan_to_point('2r', L1, L2, (0.0, 0.0), (-6.0, 1.0), cmap=cmap)
+    print(res.message)
+    if res.success:
+        animate_path('2r', L1, L2, res.path, obstacles)
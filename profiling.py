@@ -0,0 +1,343 @@
+#   Perfilado opcional para todos los scripts, activado por variable de entorno.
+#
+#   ROBOT_PROFILE=<modo>        (sin definir o vacío: desactivado, costo cero)
+#     cprofile   perfilador determinista (cProfile) -> archivo .prof (pstats/snakeviz)
+#     sample     muestreo de pila (señal en Unix, hilo en Windows) -> archivo .folded (flamegraph)
+#     timers     temporizadores por nombre sobre cinemática, dibujo y pausas del script y
+#                de los módulos del proyecto (también los que se importen después) -> .json
+#   ROBOT_PROFILE_OUT=<ruta>     archivo de salida (por defecto profile_<script>_<pid>.<ext>)
+#   ROBOT_PROFILE_INTERVAL=<ms>  periodo de muestreo del modo 'sample' (por defecto 5)
+#   ROBOT_PROFILE_MODULES=a,b    módulos a instrumentar en 'timers' (por defecto los del
+#                                proyecto ya importados)
+#
+#   Uso en un script (al inicio del bloque principal):
+#     if __name__ == "__main__":
+#         from profiling import install_from_env
+#         install_from_env(globals())
+#
+#   El resultado se escribe al salir (atexit), también tras Ctrl+C o sys.exit().
+
+import atexit
+import functools
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import sys
+import threading
+import time
+
+ENV = 'ROBOT_PROFILE'
+
+# Funciones envueltas por el modo 'timers', según prefijo del nombre
+_CATEGORIES = (
+    ('kinematics', ('ik', '_ik', 'fk', '_fk', 'forward', 'plan_once', 'A_DH', 'apply_', 'build_SE3',
+                    'compose_R', 'Rot', 'screw_interp', 'exp_SE3', 'log_SE3', 'solve', '_solve')),
+    ('drawing',    ('draw', 'redraw', 'set_scene', 'setaxis', 'set_equal_aspect',
+                    'fix_system', 'replay')),
+)
+
+_active = None   # perfilador instalado (uno por proceso)
+_active_pid = None
+_active_path = None
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def _default_out(ext: str) -> str:
+    script = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0] or 'python'
+    return f"profile_{script}_{os.getpid()}.{ext}"
+
+# ------------------ cProfile ------------------
+
+class _CProfile:
+    ext = 'prof'
+
+    def __init__(self):
+        import cProfile
+        self.prof = cProfile.Profile()
+        self.prof.enable()
+
+    def dump(self, path):
+        self.prof.disable()
+        self.prof.dump_stats(path)
+
+# ------------------ Muestreo ------------------
+
+class _Sampler:
+    """
+    Toma la pila del hilo principal cada 'interval' segundos (SIGALRM, tiempo real).
+    Sin SIGALRM/setitimer (Windows) o fuera del hilo principal, un hilo de fondo
+    lee la pila con sys._current_frames().
+    """
+    ext = 'folded'
+
+    def __init__(self, interval: float):
+        import signal
+        self.signal = signal
+        self.counts = {}
+        self._thread = None
+        if hasattr(signal, 'SIGALRM') and hasattr(signal, 'setitimer') \
+                and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGALRM, self._sample)
+            signal.setitimer(signal.ITIMER_REAL, interval, interval)
+        else:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._poll, name="profiling-sampler", daemon=True,
+                                            args=(interval, threading.main_thread().ident))
+            self._thread.start()
+
+    def _poll(self, interval: float, ident: int):
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(ident)
+            if frame is not None:
+                self._sample(None, frame)
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        key = ';'.join(reversed(stack))
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def dump(self, path):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        else:
+            self.signal.setitimer(self.signal.ITIMER_REAL, 0, 0)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, n in sorted(self.counts.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {n}\n")
+
+# ------------------ Temporizadores ------------------
+
+class Timers:
+    """ Acumula llamadas, tiempo total y máximo por nombre (y por categoría). """
+    ext = 'json'
+
+    def __init__(self):
+        self.stats = {}
+        self.t0 = time.perf_counter()
+
+    def add(self, name: str, dt: float):
+        s = self.stats.get(name)
+        if s is None:
+            s = self.stats[name] = [0, 0.0, 0.0]
+        s[0] += 1
+        s[1] += dt
+        if dt > s[2]:
+            s[2] = dt
+
+    def wrap(self, name: str, fn):
+        add = self.add
+        perf = time.perf_counter
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = perf()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                add(name, perf() - t0)
+        timed.__wrapped_by_profiling__ = True
+        return timed
+
+    def report(self) -> dict:
+        by_cat = {}
+        for name, (n, total, _) in self.stats.items():
+            cat = name.split(':', 1)[0]
+            c = by_cat.setdefault(cat, {'calls': 0, 'total_s': 0.0})
+            c['calls'] += n
+            c['total_s'] += total
+        return {
+            'wall_s': time.perf_counter() - self.t0,
+            'categories': by_cat,
+            'timers': {name: {'calls': n, 'total_s': total, 'mean_s': total / n, 'max_s': mx}
+                       for name, (n, total, mx) in sorted(self.stats.items(),
+                                                          key=lambda kv: -kv[1][1])},
+        }
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+def _category(name: str):
+    for cat, prefixes in _CATEGORIES:
+        if name.startswith(prefixes):
+            return cat
+    return None
+
+def _in_project(path) -> bool:
+    return bool(path) and os.path.dirname(os.path.abspath(path)) == _ROOT
+
+class _Instrumenter:
+    """
+    Envuelve con Timers las funciones de cinemática y dibujo (según _CATEGORIES)
+    definidas en el script o en los módulos del proyecto, en todos los espacios de
+    nombres donde estén ligadas (también las copias de 'from x import f' y los
+    registros tipo MODELS = {'2r': dict(ik=_ik_2r, ...)}), y plt.pause/plt.show.
+    Cada función se envuelve una sola vez.
+    """
+
+    def __init__(self, timers: Timers, script: str):
+        self.timers = timers
+        self.script = script
+        self.owners = {script}
+        self.memo = {}     # id(función original) -> envoltura
+
+    def _wrapper(self, obj):
+        w = self.memo.get(id(obj))
+        if w is not None or getattr(obj, '__module__', None) not in self.owners:
+            return w
+        name = getattr(obj, '__name__', '')
+        cat = _category(name)
+        if cat is None:
+            return None
+        label = name if obj.__module__ == self.script else f"{obj.__module__}.{name}"
+        w = self.memo[id(obj)] = self.timers.wrap(f"{cat}:{label}", obj)
+        return w
+
+    def namespace(self, ns: dict):
+        for name, obj in list(ns.items()):
+            if callable(obj) and not isinstance(obj, type) \
+                    and not getattr(obj, '__wrapped_by_profiling__', False):
+                w = self._wrapper(obj)
+                if w is not None:
+                    ns[name] = w
+        for name, obj in list(ns.items()):
+            if isinstance(obj, dict) and not name.startswith('__'):
+                for entry in list(obj.values()) + [obj]:
+                    if isinstance(entry, dict):
+                        for k, v in list(entry.items()):
+                            w = self.memo.get(id(v))
+                            if w is not None:
+                                entry[k] = w
+
+    def module(self, mod):
+        if getattr(mod, '__name__', None) == 'matplotlib.pyplot':
+            for fn in ('pause', 'show'):
+                if not getattr(getattr(mod, fn), '__wrapped_by_profiling__', False):
+                    setattr(mod, fn, self.timers.wrap(f'pause:plt.{fn}', getattr(mod, fn)))
+            return
+        self.owners.add(mod.__name__)
+        self.namespace(vars(mod))
+
+class _ImportHook(importlib.abc.MetaPathFinder):
+    """ Instrumenta los módulos del proyecto (y matplotlib.pyplot) importados después de instalar. """
+
+    def __init__(self, inst: _Instrumenter):
+        self.inst = inst
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != 'matplotlib.pyplot' and '.' in fullname:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not hasattr(spec.loader, 'exec_module'):
+            return None
+        if fullname != 'matplotlib.pyplot' and not _in_project(spec.origin):
+            return None
+        exec_module = spec.loader.exec_module
+
+        def exec_and_instrument(module):
+            exec_module(module)
+            self.inst.module(module)
+        spec.loader.exec_module = exec_and_instrument
+        return spec
+
+def instrument(namespace: dict, timers: Timers, modules=None):
+    """
+    Envuelve las funciones de cinemática y dibujo del script y de los módulos dados
+    (por defecto, los módulos del proyecto ya importados; los que se importen después
+    se instrumentan al cargarse), y plt.pause/plt.show si pyplot está o llega a estar
+    importado. modules: nombres o módulos; los nombres se importan si hace falta.
+    """
+    inst = _Instrumenter(timers, namespace.get('__name__', '__main__'))
+    if modules is None:
+        mods = [m for n, m in list(sys.modules.items())
+                if n != inst.script and _in_project(getattr(m, '__file__', None))]
+    else:
+        mods = [importlib.import_module(m) if isinstance(m, str) else m for m in modules]
+    inst.owners.update(m.__name__ for m in mods)
+    for m in mods:
+        inst.namespace(vars(m))
+    inst.namespace(namespace)
+    if 'matplotlib.pyplot' in sys.modules:
+        inst.module(sys.modules['matplotlib.pyplot'])
+    sys.meta_path.insert(0, _ImportHook(inst))
+    return inst
+
+# ------------------ Instalación ------------------
+
+def install(mode: str, namespace: dict | None = None, out: str | None = None,
+            interval_ms: float = 5.0, modules=None):
+    """
+    Activa el perfilador 'mode' y registra el volcado al salir. Devuelve el perfilador.
+    modules: módulos a instrumentar en modo 'timers' (ver instrument).
+    """
+    global _active
+    if _active is not None:
+        return _active
+    mode = mode.strip().lower()
+    if mode in ('cprofile', 'profile', 'deterministic'):
+        prof = _CProfile()
+    elif mode in ('sample', 'sampling'):
+        prof = _Sampler(max(interval_ms, 0.1) / 1000.0)
+    elif mode in ('timers', 'timer'):
+        prof = Timers()
+        if namespace is not None:
+            instrument(namespace, prof, modules)
+    else:
+        sys.stderr.write(f"[profiling] modo desconocido '{mode}', perfilado desactivado.\n")
+        return None
+
+    global _active_pid, _active_path
+    path = out or _default_out(prof.ext)
+    atexit.register(_dumper(prof, mode, path))
+    _active, _active_pid, _active_path = prof, os.getpid(), path
+    return prof
+
+def _dumper(prof, mode: str, path: str):
+    def _dump():
+        try:
+            prof.dump(path)
+            sys.stderr.write(f"[profiling] {mode} -> {path}\n")
+        except Exception as e:
+            sys.stderr.write(f"[profiling] no se pudo escribir {path}: {e}\n")
+    return _dump
+
+def install_worker(namespace: dict | None = None):
+    """
+    Para el initializer de procesos hijo (ProcessPoolExecutor): en modo 'timers'
+    cada worker acumula sus propios temporizadores y los vuelca al terminar en
+    <salida>.worker<pid>.json (atexit no corre en los hijos de multiprocessing).
+    """
+    global _active, _active_pid
+    mode = (os.environ.get(ENV) or '').strip().lower()
+    if mode not in ('timers', 'timer') or _active_pid == os.getpid():
+        return _active
+    if isinstance(_active, Timers):
+        # Copia heredada por fork (ya con las funciones envueltas): empezar de cero
+        prof = _active
+        prof.stats, prof.t0 = {}, time.perf_counter()
+    else:
+        prof = Timers()
+        instrument(namespace or {}, prof)
+    base = _active_path or os.environ.get(ENV + '_OUT') or _default_out(prof.ext)
+    root, ext = os.path.splitext(base)
+    path = f"{root}.worker{os.getpid()}{ext or '.json'}"
+    from multiprocessing import util
+    util.Finalize(None, _dumper(prof, mode, path), exitpriority=0)
+    _active, _active_pid = prof, os.getpid()
+    return prof
+
+def install_from_env(namespace: dict | None = None, modules=None):
+    """ Lee ROBOT_PROFILE; si no está definida no hace nada (costo cero). """
+    mode = os.environ.get(ENV)
+    if not mode:
+        return None
+    names = [m.strip() for m in os.environ.get(ENV + '_MODULES', '').split(',') if m.strip()]
+    return install(mode, namespace,
+                   out=os.environ.get(ENV + '_OUT') or None,
+                   interval_ms=float(os.environ.get(ENV + '_INTERVAL', '5')),
+                   modules=names or modules)
@@ -0,0 +1,161 @@
+#   IK cartesiana con resolución de redundancia para el brazo inclinado de
+#   Examen_parcial_1: q = (t1, t2, t3, phi_y) -> posición del efector (3 GDL).
+#
+#   Sobra un grado de libertad; se usa el espacio nulo de J para un objetivo
+#   secundario sin alterar la posición:
+#       Δq = J⁺ (k e) + (I - J⁺ J) α ∇H(q),     J⁺ = Jᵀ (J Jᵀ + λ² I)⁻¹
+#   H = 'limits'          : lejanía a los límites articulares (centro del rango),
+#       'manipulability'  : √det(J Jᵀ) (lejos de singularidades).
+#
+#   Jacobiano analítico y todo por lotes: solve() resuelve M puntos a la vez;
+#   track() recorre una trayectoria por bloques de frames, cada bloque sembrado
+#   con la solución del bloque anterior (arranque en caliente), de modo que la
+#   rama elegida se mantiene continua a lo largo del camino.
+
+from dataclasses import dataclass
+import numpy as np
+
+from Examen_parcial_1 import forward_tip_batch, l1, l2, l3
+
+LIMITS = ((-180.0, 180.0), (-150.0, 150.0), (-150.0, 150.0), (-90.0, 90.0))
+_K = np.pi / 180.0
+
+@dataclass
+class TrackResult:
+    q: np.ndarray        # (T, 4) grados
+    err: np.ndarray      # (T,) error de posición
+    iters: np.ndarray    # (T,) iteraciones por frame
+
+# ------------------ Cinemática ------------------
+
+def fk(Q, lengths=(l1, l2, l3)):
+    Q = np.asarray(Q, dtype=float)
+    return forward_tip_batch(Q[..., 0], Q[..., 1], Q[..., 2], *lengths, Q[..., 3])
+
+def jacobian(Q, lengths=(l1, l2, l3)):
+    """ J (..., 3, 4) de la posición del efector respecto a q en grados. """
+    Q = np.asarray(Q, dtype=float)
+    L1, L2, L3 = lengths
+    a1 = np.radians(Q[..., 0]); a12 = a1 + np.radians(Q[..., 1]); a123 = a12 + np.radians(Q[..., 2])
+    s1, s12, s123 = np.sin(a1), np.sin(a12), np.sin(a123)
+    c1, c12, c123 = np.cos(a1), np.cos(a12), np.cos(a123)
+    # Derivadas de (x, y) del plano del brazo respecto a t1, t2, t3
+    dx = -np.stack([L1*s1 + L2*s12 + L3*s123, L2*s12 + L3*s123, L3*s123], axis=-1) * _K
+    dy = np.stack([L1*c1 + L2*c12 + L3*c123, L2*c12 + L3*c123, L3*c123], axis=-1) * _K
+    x = L1*c1 + L2*c12 + L3*c123
+    ph = np.radians(Q[..., 3])
+    c, s = np.cos(ph)[..., None], np.sin(ph)[..., None]
+    J = np.zeros(Q.shape[:-1] + (3, 4))
+    J[..., 0, :3] = c * dx
+    J[..., 1, :3] = dy
+    J[..., 2, :3] = -s * dx
+    J[..., 0, 3] = -np.sin(ph) * x * _K
+    J[..., 2, 3] = -np.cos(ph) * x * _K
+    return J
+
+# ------------------ Objetivos secundarios ------------------
+
+def _grad_limits(Q, lower, upper, lengths):
+    """ ∇H con H = -½ Σ ((q - centro) / semirrango)². """
+    mid = 0.5 * (lower + upper)
+    half = 0.5 * (upper - lower)
+    return -(Q - mid) / half**2
+
+def manipulability(Q, lengths=(l1, l2, l3)):
+    J = jacobian(Q, lengths)
+    return np.sqrt(np.maximum(np.linalg.det(J @ np.swapaxes(J, -1, -2)), 0.0))
+
+def _grad_manip(Q, lower, upper, lengths, h: float = 1e-3):
+    """ ∇H con H = log √det(J Jᵀ) (diferencias centrales). """
+    E = np.eye(Q.shape[-1]) * h
+    wp = manipulability(Q[:, None, :] + E, lengths)
+    wm = manipulability(Q[:, None, :] - E, lengths)
+    return (np.log(np.maximum(wp, 1e-12)) - np.log(np.maximum(wm, 1e-12))) / (2.0 * h)
+
+OBJECTIVES = {'limits': _grad_limits, 'manipulability': _grad_manip}
+NULL_GAIN = {'limits': 2000.0, 'manipulability': 500.0}      # α por defecto [grados²]
+
+# ------------------ Solver ------------------
+
+def solve(targets, Q0, objective: str = 'limits', lengths=(l1, l2, l3), limits=LIMITS,
+          tol: float = 1e-4, max_iters: int = 50, damping: float = 0.02,
+          null_gain: float | None = None, max_step: float = 10.0, max_null_step: float = 2.0,
+          null_iters: int = 1):
+    """
+    M objetivos (M, 3) desde M semillas (M, 4), todos a la vez.
+    Las primeras null_iters iteraciones de cada fila suman el paso en el espacio
+    nulo (α = null_gain en grados², acotado a max_null_step grados); después solo
+    se corrige la posición hasta tol. Con track() el objetivo secundario se
+    acumula frame a frame.
+    Devuelve (Q, err, iters).
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective debe ser uno de {sorted(OBJECTIVES)}.")
+    grad = OBJECTIVES[objective]
+    null_gain = NULL_GAIN[objective] if null_gain is None else null_gain
+    lim = np.asarray(limits, dtype=float)
+    lower, upper = lim[:, 0], lim[:, 1]
+    X = np.atleast_2d(np.asarray(targets, dtype=float))
+    Q = np.array(np.broadcast_to(Q0, (len(X), 4)), dtype=float)
+    iters = np.zeros(len(X), dtype=np.int64)
+    err = np.linalg.norm(X - fk(Q, lengths), axis=1)
+    active = np.flatnonzero((err >= tol) | (null_iters > 0))
+    I4 = np.eye(4)
+    for _ in range(max_iters):
+        if len(active) == 0:
+            break
+        Qa = Q[active]
+        e = X[active] - fk(Qa, lengths)
+        J = jacobian(Qa, lengths)
+        Jt = np.swapaxes(J, 1, 2)
+        JJt = J @ Jt
+        lam2 = damping**2 * np.trace(JJt, axis1=1, axis2=2) / 3.0
+        Jp = Jt @ np.linalg.inv(JJt + lam2[:, None, None] * np.eye(3))     # (B, 4, 3)
+        dq = (Jp @ e[..., None])[..., 0]
+        sec = iters[active] < null_iters
+        if sec.any() and null_gain:
+            g = null_gain * grad(Qa[sec], lower, upper, lengths)
+            dn = ((I4 - Jp[sec] @ J[sec]) @ g[..., None])[..., 0]
+            big = np.abs(dn).max(axis=1, keepdims=True)
+            dq[sec] += dn * np.minimum(1.0, max_null_step / np.maximum(big, 1e-12))
+        big = np.abs(dq).max(axis=1, keepdims=True)
+        dq *= np.minimum(1.0, max_step / np.maximum(big, 1e-12))
+        Q[active] = np.clip(Qa + dq, lower, upper)
+        iters[active] += 1
+        err[active] = np.linalg.norm(X[active] - fk(Q[active], lengths), axis=1)
+        active = active[(err[active] >= tol) | (iters[active] < null_iters)]
+    return Q, err, iters
+
+def track(path, q0=(0.0, 0.0, 0.0, 0.0), block: int = 16, **kwargs) -> TrackResult:
+    """
+    Sigue una trayectoria cartesiana (T, 3). Los frames se resuelven por bloques
+    de block puntos (en lote); cada bloque arranca desde la última solución del
+    anterior. block=1 da el seguimiento frame a frame para uso interactivo.
+    """
+    P = np.atleast_2d(np.asarray(path, dtype=float))
+    T = len(P)
+    out_q = np.empty((T, 4)); out_e = np.empty(T); out_i = np.empty(T, dtype=np.int64)
+    q = np.asarray(q0, dtype=float)
+    for s in range(0, T, block):
+        sl = slice(s, min(s + block, T))
+        Q, e, it = solve(P[sl], q, **kwargs)
+        out_q[sl], out_e[sl], out_i[sl] = Q, e, it
+        q = Q[-1]
+    return TrackResult(out_q, out_e, out_i)
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    import time
+
+    # Círculo inclinado dentro del alcance, 1000 frames
+    a = np.linspace(0.0, 2.0 * np.pi, 1000)
+    path = np.column_stack([10.0 + 3.0 * np.cos(a), 4.0 * np.sin(a), -3.0 + 2.0 * np.sin(a)])
+    q0 = (20.0, 30.0, 20.0, 10.0)
+    for obj in OBJECTIVES:
+        t0 = time.perf_counter()
+        res = track(path, q0, objective=obj)
+        dt = time.perf_counter() - t0
+        w = manipulability(res.q)
+        print(f"{obj:15s}: error máx {res.err.max():.2e}, iteraciones medias {res.iters.mean():.1f}, "
+              f"manipulabilidad mín {w.min():.4f}, {dt * 1e3:.0f} ms ({len(path)} frames)")
@@ -0,0 +1,205 @@
+#   Re-temporización de trayectorias articulares con límites de velocidad y
+#   aceleración por articulación.
+#
+#   - trapezoidal(): movimiento punto a punto (línea recta en espacio articular)
+#     con perfil trapezoidal sincronizado; vectorizado sobre un lote de movimientos.
+#   - time_optimal(): cualquier ruta precalculada (N, n) -> perfil de tiempo mínimo
+#     a lo largo de la ruta (integración en el plano de fase s, ṡ²), con pasada
+#     hacia adelante y hacia atrás. Cada paso es vectorizado sobre las articulaciones.
+#
+#   Ambos devuelven un Timing con frames re-muestreados a una frecuencia de control
+#   fija (rate_hz), listos para animar o enviar a los actuadores.
+#   Unidades: ángulos en grados (o mm para prismáticas), velocidades en u/s,
+#   aceleraciones en u/s².
+
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Timing:
+    t: np.ndarray         # (K,) tiempos de cada frame [s]
+    q: np.ndarray         # (K, n) posiciones articulares
+    qd: np.ndarray        # (K, n) velocidades articulares
+    duration: float       # duración total [s]
+
+def _limits(vmax, amax, n: int):
+    vmax = np.broadcast_to(np.asarray(vmax, dtype=float), (n,))
+    amax = np.broadcast_to(np.asarray(amax, dtype=float), (n,))
+    if np.any(vmax <= 0) or np.any(amax <= 0):
+        raise ValueError("Los límites de velocidad y aceleración deben ser positivos.")
+    return vmax, amax
+
+# ------------------ Punto a punto (trapezoidal) ------------------
+
+def trapezoid_duration(dist, vmax, amax):
+    """ Duración mínima de un trapecio (o triángulo) para recorrer dist (vectorizado). """
+    dist = np.abs(np.asarray(dist, dtype=float))
+    vmax = np.asarray(vmax, dtype=float); amax = np.asarray(amax, dtype=float)
+    full = dist >= vmax * vmax / amax
+    return np.where(full, dist / vmax + vmax / amax, 2.0 * np.sqrt(dist / amax))
+
+def _trapezoid_s(t, T, V, A):
+    """ Posición normalizada s(t) en [0, 1] y su derivada para un trapecio de pico V y aceleración A. """
+    ta = np.minimum(V / A, T / 2.0)
+    v = A * ta                                   # velocidad pico real
+    s = np.where(t < ta, 0.5 * A * t * t,
+        np.where(t <= T - ta, 0.5 * A * ta * ta + v * (t - ta),
+                 1.0 - 0.5 * A * (T - t) ** 2))
+    sd = np.where(t < ta, A * t, np.where(t <= T - ta, v, A * (T - t)))
+    return np.clip(s, 0.0, 1.0), np.maximum(sd, 0.0)
+
+def trapezoidal_batch(q0, q1, vmax, amax):
+    """
+    Duración mínima de M movimientos punto a punto con todas las articulaciones
+    sincronizadas (misma forma de perfil). q0, q1: (M, n). Devuelve (T, V, A)
+    del parámetro normalizado s en [0, 1], cada uno de forma (M,).
+    """
+    q0 = np.atleast_2d(np.asarray(q0, dtype=float))
+    q1 = np.atleast_2d(np.asarray(q1, dtype=float))
+    vmax, amax = _limits(vmax, amax, q0.shape[-1])
+    d = np.abs(q1 - q0)
+    with np.errstate(divide='ignore'):
+        V = np.min(np.where(d > 0, vmax / d, np.inf), axis=-1)
+        A = np.min(np.where(d > 0, amax / d, np.inf), axis=-1)
+    still = ~np.isfinite(V)
+    V = np.where(still, 1.0, V); A = np.where(still, 1.0, A)
+    T = np.where(still, 0.0, trapezoid_duration(1.0, V, A))
+    return T, V, A
+
+def trapezoidal(q0, q1, vmax, amax, rate_hz: float = 100.0) -> Timing:
+    """ Movimiento punto a punto de tiempo mínimo, re-muestreado a rate_hz. """
+    q0 = np.asarray(q0, dtype=float)
+    q1 = np.asarray(q1, dtype=float)
+    T, V, A = (float(v[0]) for v in trapezoidal_batch(q0, q1, vmax, amax))
+    t = _sample_times(T, rate_hz)
+    s, sd = _trapezoid_s(t, T, V, A) if T > 0 else (np.ones_like(t), np.zeros_like(t))
+    dq = q1 - q0
+    return Timing(t, q0 + s[:, None] * dq, sd[:, None] * dq, T)
+
+def _sample_times(T: float, rate_hz: float):
+    if rate_hz <= 0:
+        raise ValueError("rate_hz debe ser positivo.")
+    k = int(np.floor(T * rate_hz + 1e-9))
+    t = np.arange(k + 1) / rate_hz
+    if T - t[-1] > 1e-9:
+        t = np.append(t, T)        # el último frame cae exactamente en la meta
+    return t
+
+# ------------------ Ruta arbitraria (tiempo mínimo) ------------------
+
+def _max_velocity_curve(dq, ddq, amax):
+    """
+    Cota superior de x = ṡ² impuesta por la aceleración en cada punto:
+    debe existir u con -a <= q' u + q'' x <= a para todas las articulaciones.
+    dq, ddq: (N, n). Devuelve (N,).
+    """
+    N, n = dq.shape
+    xmax = np.full(N, np.inf)
+    # Articulaciones con q' = 0: |q''| x <= a
+    z = np.abs(dq) < 1e-12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lim = np.where(z & (np.abs(ddq) > 1e-12), amax / np.abs(ddq), np.inf)
+    xmax = np.minimum(xmax, lim.min(axis=1))
+    # Pares (j, k) con q' != 0: cota inferior de u por j <= cota superior de u por k
+    #   u_lo_j = (-a_j sgn - q''_j x)/q'_j ,  u_hi_k = (a_k sgn - q''_k x)/q'_k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sgn = np.sign(dq)
+        inv = np.where(z, 0.0, 1.0 / np.where(z, 1.0, dq))
+        c_lo = -amax * sgn * inv          # término constante de u_lo (por a/|q'|)
+        m = -ddq * inv                    # pendiente en x (igual para u_lo y u_hi)
+        # u_lo_j(x) = -a_j/|q'_j| + m_j x ;  u_hi_k(x) = a_k/|q'_k| + m_k x
+        a_j = -c_lo[:, :, None]           # a_j/|q'_j| >= 0
+        a_k = -c_lo[:, None, :]
+        m_j = m[:, :, None]; m_k = m[:, None, :]
+        # -a_j + m_j x <= a_k + m_k x  <=>  (m_j - m_k) x <= a_j + a_k
+        slope = m_j - m_k
+        bound = np.where(slope > 1e-12, (a_j + a_k) / slope, np.inf)
+        valid = ~(z[:, :, None] | z[:, None, :])
+        bound = np.where(valid, bound, np.inf)
+    return np.minimum(xmax, bound.reshape(N, -1).min(axis=1))
+
+def _u_range(dq, ddq, x, amax):
+    """ Intervalo [u_lo, u_hi] de ṡ̈ admisible en un punto con ṡ² = x. """
+    z = np.abs(dq) < 1e-12
+    safe = np.where(z, 1.0, dq)
+    a = (amax - ddq * x) / safe
+    b = (-amax - ddq * x) / safe
+    lo = np.where(z, -np.inf, np.minimum(a, b))
+    hi = np.where(z, np.inf, np.maximum(a, b))
+    return lo.max(), hi.min()
+
+def time_optimal(path, vmax, amax, rate_hz: float = 100.0) -> Timing:
+    """
+    Perfil de tiempo mínimo a lo largo de una ruta articular (N, n), en reposo al
+    inicio y al final. La ruta se parametriza por longitud de arco s (puntos
+    repetidos se descartan); q'(s) y q''(s) salen de diferencias finitas.
+    """
+    path = np.asarray(path, dtype=float)
+    if path.ndim != 2 or len(path) < 2:
+        raise ValueError("La ruta debe ser un arreglo (N, n) con N >= 2.")
+    vmax, amax = _limits(vmax, amax, path.shape[1])
+
+    keep = np.ones(len(path), dtype=bool)
+    keep[1:] = np.any(np.abs(np.diff(path, axis=0)) > 1e-12, axis=1)
+    path = path[keep]
+    if len(path) < 2:
+        return Timing(np.zeros(1), path[:1], np.zeros_like(path[:1]), 0.0)
+
+    ds = np.linalg.norm(np.diff(path, axis=0), axis=1)
+    s = np.concatenate([[0.0], np.cumsum(ds)])
+    dq = np.gradient(path, s, axis=0, edge_order=1)
+    ddq = np.gradient(dq, s, axis=0, edge_order=1)
+
+    # Cota por velocidad: |q'_j| ṡ <= v_j  y cota por aceleración (curva MVC)
+    with np.errstate(divide='ignore'):
+        xv = np.min(np.where(np.abs(dq) > 1e-12, (vmax / np.abs(dq)) ** 2, np.inf), axis=1)
+    xlim = np.minimum(xv, _max_velocity_curve(dq, ddq, amax))
+    xlim[0] = xlim[-1] = 0.0
+
+    # Pasada hacia adelante (máxima aceleración) y hacia atrás (máxima frenada)
+    N = len(s)
+    x = xlim.copy()
+    for i in range(N - 1):
+        _, hi = _u_range(dq[i], ddq[i], x[i], amax)
+        x[i + 1] = min(x[i + 1], max(x[i] + 2.0 * hi * ds[i], 0.0))
+    for i in range(N - 1, 0, -1):
+        lo, _ = _u_range(dq[i], ddq[i], x[i], amax)
+        x[i - 1] = min(x[i - 1], max(x[i] - 2.0 * lo * ds[i - 1], 0.0))
+
+    sd = np.sqrt(np.maximum(x, 0.0))
+    dt = 2.0 * ds / np.maximum(sd[:-1] + sd[1:], 1e-12)
+    tk = np.concatenate([[0.0], np.cumsum(dt)])
+    T = float(tk[-1])
+
+    # Re-muestreo: dentro de cada tramo la aceleración ṡ̈ es constante
+    t = _sample_times(T, rate_hz)
+    i = np.clip(np.searchsorted(tk, t, side='right') - 1, 0, N - 2)
+    tau = t - tk[i]
+    u = (sd[i + 1] - sd[i]) / np.maximum(dt[i], 1e-12)
+    s_t = np.minimum(s[i] + sd[i] * tau + 0.5 * u * tau * tau, s[i + 1])
+    sd_t = sd[i] + u * tau
+    q = np.column_stack([np.interp(s_t, s, path[:, j]) for j in range(path.shape[1])])
+    qd = np.column_stack([np.interp(s_t, s, dq[:, j]) for j in range(path.shape[1])]) * sd_t[:, None]
+    return Timing(t, q, qd, T)
+
+def retime(path, vmax, amax, rate_hz: float = 100.0) -> Timing:
+    """ Ruta de 2 puntos => trapecio exacto; si no, perfil de tiempo mínimo sobre la ruta. """
+    path = np.asarray(path, dtype=float)
+    if len(path) == 2:
+        return trapezoidal(path[0], path[1], vmax, amax, rate_hz)
+    return time_optimal(path, vmax, amax, rate_hz)
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    from Robot_planar_tarea_1 import ik_2r_batch
+
+    L1, L2 = 5.0, 4.0
+    # Recta cartesiana de 150 puntos (como animate_once) re-temporizada a 100 Hz
+    xs = np.linspace(L1 + L2, 2.0, 150)
+    ys = np.linspace(0.0, 6.0, 150)
+    _, th1, th2 = ik_2r_batch(L1, L2, xs, ys, "arriba")
+    tim = time_optimal(np.column_stack([th1, th2]), vmax=(90.0, 120.0), amax=(300.0, 400.0))
+    print(f"Tiempo de ciclo: {tim.duration:.3f} s ({len(tim.t)} frames a 100 Hz, "
+          f"antes 150 frames a intervalo fijo)")
+    print(f"|qd| máx por articulación: {np.abs(tim.qd).max(axis=0).round(1)} grados/s")
@@ -0,0 +1,210 @@
+#   Movimiento de tornillo (screw motion) en SE(3)
+#   exp/log vectorizados + interpolación de N poses en una sola llamada.
+#
+#   Convención del twist: xi = (w, v)  (w en radianes, v en unidades de longitud)
+
+import numpy as np
+
+# ------------------ Utilidades ------------------
+
+def sind(t): return np.sin(np.deg2rad(t))
+def cosd(t): return np.cos(np.deg2rad(t))
+
+def RotX(t):
+    c, s = cosd(t), sind(t)
+    return np.array([[1, 0, 0],
+                     [0, c,-s],
+                     [0, s, c]])
+
+def RotY(t):
+    c, s = cosd(t), sind(t)
+    return np.array([[ c, 0, s],
+                     [ 0, 1, 0],
+                     [-s, 0, c]])
+
+def RotZ(t):
+    c, s = cosd(t), sind(t)
+    return np.array([[ c,-s, 0],
+                     [ s, c, 0],
+                     [ 0, 0, 1]])
+
+# --- Matriz homogénea 4x4 (acepta pilas (..., 3, 3) y (..., 3)) ---
+def build_SE3(R=np.eye(3), t=(0,0,0)):
+    R = np.asarray(R, dtype=float)
+    t = np.asarray(t, dtype=float)
+    if R.ndim == 2 and t.ndim <= 1:
+        T = np.eye(4)
+        T[:3,:3] = R
+        T[:3, 3] = t.ravel()
+        return T
+    shape = np.broadcast_shapes(R.shape[:-2], t.shape[:-1])
+    T = np.zeros(shape + (4, 4))
+    T[..., :3, :3] = R
+    T[..., :3, 3] = t
+    T[..., 3, 3] = 1.0
+    return T
+
+# --- Aplicar T a puntos: (M,3) con T (4,4) -> (M,3); con T (N,4,4) -> (N,M,3) ---
+def apply_SE3(points, T):
+    points = np.asarray(points, dtype=float)
+    T = np.asarray(T, dtype=float)
+    R = T[..., :3, :3]
+    t = T[..., None, :3, 3]
+    return np.einsum('...ij,mj->...mi', R, points) + t
+
+def inv_SE3(T):
+    T = np.asarray(T, dtype=float)
+    Rt = np.swapaxes(T[..., :3, :3], -1, -2)
+    t = -np.einsum('...ij,...j->...i', Rt, T[..., :3, 3])
+    return build_SE3(Rt, t)
+
+def skew(w):
+    w = np.asarray(w, dtype=float)
+    W = np.zeros(w.shape[:-1] + (3, 3))
+    W[..., 0, 1], W[..., 0, 2] = -w[..., 2],  w[..., 1]
+    W[..., 1, 0], W[..., 1, 2] =  w[..., 2], -w[..., 0]
+    W[..., 2, 0], W[..., 2, 1] = -w[..., 1],  w[..., 0]
+    return W
+
+# ------------------ exp / log ------------------
+
+_SMALL = 1e-6
+_SERIES = 1e-2      # por debajo, Taylor para C y D (las fórmulas cerradas se cancelan)
+
+def _coefs(th):
+    """ A = sin(th)/th, B = (1-cos th)/th^2, C = (th - sin th)/th^3 (con Taylor cerca de 0). """
+    th2 = th * th
+    small = th < _SMALL
+    series = th < _SERIES
+    ths = np.where(small, 1.0, th)
+    A = np.where(small, 1.0 - th2/6.0,   np.sin(ths) / ths)
+    # 1 - cos th = 2 sin^2(th/2): sin cancelación para th pequeño
+    B = np.where(small, 0.5 - th2/24.0,  0.5 * (np.sin(0.5*ths) / (0.5*ths))**2)
+    C = np.where(series, 1/6 - th2/120.0 + th2*th2/5040.0,
+                 (ths - np.sin(ths)) / (ths*ths*ths))
+    return A, B, C
+
+def exp_SE3(xi):
+    """
+    Mapa exponencial: twist(s) (..., 6) = (w, v) -> T (..., 4, 4).
+    Rodrigues para R y matriz V para la traslación.
+    """
+    xi = np.asarray(xi, dtype=float)
+    w, v = xi[..., :3], xi[..., 3:]
+    th = np.linalg.norm(w, axis=-1)
+    A, B, C = _coefs(th)
+    W = skew(w)
+    W2 = W @ W
+    I = np.eye(3)
+    R = I + A[..., None, None]*W + B[..., None, None]*W2
+    V = I + B[..., None, None]*W + C[..., None, None]*W2
+    t = np.einsum('...ij,...j->...i', V, v)
+    return build_SE3(R, t)
+
+def log_SO3(R):
+    """ Logaritmo de SO(3): R (..., 3, 3) -> w (..., 3), con |w| en [0, pi]. """
+    R = np.asarray(R, dtype=float)
+    tr = np.trace(R, axis1=-2, axis2=-1)
+    vee = np.stack([R[..., 2, 1] - R[..., 1, 2],
+                    R[..., 0, 2] - R[..., 2, 0],
+                    R[..., 1, 0] - R[..., 0, 1]], axis=-1)
+    # atan2 en lugar de arccos: arccos pierde precisión cerca de 0 y de pi
+    cos_th = (tr - 1.0) / 2.0
+    th = np.arctan2(np.linalg.norm(vee, axis=-1) / 2.0, cos_th)
+
+    # Caso general y caso th -> 0: w = th / (2 sin th) * vee
+    sin_th = np.sin(th)
+    small = th < _SMALL
+    f = np.where(small, 0.5 + th*th/12.0, th / (2.0*np.where(small, 1.0, sin_th)))
+    w = f[..., None] * vee
+
+    # Caso th -> pi: eje desde la parte simétrica, (R + R^T)/2 = cos th I + (1 - cos th) k k^T
+    # (la columna de R completa arrastraría el término antisimétrico sin th [k]x)
+    near_pi = (np.pi - th) < 1e-3
+    if np.any(near_pi):
+        Rp = R[near_pi]
+        c = cos_th[near_pi][:, None, None]
+        M = (0.5 * (Rp + np.swapaxes(Rp, -1, -2)) - c * np.eye(3)) / (1.0 - c)
+        d = np.diagonal(M, axis1=-2, axis2=-1)
+        i = np.argmax(d, axis=-1)
+        col = np.take_along_axis(M, i[:, None, None], axis=-1)[..., 0]
+        k = col / np.sqrt(np.maximum(np.take_along_axis(d, i[:, None], axis=-1), 1e-12))
+        k /= np.linalg.norm(k, axis=-1, keepdims=True)
+        # Signo coherente con la parte antisimétrica (si no es despreciable)
+        sgn = np.sign(np.einsum('...i,...i->...', k, vee[near_pi]))
+        k = k * np.where(sgn == 0, 1.0, sgn)[:, None]
+        w[near_pi] = k * th[near_pi][:, None]
+    return w
+
+def log_SE3(T):
+    """ Logaritmo de SE(3): T (..., 4, 4) -> twist (..., 6) = (w, v). """
+    T = np.asarray(T, dtype=float)
+    w = log_SO3(T[..., :3, :3])
+    th = np.linalg.norm(w, axis=-1)
+    A, B, _ = _coefs(th)
+    series = th < _SERIES
+    ths = np.where(series, 1.0, th)
+    # V^-1 = I - W/2 + D W^2,  D = (1 - A/(2B)) / th^2
+    th2 = th * th
+    D = np.where(series, 1/12 + th2/720.0 + th2*th2/30240.0,
+                 (1.0 - A / (2.0*np.where(series, 1.0, B))) / (ths*ths))
+    W = skew(w)
+    Vinv = np.eye(3) - 0.5*W + D[..., None, None]*(W @ W)
+    v = np.einsum('...ij,...j->...i', Vinv, T[..., :3, 3])
+    return np.concatenate([w, v], axis=-1)
+
+# ------------------ Interpolación de tornillo ------------------
+
+def screw_interp(T0, T1, n):
+    """
+    Genera las n poses (n, 4, 4) del movimiento de tornillo a velocidad constante
+    entre T0 y T1 (ambas incluidas):  T(s) = T0 exp(s log(T0^-1 T1)),  s en [0, 1].
+    """
+    T0 = np.asarray(T0, dtype=float)
+    xi = log_SE3(inv_SE3(T0) @ np.asarray(T1, dtype=float))
+    s = np.linspace(0.0, 1.0, n) if n > 1 else np.ones(1)
+    return T0 @ exp_SE3(s[:, None] * xi)
+
+# ------------------ Demo: caja moviéndose en tornillo ------------------
+
+box_init = np.array([
+    [0,0,0],
+    [7,0,0],
+    [7,0,3],
+    [0,0,3],
+    [0,2,0],
+    [7,2,0],
+    [7,2,3],
+    [0,2,3]
+], dtype=float)
+
+def animate_box_screw(T_start, T_end, steps=120, pause_s=0.02, color='teal'):
+    import matplotlib.pyplot as plt
+
+    poses = screw_interp(T_start, T_end, steps)
+    boxes = apply_SE3(box_init, poses)          # (steps, 8, 3) de una vez
+    edges = [
+        (0,1),(1,2),(2,3),(3,0),
+        (4,5),(5,6),(6,7),(7,4),
+        (0,4),(1,5),(2,6),(3,7)
+    ]
+
+    fig, ax = plt.subplots(subplot_kw={'projection': '3d'})
+    for pts8 in boxes:
+        ax.cla()
+        ax.set_xlim3d(-5, 25); ax.set_ylim3d(-5, 25); ax.set_zlim3d(-5, 25)
+        ax.view_init(elev=30, azim=40)
+        ax.plot3D([0, 10], [0, 0], [0, 0], color='red',   linewidth=2)
+        ax.plot3D([0, 0], [0, 10], [0, 0], color='blue',  linewidth=2)
+        ax.plot3D([0, 0], [0, 0], [0, 10], color='green', linewidth=2)
+        for i, j in edges:
+            ax.plot3D(*zip(pts8[i], pts8[j]), color=color, linewidth=2.0)
+        plt.pause(pause_s)
+    plt.show()
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    T_a = build_SE3(np.eye(3), (0, 0, 0))
+    T_b = build_SE3(RotZ(90) @ RotX(40), (12, 8, 6))
+    animate_box_screw(T_a, T_b, steps=120, pause_s=0.02)
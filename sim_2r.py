@@ -0,0 +1,158 @@
+#   Simulador de dinámica directa del 2R de Robot_planar_tarea_1, por lotes.
+#
+#   Ecuaciones de movimiento (eslabones como barras, CM a lc_i del eje):
+#       M(q) q̈ + C(q, q̇) q̇ + G(q) + b q̇ = τ
+#   integradas con paso fijo (RK4 o Euler semi-implícito) sobre B condiciones
+#   iniciales y entradas de torque a la vez: cada paso es aritmética de arreglos
+#   (B, 2), con M⁻¹ 2x2 explícita.
+#
+#   Ángulos de entrada/salida en grados (como fk_2r_batch); torques en N·m.
+#   La gravedad actúa sobre -Y del plano del brazo (0 para el 2R acostado).
+
+from dataclasses import dataclass
+import numpy as np
+
+@dataclass
+class Arm2R:
+    L1: float
+    L2: float
+    m1: float
+    m2: float
+    lc1: float | None = None          # distancia al CM (por defecto L/2)
+    lc2: float | None = None
+    I1: float | None = None           # inercia sobre el CM (por defecto barra m L²/12)
+    I2: float | None = None
+    damping: tuple = (0.0, 0.0)       # fricción viscosa [N·m·s/rad]
+    g: float = 0.0                    # gravedad en -Y del plano [m/s²]
+
+    def __post_init__(self):
+        if self.L1 <= 0 or self.L2 <= 0:
+            raise ValueError("L1 y L2 deben ser positivos.")
+        self.lc1 = self.L1 / 2.0 if self.lc1 is None else self.lc1
+        self.lc2 = self.L2 / 2.0 if self.lc2 is None else self.lc2
+        self.I1 = self.m1 * self.L1**2 / 12.0 if self.I1 is None else self.I1
+        self.I2 = self.m2 * self.L2**2 / 12.0 if self.I2 is None else self.I2
+
+@dataclass
+class SimResult:
+    t: np.ndarray       # (T,)
+    q: np.ndarray       # (T, B, 2) grados
+    qd: np.ndarray      # (T, B, 2) grados/s
+    tau: np.ndarray     # (T, B, 2) torque aplicado en cada muestra
+
+    def thetas(self, i: int = 0):
+        """ Ángulos (T, 2) de la simulación i, listos para fk_2r_batch / traj_mmap. """
+        return self.q[:, i]
+
+# ------------------ Modelo ------------------
+
+def accel(arm: Arm2R, q, qd, tau):
+    """ q̈ (B, 2) en rad/s² para estados (B, 2) en rad, rad/s. """
+    c2 = np.cos(q[:, 1]); s2 = np.sin(q[:, 1])
+    h = arm.m2 * arm.L1 * arm.lc2
+    M11 = arm.I1 + arm.I2 + arm.m1*arm.lc1**2 + arm.m2*(arm.L1**2 + arm.lc2**2) + 2.0*h*c2
+    M12 = arm.I2 + arm.m2*arm.lc2**2 + h*c2
+    M22 = arm.I2 + arm.m2*arm.lc2**2
+    q1d, q2d = qd[:, 0], qd[:, 1]
+    r1 = tau[:, 0] + h*s2*(2.0*q1d*q2d + q2d*q2d) - arm.damping[0]*q1d
+    r2 = tau[:, 1] - h*s2*q1d*q1d - arm.damping[1]*q2d
+    if arm.g:
+        c1 = np.cos(q[:, 0]); c12 = np.cos(q[:, 0] + q[:, 1])
+        g2 = arm.m2*arm.lc2*arm.g*c12
+        r1 = r1 - (arm.m1*arm.lc1 + arm.m2*arm.L1)*arm.g*c1 - g2
+        r2 = r2 - g2
+    det = M11*M22 - M12*M12
+    return np.stack([(M22*r1 - M12*r2) / det, (M11*r2 - M12*r1) / det], axis=-1)
+
+# ------------------ Integración ------------------
+
+def _torque_fn(torque, B: int):
+    """ Normaliza la entrada: constante (2,)/(B,2), tabla (steps,B,2) o controlador f(t, q, qd). """
+    if callable(torque):
+        return lambda k, t, q, qd: np.broadcast_to(
+            np.asarray(torque(t, np.degrees(q), np.degrees(qd)), dtype=float), (B, 2))
+    tau = np.asarray(torque, dtype=float)
+    if tau.ndim == 3:
+        return lambda k, t, q, qd: tau[min(k, len(tau) - 1)]
+    tau = np.broadcast_to(tau, (B, 2))
+    return lambda k, t, q, qd: tau
+
+def simulate(arm: Arm2R, q0, qd0, torque, dt: float, steps: int,
+             method: str = "rk4", record_every: int = 1, batch: int | None = None) -> SimResult:
+    """
+    Integra B simulaciones en paralelo.
+    q0, qd0: (B, 2) o (2,) en grados y grados/s.
+    torque: constante, tabla por paso (steps, B, 2) o controlador f(t, q_deg, qd_deg) -> (B, 2);
+            el torque se mantiene constante durante cada paso (retención de orden cero).
+    method: 'rk4' o 'euler' (Euler semi-implícito: q̇ primero, luego q con la q̇ nueva).
+    batch: número de simulaciones si q0/qd0 son comunes y solo varían el torque o las ganancias.
+    """
+    if method not in ("rk4", "euler"):
+        raise ValueError("method debe ser 'rk4' o 'euler'.")
+    q = np.radians(np.atleast_2d(np.asarray(q0, dtype=float))).copy()
+    qd = np.radians(np.atleast_2d(np.asarray(qd0, dtype=float))).copy()
+    shape = np.broadcast_shapes(q.shape, qd.shape, (batch or 1, 2))
+    q, qd = np.broadcast_to(q, shape).copy(), np.broadcast_to(qd, shape).copy()
+    B = len(q)
+    tau_at = _torque_fn(torque, B)
+
+    T = steps // record_every + 1
+    out_q = np.empty((T, B, 2)); out_qd = np.empty((T, B, 2)); out_tau = np.empty((T, B, 2))
+    out_t = np.arange(T) * dt * record_every
+    tau = tau_at(0, 0.0, q, qd)
+    out_q[0], out_qd[0], out_tau[0] = q, qd, tau
+
+    for k in range(steps):
+        t = k * dt
+        tau = tau_at(k, t, q, qd)
+        if method == "rk4":
+            a1 = accel(arm, q, qd, tau)
+            a2 = accel(arm, q + 0.5*dt*qd, qd + 0.5*dt*a1, tau)
+            a3 = accel(arm, q + 0.5*dt*(qd + 0.5*dt*a1), qd + 0.5*dt*a2, tau)
+            a4 = accel(arm, q + dt*(qd + 0.5*dt*a2), qd + dt*a3, tau)
+            q = q + dt*qd + dt*dt/6.0*(a1 + a2 + a3)
+            qd = qd + dt/6.0*(a1 + 2.0*a2 + 2.0*a3 + a4)
+        else:
+            qd = qd + dt*accel(arm, q, qd, tau)
+            q = q + dt*qd
+        if (k + 1) % record_every == 0:
+            j = (k + 1) // record_every
+            out_q[j], out_qd[j], out_tau[j] = q, qd, tau
+
+    return SimResult(out_t, np.degrees(out_q), np.degrees(out_qd), out_tau)
+
+def pd_controller(q_ref, kp, kd, qd_ref=0.0):
+    """ Controlador PD articular por lotes (ganancias escalares, (2,) o (B, 2)), en N·m/grado. """
+    q_ref = np.asarray(q_ref, dtype=float)
+    kp = np.asarray(kp, dtype=float); kd = np.asarray(kd, dtype=float)
+    return lambda t, q, qd: kp*(q_ref - q) + kd*(qd_ref - qd)
+
+def save_run(result: SimResult, path: str, arm: Arm2R, i: int = 0):
+    """ Guarda la simulación i como .rtraj (traj_mmap.replay la reproduce). """
+    from traj_mmap import save_arm_trajectory
+    return save_arm_trajectory(path, "2r", arm.L1, arm.L2, result.thetas(i),
+                               dt=float(result.t[1] - result.t[0]) if len(result.t) > 1 else 0.0)
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    import time
+
+    # Barrido Monte Carlo de ganancias PD: 5000 simulaciones de 2 s a 1 kHz
+    arm = Arm2R(L1=0.5, L2=0.4, m1=3.0, m2=2.0, damping=(0.05, 0.05))
+    B = 5000
+    rng = np.random.default_rng(0)
+    kp = rng.uniform(0.05, 2.0, (B, 1)); kd = rng.uniform(0.001, 0.1, (B, 1))
+    ctrl = pd_controller(q_ref=(90.0, -45.0), kp=kp, kd=kd)
+    t0 = time.perf_counter()
+    res = simulate(arm, np.zeros(2), np.zeros(2), ctrl, dt=1e-3, steps=2000, record_every=20,
+                   batch=B)
+    wall = time.perf_counter() - t0
+    err = np.abs(res.q[-1] - (90.0, -45.0)).max(axis=1)
+    best = int(np.argmin(err + 1e-3 * np.abs(res.tau).max(axis=(0, 2))))
+    print(f"{B} simulaciones x 2000 pasos en {wall:.2f} s")
+    print(f"Mejor: kp={kp[best, 0]:.3f} kd={kd[best, 0]:.4f} error final={err[best]:.3f} grados")
+
+    save_run(res, "sim_2r_best.rtraj", arm, best)
+    from traj_mmap import replay
+    replay("sim_2r_best.rtraj", interval_ms=20)
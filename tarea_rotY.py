@@ -1,112 +1,123 @@
-# Import libraries and packages
-import matplotlib.pyplot as plt
-from mpl_toolkits import mplot3d
-import numpy as np
-
-# create the fig and ax objects to handle figure and axes of the fixed frame
-fig,ax = plt.subplots()
-
-# Use 3d view 
-ax = plt.axes(projection = "3d")
-
-
-
-def setaxis(x1, x2, y1, y2, z1, z2):
-    # this function is used to fix the view to the values of input arguments
-    # -----------------------------------------------------------------------
-    # ARGUMENTS
-    # x1, x2 -> numeric value
-    # y1, y2 -> numeric value
-    # y1, z2 -> numeric value
-    # -----------------------------------------------------------------------
-    ax.set_xlim3d(x1,x2)
-    ax.set_ylim3d(y1,y2)
-    ax.set_zlim3d(z1,z2)
-    ax.view_init(elev=30, azim=40)
-    ax.legend()
-
-
-def fix_system(axis_length):
-    # Fix system function 
-    # Plots a 3D centered at [x,y,z] = [0,0,0]
-    # -------------------------------------------------------------------
-    # Arguments 
-    # axis_length -> used to specify the length of the axis, in this case
-    #                all axes are of the same length
-    # -------------------------------------------------------------------
-    x = [0, axis_length]
-    y = [0, axis_length] 
-    z = [0, axis_length]
-    zp = [0, 0]
-    ax.plot3D(x, zp, zp, color='red')
-    ax.plot3D(zp, y, zp, color='blue')
-    ax.plot3D(zp, zp, z, color='green')
-    
-
-def sind(t):
-    # sind function
-    # Computes the sin() trigonometric function in degrees
-    # ----------------------------------------------------------------------
-    # Arguments
-    # t -> Numeric, angle in degrees. 
-    # ----------------------------------------------------------------------
-    res = np.sin(t*np.pi/180)
-    return res
-
-def cosd(t):
-    # sind function
-    # Computes the cos() trigonometric function in degrees
-    # ----------------------------------------------------------------------
-    # Arguments
-    # t -> Numeric, angle in degrees. 
-    # ----------------------------------------------------------------------
-    res = np.cos(t*np.pi/180)
-    return res
-
-
-def RotY(t):
-    Rz = np.array(([cosd(t),0,-sind(t)],[0,1,0],[sind(t),0,cosd(t)]))
-    return Rz
-
-def drawVector(v):
-    deltaX = [0, v[0]]
-    deltaY = [0, v[1]]
-    deltaZ = [0, v[2]]
-    ax.plot3D(deltaX, deltaY, deltaZ,color='orange')
-    #plt.draw()
-    #plt.pause(0.001)
-
-def rotate(t):
-    n = 0
-    while n < t: 
-        ax.cla()
-        # Set the view 
-        setaxis(0,5,0,5,0,5)
-
-        # plot the axis
-        fix_system(3)
-
-        # draw vector1
-        v1 = np.array([2,0,0])
-        drawVector(v1)
-
-        # draw vector2
-        v2 = RotY(n).dot(v1)
-        drawVector(v2)
-
-        n = n + 1
-        plt.draw()
-        plt.pause(0.001)
-
-
-
-
-
-rotate(70)
-
-
-# show image.
-plt.draw()
-plt.show()
-
-
+# Import libraries and packages
+import numpy as np
+
+# fig and ax objects are created on first draw (see init_figure), not at import
+fig = ax = None
+
+def init_figure():
+    # Creates the fig and ax objects (3d view) the first time they are needed
+    global fig, ax
+    if ax is None:
+        import matplotlib.pyplot as plt
+        fig = plt.figure()
+        ax = plt.axes(projection = "3d")
+    return fig, ax
+
+
+
+def setaxis(x1, x2, y1, y2, z1, z2):
+    # this function is used to fix the view to the values of input arguments
+    # -----------------------------------------------------------------------
+    # ARGUMENTS
+    # x1, x2 -> numeric value
+    # y1, y2 -> numeric value
+    # y1, z2 -> numeric value
+    # -----------------------------------------------------------------------
+    init_figure()
+    ax.set_xlim3d(x1,x2)
+    ax.set_ylim3d(y1,y2)
+    ax.set_zlim3d(z1,z2)
+    ax.view_init(elev=30, azim=40)
+    ax.legend()
+
+
+def fix_system(axis_length):
+    # Fix system function 
+    # Plots a 3D centered at [x,y,z] = [0,0,0]
+    # -------------------------------------------------------------------
+    # Arguments 
+    # axis_length -> used to specify the length of the axis, in this case
+    #                all axes are of the same length
+    # -------------------------------------------------------------------
+    init_figure()
+    x = [0, axis_length]
+    y = [0, axis_length] 
+    z = [0, axis_length]
+    zp = [0, 0]
+    ax.plot3D(x, zp, zp, color='red')
+    ax.plot3D(zp, y, zp, color='blue')
+    ax.plot3D(zp, zp, z, color='green')
+    
+
+def sind(t):
+    # sind function
+    # Computes the sin() trigonometric function in degrees
+    # ----------------------------------------------------------------------
+    # Arguments
+    # t -> Numeric, angle in degrees. 
+    # ----------------------------------------------------------------------
+    res = np.sin(t*np.pi/180)
+    return res
+
+def cosd(t):
+    # sind function
+    # Computes the cos() trigonometric function in degrees
+    # ----------------------------------------------------------------------
+    # Arguments
+    # t -> Numeric, angle in degrees. 
+    # ----------------------------------------------------------------------
+    res = np.cos(t*np.pi/180)
+    return res
+
+
+def RotY(t):
+    Rz = np.array(([cosd(t),0,-sind(t)],[0,1,0],[sind(t),0,cosd(t)]))
+    return Rz
+
+def drawVector(v):
+    init_figure()
+    deltaX = [0, v[0]]
+    deltaY = [0, v[1]]
+    deltaZ = [0, v[2]]
+    ax.plot3D(deltaX, deltaY, deltaZ,color='orange')
+    #plt.draw()
+    #plt.pause(0.001)
+
+def rotate(t):
+    import matplotlib.pyplot as plt
+    init_figure()
+    n = 0
+    while n < t: 
+        ax.cla()
+        # Set the view 
+        setaxis(0,5,0,5,0,5)
+
+        # plot the axis
+        fix_system(3)
+
+        # draw vector1
+        v1 = np.array([2,0,0])
+        drawVector(v1)
+
+        # draw vector2
+        v2 = RotY(n).dot(v1)
+        drawVector(v2)
+
+        n = n + 1
+        plt.draw()
+        plt.pause(0.001)
+
+
+
+
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    import matplotlib.pyplot as plt
+
+    rotate(70)
+
+    # show image.
+    plt.draw()
+    plt.show()
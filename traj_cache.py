@@ -0,0 +1,240 @@
+#   Caché en disco de trayectorias, direccionada por contenido.
+#
+#   Clave = sha256 de (descripción del robot, petición de movimiento, versión del
+#   código). La versión es un hash del fuente de los módulos que calculan la
+#   trayectoria: si cambian, las entradas viejas simplemente dejan de usarse.
+#   Cada entrada es un .rtraj (traj_mmap) con los arreglos articulares y de
+#   vértices; al leerla se mapea en memoria, sin volver a resolver nada.
+#
+#   Concurrencia entre procesos:
+#     - escritura en archivo temporal del mismo directorio + os.replace (atómico);
+#       dos procesos que calculan la misma clave escriben el mismo contenido.
+#     - el desalojo LRU (por mtime, que se renueva en cada acierto) se hace bajo
+#       un archivo de bloqueo (O_CREAT | O_EXCL), válido en Windows y POSIX.
+#
+#   Configuración:  ROBOT_TRAJ_CACHE=0 la desactiva; una ruta cambia el directorio
+#                   (por defecto ~/.cache/robot_traj).
+#                   ROBOT_TRAJ_CACHE_MB = tamaño máximo (por defecto 512).
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, is_dataclass
+import numpy as np
+
+from traj_mmap import save_trajectory, open_trajectory
+
+_EXT = '.rtraj'
+_LOCK = '.lock'
+
+# ------------------ Claves ------------------
+
+def _canonical(obj):
+    """ Convierte a algo JSON estable (dataclasses, NumPy, tuplas). """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {type(obj).__name__: _canonical(asdict(obj))}
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return {'dtype': obj.dtype.str, 'shape': list(obj.shape),
+                'sha256': hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, float):
+        return repr(obj)                    # exacto (evita 0.1 + 0.2 != 0.3 por formato)
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+    return repr(obj)
+
+_versions = {}
+
+def code_version(*modules) -> str:
+    """ Hash del código fuente de los módulos dados (nombres o módulos; '__main__' vale). """
+    names = tuple(sorted(m if isinstance(m, str) else m.__name__ for m in modules))
+    if names not in _versions:
+        h = hashlib.sha256()
+        for name in names:
+            mod = sys.modules.get(name) or __import__(name)
+            path = getattr(mod, '__file__', None)
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    h.update(f.read())
+        _versions[names] = h.hexdigest()[:16]
+    return _versions[names]
+
+def cache_key(robot, motion, version: str = "") -> str:
+    raw = json.dumps({'robot': _canonical(robot), 'motion': _canonical(motion), 'version': version},
+                     sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+# ------------------ Caché ------------------
+
+class TrajCache:
+    """
+    get(key) -> Trajectory | None;  put(key, robot, **arrays);  get_or_compute(...).
+    max_bytes: tamaño total tras el cual se borran las entradas menos usadas.
+    """
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None,
+                 dtype='float64'):
+        if root is None:
+            root = os.path.join(os.path.expanduser('~'), '.cache', 'robot_traj')
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('ROBOT_TRAJ_CACHE_MB', 512)) * 2**20)
+        self.root = root
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self.hits = self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + _EXT)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            traj = open_trajectory(path)
+        except (OSError, ValueError):         # ausente, a medio borrar o corrupta
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)                     # marca de uso para el LRU
+        except OSError:
+            pass
+        self.hits += 1
+        return traj
+
+    def put(self, key: str, robot: dict, **arrays):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            save_trajectory(tmp, robot, dtype=self.dtype, **arrays)
+            try:
+                os.replace(tmp, path)
+            except PermissionError:
+                pass                           # Windows: otro proceso la tiene mapeada (mismo contenido)
+        finally:
+            if os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+        self.evict()
+        return path
+
+    def get_or_compute(self, robot: dict, motion: dict, compute, version: str = "") -> dict:
+        """
+        Arreglos {nombre: ndarray} para (robot, motion, version): de disco si están,
+        si no se calculan con compute() y se guardan.
+        """
+        key = cache_key(robot, motion, version)
+        traj = self.get(key)
+        if traj is not None:
+            return {k: np.array(v) for k, v in traj.arrays.items()}   # copia: libera el mapeo
+        arrays = {k: np.asarray(v) for k, v in compute().items()}
+        try:
+            self.put(key, _canonical(robot), **arrays)
+        except OSError as e:                    # disco lleno / sin permisos: seguir sin caché
+            sys.stderr.write(f"[CACHE] no se pudo guardar: {e}\n")
+        return arrays
+
+    # --- LRU ---
+    def _entries(self):
+        out = []
+        for d in os.scandir(self.root):
+            if not d.is_dir():
+                continue
+            for e in os.scandir(d.path):
+                if e.name.endswith(_EXT):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, e.path))
+        return out
+
+    def size(self) -> int:
+        return sum(s for _, s, _ in self._entries())
+
+    def evict(self, stale_lock_s: float = 30.0):
+        """ Borra las entradas menos usadas hasta quedar bajo max_bytes. """
+        lock = os.path.join(self.root, _LOCK)
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:                                # bloqueo huérfano de un proceso caído
+                if time.time() - os.path.getmtime(lock) > stale_lock_s:
+                    os.remove(lock)
+            except OSError:
+                pass
+            return                              # otro proceso ya está desalojando
+        try:
+            entries = sorted(self._entries())
+            total = sum(s for _, s, _ in entries)
+            for _, s, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= s
+                except OSError:                 # en uso (Windows) o ya borrada
+                    pass
+        finally:
+            os.close(fd)
+            try:
+                os.remove(lock)
+            except FileNotFoundError:           # otro proceso ya lo borró como huérfano
+                pass
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+_default = None
+
+def default_cache():
+    """ Caché configurada por ROBOT_TRAJ_CACHE, o None si está desactivada. """
+    global _default
+    env = os.environ.get('ROBOT_TRAJ_CACHE', '').strip()
+    if env.lower() in ('0', 'off', 'no', 'false'):
+        return None
+    root = None if env.lower() in ('', '1', 'on', 'yes', 'true') else env
+    if _default is None or (root and _default.root != root):
+        try:
+            _default = TrajCache(root)
+        except OSError:                         # directorio no escribible: sin caché
+            return None
+    return _default
+
+def cached(robot: dict, motion: dict, compute, modules=()):
+    """
+    Atajo para los scripts: arreglos {nombre: ndarray} desde la caché por defecto
+    o calculados con compute() si la caché está desactivada.
+    """
+    cache = default_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(robot, motion, compute, code_version(*modules))
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    c = default_cache()
+    if c is None:
+        print("Caché desactivada (ROBOT_TRAJ_CACHE=0).")
+    elif sys.argv[1:] == ["--clear"]:
+        c.clear()
+        print(f"Caché vaciada: {c.root}")
+    else:
+        print(f"{c.root}: {len(c._entries())} entradas, {c.size() / 2**20:.1f} MB "
+              f"(máximo {c.max_bytes / 2**20:.0f} MB)")
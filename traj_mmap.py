@@ -0,0 +1,179 @@
+#   Formato binario de trayectorias con lectura por memoria mapeada (np.memmap).
+#
+#   Disposición del archivo (.rtraj):
+#     [ 8 bytes ]  magic b'RTRAJ\x00\x00\x01'
+#     [ 4 bytes ]  longitud del encabezado JSON (uint32, little-endian)
+#     [ n bytes ]  encabezado JSON: {"robot": {...}, "n_frames": N,
+#                                    "arrays": {nombre: {"dtype", "shape", "offset"}}}
+#     [ datos   ]  cada arreglo contiguo (C-order), alineado a 64 bytes
+#
+#   Los lectores abren cada arreglo con np.memmap: reproducir millones de frames
+#   no requiere cargarlos en RAM ni volver a resolver la IK.
+
+import json
+import struct
+import sys
+import numpy as np
+
+MAGIC = b'RTRAJ\x00\x00\x01'
+_ALIGN = 64
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+# ------------------ Escritura ------------------
+
+def _layout(robot: dict, n_frames: int, specs: dict):
+    """ Calcula encabezado y offsets. specs: nombre -> (dtype, shape por frame). """
+    arrays = {}
+    # Reserva generosa para el encabezado: los offsets no dependen de su longitud exacta
+    probe = json.dumps({'robot': robot, 'n_frames': n_frames,
+                        'arrays': {k: {'dtype': np.dtype(d).str, 'shape': [n_frames, *s],
+                                       'offset': 10**15} for k, (d, s) in specs.items()}})
+    offset = _align(len(MAGIC) + 4 + len(probe.encode('utf-8')))
+    for name, (dtype, shape) in specs.items():
+        dt = np.dtype(dtype)
+        full = (n_frames, *shape)
+        arrays[name] = {'dtype': dt.str, 'shape': list(full), 'offset': offset}
+        offset = _align(offset + dt.itemsize * int(np.prod(full)))
+    header = {'robot': robot, 'n_frames': n_frames, 'arrays': arrays}
+    return header, offset
+
+def _write_header(f, header: dict):
+    raw = json.dumps(header).encode('utf-8')
+    f.seek(0)
+    f.write(MAGIC)
+    f.write(struct.pack('<I', len(raw)))
+    f.write(raw)
+
+def create_trajectory(path: str, robot: dict, n_frames: int, specs: dict):
+    """
+    Crea un archivo vacío de n_frames y devuelve {nombre: memmap escribible}.
+    Útil para llenar trayectorias enormes por bloques sin tenerlas en RAM.
+      specs: {'thetas': ('float32', (2,)), 'points': ('float32', (3, 3))}
+    """
+    header, total = _layout(robot, n_frames, specs)
+    with open(path, 'wb') as f:
+        _write_header(f, header)
+        f.truncate(total)
+    return {name: np.memmap(path, dtype=a['dtype'], mode='r+',
+                            offset=a['offset'], shape=tuple(a['shape']))
+            for name, a in header['arrays'].items()}
+
+def save_trajectory(path: str, robot: dict, dtype='float32', **arrays):
+    """
+    Guarda arreglos completos que comparten el primer eje (frames).
+    robot: parámetros del robot (modelo, longitudes, codo, ...), deben ser JSON.
+    """
+    arrays = {k: np.asarray(v) for k, v in arrays.items()}
+    n = {len(v) for v in arrays.values()}
+    if len(n) != 1:
+        raise ValueError("Todos los arreglos deben tener el mismo número de frames.")
+    specs = {k: (dtype, v.shape[1:]) for k, v in arrays.items()}
+    mms = create_trajectory(path, robot, n.pop(), specs)
+    for k, mm in mms.items():
+        mm[:] = arrays[k]
+        mm.flush()
+    return path
+
+# ------------------ Lectura ------------------
+
+class Trajectory:
+    """ Vista de solo lectura: .robot, .n_frames y cada arreglo como np.memmap. """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: no es un archivo de trayectoria válido.")
+            (n,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(n).decode('utf-8'))
+        self.path = path
+        self.robot = header['robot']
+        self.n_frames = header['n_frames']
+        self.arrays = {name: np.memmap(path, dtype=a['dtype'], mode='r',
+                                       offset=a['offset'], shape=tuple(a['shape']))
+                       for name, a in header['arrays'].items()}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+    def __len__(self):
+        return self.n_frames
+
+def open_trajectory(path: str) -> Trajectory:
+    return Trajectory(path)
+
+# ------------------ Brazos del proyecto ------------------
+
+def arm_points(model: str, L1: float, L2: float, thetas):
+    """ Puntos base/codo/efector (N, 3, 3) desde ángulos (N, k), con la FK vectorizada. """
+    thetas = np.asarray(thetas, dtype=float)
+    if model == '2r':
+        from Robot_planar_tarea_1 import fk_2r_batch as fk
+    elif model == '2r_yz':
+        from Robot_planar_tarea_2 import fk_2r_yz_batch as fk
+    elif model == 'rrr':
+        from Robot_planar_tarea_3 import fk_rrr_spherical_batch as fk
+    else:
+        raise ValueError(f"Modelo no soportado: {model}")
+    return np.stack(fk(L1, L2, *thetas.T), axis=1)
+
+def save_arm_trajectory(path: str, model: str, L1: float, L2: float, thetas,
+                        elbow_mode: str = "arriba", dtype='float32', **extra):
+    """ Guarda ángulos (N, k) y puntos de los eslabones (N, 3, 3) de un brazo. """
+    thetas = np.asarray(thetas, dtype=float)
+    robot = {'model': model, 'L1': L1, 'L2': L2, 'elbow': elbow_mode, **extra}
+    return save_trajectory(path, robot, dtype=dtype, thetas=thetas,
+                           points=arm_points(model, L1, L2, thetas))
+
+# ------------------ Reproducción ------------------
+
+def replay(path: str, interval_ms: int = 20, step: int = 1):
+    """
+    Reproduce un archivo con arreglo 'points' (N, P, 3) como polilínea 3D.
+    Cada frame se lee del memmap al dibujarlo (sin re-resolver IK).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    traj = open_trajectory(path)
+    pts = traj['points']
+    p0 = np.asarray(pts[0], dtype=float)
+
+    fig = plt.figure(figsize=(7, 6))
+    ax = fig.add_subplot(111, projection='3d')
+    arm, = ax.plot(p0[:, 0], p0[:, 1], p0[:, 2], marker='o', linewidth=3)
+    eff = ax.scatter([p0[-1, 0]], [p0[-1, 1]], [p0[-1, 2]], s=60, c='r')
+
+    # Límites a partir del alcance guardado (o de un muestreo de frames)
+    robot = traj.robot
+    if 'L1' in robot and 'L2' in robot:
+        m = robot['L1'] + robot['L2'] + 5.0
+    else:
+        sample = np.asarray(pts[::max(1, len(traj) // 1000)], dtype=float)
+        m = float(np.abs(sample).max()) + 5.0
+    ax.set_xlim(-m, m); ax.set_ylim(-m, m); ax.set_zlim(-m, m)
+    ax.set_title(f"Replay: {robot.get('model', '?')} ({len(traj)} frames)")
+    ax.set_xlabel("X"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
+
+    def update(k):
+        p = np.asarray(pts[k * step], dtype=float)
+        arm.set_data_3d(p[:, 0], p[:, 1], p[:, 2])
+        eff._offsets3d = ([p[-1, 0]], [p[-1, 1]], [p[-1, 2]])
+        return arm, eff
+
+    anim = FuncAnimation(fig, update, frames=(len(traj) + step - 1) // step,
+                         interval=interval_ms, blit=False, repeat=False)
+    fig._anim = anim
+    plt.show()
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+    if len(sys.argv) < 2:
+        sys.stderr.write("Uso: python traj_mmap.py archivo.rtraj [paso]\n")
+        sys.exit(2)
+    replay(sys.argv[1], step=int(sys.argv[2]) if len(sys.argv) > 2 else 1)
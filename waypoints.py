@@ -0,0 +1,249 @@
+#   Trayectorias con varios puntos de paso (pick-and-place continuo).
+#
+#   En lugar de volver a la pose de inicio antes de cada objetivo, se encadena
+#   una lista de puntos de paso en espacio articular y se suavizan las esquinas:
+#     - 'parabolic': tramos lineales con mezclas parabólicas (LSPB), una por esquina
+#       con su propio tiempo de mezcla tb_k = max |Δv_k| / amax. La esquina se recorta
+#       |Δv| tb / 8; los tramos se alargan hasta que las mezclas no se solapan y cada
+#       punto intermedio queda a menos de tol. El brazo no se detiene.
+#     - 'quintic': un quíntico por tramo que pasa exactamente por cada punto, con
+#       velocidad de paso heurística (promedio de tramos vecinos, 0 si cambia el signo)
+#       y aceleración nula en los puntos; los tramos se alargan hasta que el pico
+#       exacto de |q̇| y |q̈| de cada quíntico cumple los límites.
+#   Toda la secuencia se precalcula como un único arreglo (retiming.Timing).
+
+import numpy as np
+
+from retiming import Timing, trapezoid_duration, _limits, _sample_times
+
+# ------------------ Puntos de paso ------------------
+
+def joint_waypoints(model: str, L1: float, L2: float, targets, elbow: str = "arriba", home=None):
+    """
+    IK vectorizada de todos los objetivos cartesianos (K, k) del modelo de batch_ik.
+    Los ángulos se desenvuelven entre puntos consecutivos (sin saltos de 360°).
+    home: configuración articular inicial opcional (se antepone a la secuencia).
+    """
+    import batch_ik
+    spec = batch_ik.MODELS[model]
+    ok, Q = spec['ik'](L1, L2, np.atleast_2d(np.asarray(targets, dtype=float)), elbow)
+    if not np.all(ok):
+        bad = int(np.flatnonzero(~ok)[0])
+        raise RuntimeError(f"Punto de paso {bad} fuera del alcance del robot.")
+    if home is not None:
+        Q = np.vstack([np.asarray(home, dtype=float), Q])
+    angular = np.array([name.startswith('th') for name in spec['joints']])
+    d = np.diff(Q, axis=0)
+    d[:, angular] = d[:, angular] - 360.0 * np.ceil((d[:, angular] - 180.0) / 360.0)
+    return np.vstack([Q[:1], Q[:1] + np.cumsum(d, axis=0)])
+
+def segment_durations(Q, vmax, amax=None, min_duration: float = 1e-3):
+    """ Duración de cada tramo: la articulación más lenta (trapecio si se da amax). """
+    Q = np.asarray(Q, dtype=float)
+    d = np.abs(np.diff(Q, axis=0))
+    if amax is None:
+        vmax = np.broadcast_to(np.asarray(vmax, dtype=float), (Q.shape[1],))
+        T = d / vmax
+    else:
+        vmax, amax = _limits(vmax, amax, Q.shape[1])
+        T = trapezoid_duration(d, vmax, amax)
+    return np.maximum(T.max(axis=1), min_duration)
+
+# ------------------ Mezcla parabólica ------------------
+
+def _lspb_corners(Q, T, amax):
+    """ Velocidades de tramo (K-1, n), saltos Δv (K, n) y tiempo de mezcla por esquina (K,). """
+    n = Q.shape[1]
+    v = np.diff(Q, axis=0) / T[:, None]
+    dv = np.diff(np.vstack([np.zeros((1, n)), v, np.zeros((1, n))]), axis=0)
+    return v, dv, np.max(np.abs(dv) / amax, axis=1)
+
+def parabolic_blend(Q, vmax, amax, rate_hz: float = 100.0, durations=None,
+                    tol: float = 0.5, max_rounds: int = 200) -> Timing:
+    """
+    Poligonal por los puntos de paso + una mezcla parabólica por esquina, centrada
+    en el punto y de ancho tb_k = max |Δv_k| / amax (inicio y fin en reposo).
+    durations (o la duración a vmax) es el mínimo de cada tramo; se alarga hasta que
+        tb_k / 2 + tb_k+1 / 2 <= T_k        (las mezclas no se solapan)
+        max |Δv_k| tb_k / 8 <= tol          (cada punto se pasa a menos de tol grados)
+    Los extremos se tocan exactamente.
+    """
+    Q = np.asarray(Q, dtype=float)
+    if len(Q) < 2:
+        raise ValueError("Se necesitan al menos 2 puntos de paso.")
+    if tol <= 0:
+        raise ValueError("tol debe ser positivo.")
+    vmax, amax = _limits(vmax, amax, Q.shape[1])
+    T = np.array(durations, dtype=float) if durations is not None else segment_durations(Q, vmax)
+    T = np.maximum(T, 1e-3)
+    for _ in range(max_rounds):
+        v, dv, tb = _lspb_corners(Q, T, amax)
+        dev = np.max(np.abs(dv), axis=1) * tb / 8.0
+        dev[[0, -1]] = 0.0                         # los extremos en reposo se tocan
+        # Solape: (tb ∝ 1/T) la razón baja como 1/T²; desvío igual (Δv² / 8a)
+        overlap = (tb[:-1] + tb[1:]) / (2.0 * T)
+        miss = np.maximum(dev[:-1], dev[1:]) / tol
+        grow = np.sqrt(np.maximum(overlap, miss))
+        if np.all(grow <= 1.0 + 1e-9):
+            break
+        T = T * np.maximum(grow * 1.001, 1.0)
+    else:
+        raise RuntimeError("No se pudo ajustar la mezcla parabólica a tol.")
+
+    tk = np.concatenate([[0.0], np.cumsum(T)])
+    t0 = tb[0] / 2.0                               # la mezcla inicial empieza en t = 0
+    total = t0 + tk[-1] + tb[-1] / 2.0
+    t = _sample_times(total, rate_hz)
+    s = t - t0                                     # tiempo relativo a los nudos
+
+    # Recta: tramo i (antes del primero / después del último, en reposo)
+    vz = np.vstack([np.zeros((1, Q.shape[1])), v, np.zeros((1, Q.shape[1]))])
+    i = np.clip(np.searchsorted(tk, s, side='right') - 1, -1, len(T))
+    k = np.clip(i, 0, len(Q) - 1)
+    q = Q[k] + vz[i + 1] * (s - tk[k])[:, None]
+    qd = vz[i + 1].copy()
+    # Mezcla de la esquina más cercana, si s cae dentro de su ventana
+    c = np.clip(np.searchsorted(tk, s), 0, len(Q) - 1)
+    c = np.where((c > 0) & (np.abs(s - tk[c - 1]) < np.abs(s - tk[c])), c - 1, c)
+    u = s - tk[c] + tb[c] / 2.0                    # tiempo desde el inicio de la mezcla
+    inside = (u >= 0.0) & (u <= tb[c]) & (tb[c] > 0.0)
+    acc = dv[c] / np.where(tb[c] > 0.0, tb[c], 1.0)[:, None]
+    v_in = vz[c]
+    qb = Q[c] + v_in * (s - tk[c])[:, None] + 0.5 * acc * (u * u)[:, None]
+    q = np.where(inside[:, None], qb, q)
+    qd = np.where(inside[:, None], v_in + acc * u[:, None], qd)
+    return Timing(t, q, qd, float(total))
+
+# ------------------ Quínticos por tramo ------------------
+
+def via_velocities(Q, T):
+    """ Velocidad en cada punto de paso: promedio de tramos vecinos, 0 si cambia el signo. """
+    v = np.diff(Q, axis=0) / T[:, None]
+    mid = np.where(np.sign(v[:-1]) == np.sign(v[1:]), 0.5 * (v[:-1] + v[1:]), 0.0)
+    z = np.zeros((1, Q.shape[1]))
+    return np.vstack([z, mid, z])
+
+def _quintic_coefs(Q, T, V):
+    """ c3, c4, c5 (K-1, n) de q(τ) = p0 + v0 τ + c3 τ³ + c4 τ⁴ + c5 τ⁵ (a0 = a1 = 0). """
+    Tn = T[:, None]
+    h = Q[1:] - Q[:-1]
+    v0, v1 = V[:-1], V[1:]
+    c3 = (20*h - (8*v1 + 12*v0) * Tn) / (2 * Tn**3)
+    c4 = (-30*h + (14*v1 + 16*v0) * Tn) / (2 * Tn**4)
+    c5 = (12*h - 6*(v1 + v0) * Tn) / (2 * Tn**5)
+    return c3, c4, c5
+
+def _quintic_peaks(T, v0, c3, c4, c5):
+    """
+    Picos exactos de |q̇| y |q̈| por tramo y articulación (K-1, n): se evalúan en
+    los extremos y en las raíces (dentro de [0, T]) de q̈ y de la sobreaceleración.
+    """
+    def roots(a, b, c):                            # a τ² + b τ + c = 0, NaN si no hay
+        disc = b * b - 4 * a * c
+        sq = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        lin = np.where(b != 0, -c / np.where(b != 0, b, 1.0), np.nan)
+        a_ = np.where(a != 0, a, 1.0)
+        r1 = np.where(a != 0, (-b + sq) / (2 * a_), lin)
+        r2 = np.where(a != 0, (-b - sq) / (2 * a_), lin)
+        return r1, r2
+    Tn = np.broadcast_to(T[:, None], c3.shape)
+    # q̈ = τ (6 c3 + 12 c4 τ + 20 c5 τ²);  q⃛ = 6 c3 + 24 c4 τ + 60 c5 τ²
+    tv = np.stack([np.zeros_like(Tn), Tn, *roots(20*c5, 12*c4, 6*c3)])
+    ta = np.stack([np.zeros_like(Tn), Tn, *roots(60*c5, 24*c4, 6*c3)])
+    tv = np.where((tv >= 0) & (tv <= Tn), tv, 0.0)
+    ta = np.where((ta >= 0) & (ta <= Tn), ta, 0.0)
+    qd = v0 + 3*c3*tv**2 + 4*c4*tv**3 + 5*c5*tv**4
+    qdd = 6*c3*ta + 12*c4*ta**2 + 20*c5*ta**3
+    return np.abs(qd).max(axis=0), np.abs(qdd).max(axis=0)
+
+def quintic_blend(Q, vmax, amax=None, rate_hz: float = 100.0, durations=None,
+                  max_rounds: int = 200) -> Timing:
+    """
+    Quínticos por tramo con aceleración nula en los puntos; pasa por todos ellos.
+    durations (o la cota reposo-reposo, v pico = 1.875 h/T, a pico = 5.774 h/T²)
+    es el mínimo de cada tramo; con las velocidades de paso no nulas esa cota no
+    basta, así que cada tramo se alarga hasta que su pico exacto de |q̇| y |q̈|
+    cumple vmax y amax.
+    """
+    Q = np.asarray(Q, dtype=float)
+    if len(Q) < 2:
+        raise ValueError("Se necesitan al menos 2 puntos de paso.")
+    vmax, amax = _limits(vmax, amax if amax is not None else np.inf, Q.shape[1])
+    d = np.abs(np.diff(Q, axis=0))
+    T = np.maximum(np.maximum(1.875 * d / vmax, np.sqrt(5.774 * d / amax)).max(axis=1), 1e-3)
+    if durations is not None:
+        T = np.maximum(T, np.asarray(durations, dtype=float))
+    for _ in range(max_rounds):
+        V = via_velocities(Q, T)
+        c3, c4, c5 = _quintic_coefs(Q, T, V)
+        vp, ap = _quintic_peaks(T, V[:-1], c3, c4, c5)
+        # q̇ escala como 1/T y q̈ como 1/T² (a velocidades de paso fijas)
+        grow = np.maximum(vp / vmax, np.sqrt(ap / amax)).max(axis=1)
+        if np.all(grow <= 1.0 + 1e-9):
+            break
+        T = T * np.maximum(grow * 1.001, 1.0)
+    else:
+        raise RuntimeError("No se pudieron ajustar los quínticos a los límites.")
+    tk = np.concatenate([[0.0], np.cumsum(T)])
+    p0, v0 = Q[:-1], V[:-1]
+
+    t = _sample_times(float(tk[-1]), rate_hz)
+    i = np.clip(np.searchsorted(tk, t, side='right') - 1, 0, len(T) - 1)
+    tau = np.minimum(t - tk[i], T[i])[:, None]
+    q = p0[i] + v0[i]*tau + c3[i]*tau**3 + c4[i]*tau**4 + c5[i]*tau**5
+    qd = v0[i] + 3*c3[i]*tau**2 + 4*c4[i]*tau**3 + 5*c5[i]*tau**4
+    return Timing(t, q, qd, float(tk[-1]))
+
+def blend(Q, vmax, amax, method: str = "parabolic", rate_hz: float = 100.0, durations=None) -> Timing:
+    """ Secuencia por los puntos de paso Q con el método dado (ver parabolic_blend / quintic_blend). """
+    if method == "parabolic":
+        return parabolic_blend(Q, vmax, amax, rate_hz, durations)
+    if method == "quintic":
+        return quintic_blend(Q, vmax, amax, rate_hz, durations)
+    raise ValueError("method debe ser 'parabolic' o 'quintic'.")
+
+# ------------------ Animación ------------------
+
+def animate_sequence(model: str, L1: float, L2: float, timing: Timing, targets=None,
+                     interval_ms: int = 20, step: int = 1):
+    """ Reproduce la secuencia completa (2r, 2r_yz, rrr) con FuncAnimation. """
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+    from traj_mmap import arm_points
+
+    pts = arm_points(model, L1, L2, timing.q[::step])
+    fig = plt.figure(figsize=(7, 6))
+    ax = fig.add_subplot(111, projection='3d')
+    tip = pts[:, -1]
+    ax.plot(tip[:, 0], tip[:, 1], tip[:, 2], linewidth=1, alpha=0.5)
+    if targets is not None:
+        P = np.atleast_2d(np.asarray(targets, dtype=float))
+        P3 = np.zeros((len(P), 3))
+        cols = {'2r': (0, 1), '2r_yz': (1, 2), 'rrr': (0, 1, 2)}[model]
+        P3[:, cols] = P[:, :len(cols)]
+        ax.scatter(P3[:, 0], P3[:, 1], P3[:, 2], marker='x', s=80)
+    arm, = ax.plot(pts[0, :, 0], pts[0, :, 1], pts[0, :, 2], marker='o', linewidth=3)
+    m = L1 + L2 + 2.0
+    ax.set_xlim(-m, m); ax.set_ylim(-m, m); ax.set_zlim(-m, m)
+    ax.set_title(f"Secuencia ({model}) - {timing.duration:.2f} s")
+    ax.set_xlabel("X"); ax.set_ylabel("Y"); ax.set_zlabel("Z")
+
+    def update(k):
+        arm.set_data_3d(pts[k, :, 0], pts[k, :, 1], pts[k, :, 2])
+        return arm,
+
+    anim = FuncAnimation(fig, update, frames=len(pts), interval=interval_ms,
+                         blit=False, repeat=False)
+    fig._anim = anim
+    plt.show()
+
+if __name__ == "__main__":
+    from profiling import install_from_env
+    install_from_env(globals())   # ROBOT_PROFILE=cprofile|sample|timers
+
+    L1, L2 = 5.0, 4.0
+    picks = [(6.0, 2.0, -2.0), (3.0, 5.0, 1.0), (-2.0, 6.0, 0.0), (-5.0, 2.0, 3.0), (4.0, -4.0, 2.0)]
+    Q = joint_waypoints('rrr', L1, L2, picks, home=(0.0, 0.0, 0.0))
+    tim = blend(Q, vmax=90.0, amax=300.0, method="parabolic", rate_hz=50.0)
+    print(f"{len(picks)} objetivos en {tim.duration:.2f} s, {len(tim.t)} frames")
+    animate_sequence('rrr', L1, L2, tim, targets=picks, interval_ms=20)